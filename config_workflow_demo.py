@@ -12,10 +12,12 @@ import os
 import sys
 import argparse
 import yaml
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from lyzrboost.core.agent_api import get_agent_response, APIError
 from lyzrboost.core.workflow import Workflow, WorkflowStep
+from lyzrboost.core.cache import SQLiteCacheBackend
+from lyzrboost.core.memo import StepMemo, make_fingerprint
 from lyzrboost.utils.logger import setup_logger
 from lyzrboost.utils.config import load_config, merge_configs
 
@@ -116,12 +118,17 @@ def create_agent_step(step_config: Dict[str, Any]):
             
     return step_function
 
-def build_workflow_from_config(config: Dict[str, Any]) -> Workflow:
+def build_workflow_from_config(config: Dict[str, Any], memo: Optional[StepMemo] = None) -> Workflow:
     """
     Build a workflow from configuration.
     
+    Each step's fingerprint is the hash of its configuration, so with a memo
+    a step is only re-run when its agent_id, prompt_template, other settings
+    or the output of an earlier step changed.
+    
     Args:
         config: Workflow configuration
+        memo: Optional memo reusing outputs of unchanged steps
         
     Returns:
         Configured Workflow object
@@ -135,25 +142,33 @@ def build_workflow_from_config(config: Dict[str, Any]) -> Workflow:
     for step_config in steps_config:
         step_name = step_config.get("name", f"Step{len(steps)+1}")
         step_function = create_agent_step(step_config)
-        steps.append(WorkflowStep(step_function, name=step_name))
+        steps.append(WorkflowStep(
+            step_function,
+            name=step_name,
+            fingerprint=make_fingerprint(step_config, DEFAULT_USER_ID)
+        ))
         
     # Create the workflow
     workflow = Workflow(
         steps=steps,
         name=workflow_name,
-        description=workflow_description
+        description=workflow_description,
+        memo=memo
     )
     
     logger.info(f"Built workflow '{workflow_name}' with {len(steps)} steps")
     return workflow
 
 def main():
+    global DEFAULT_USER_ID
+    
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Run a workflow from a YAML configuration file")
     parser.add_argument("config", help="Path to workflow configuration YAML file")
     parser.add_argument("--input", help="Input for the workflow", default="")
     parser.add_argument("--api-key", help="Lyzr API key (or set LYZR_API_KEY environment variable)")
     parser.add_argument("--user-id", help="User ID for Lyzr API", default=DEFAULT_USER_ID)
+    parser.add_argument("--memo", help="SQLite file for reusing outputs of unchanged steps across runs")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
     
     args = parser.parse_args()
@@ -164,7 +179,6 @@ def main():
     
     # Update user ID if provided
     if args.user_id:
-        global DEFAULT_USER_ID
         DEFAULT_USER_ID = args.user_id
     
     # Set logging level based on verbosity
@@ -176,7 +190,8 @@ def main():
         config = load_workflow_config(args.config)
         
         # Build workflow from configuration
-        workflow = build_workflow_from_config(config)
+        memo = StepMemo(SQLiteCacheBackend(args.memo)) if args.memo else None
+        workflow = build_workflow_from_config(config, memo=memo)
         
         # Get workflow input
         workflow_input = args.input
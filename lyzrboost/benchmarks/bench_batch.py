@@ -0,0 +1,58 @@
+"""
+Benchmark: throughput of send_agent_requests_many versus concurrency.
+
+Runs the same batch against a local stub server that takes a fixed time per
+request and reports throughput and speedup for each concurrency limit.
+
+Usage:
+    python benchmarks/bench_batch.py [--records 400] [--delay 0.05]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lyzrboost.core.agent_api import send_agent_requests_many
+from lyzrboost.core.client import AgentClient
+from stub_server import StubAgentServer
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=400)
+    parser.add_argument("--delay", type=float, default=0.05, help="Stub latency per request (s)")
+    parser.add_argument("--levels", default="1,2,4,8,16,32")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(",")]
+    records = [("bench", "agent", None, f"document {i}") for i in range(args.records)]
+
+    with StubAgentServer(delay=args.delay) as server:
+        print(f"{'concurrency':>12}{'req/s':>10}{'speedup':>10}{'errors':>8}{'connections':>13}")
+        baseline = None
+
+        for concurrency in levels:
+            server.reset()
+            with AgentClient(endpoint=server.url, pool_maxsize=concurrency) as client:
+                start = time.perf_counter()
+                errors = sum(
+                    not result.ok
+                    for result in send_agent_requests_many(records, concurrency=concurrency, client=client)
+                )
+                elapsed = time.perf_counter() - start
+
+            throughput = len(records) / elapsed
+            baseline = baseline or throughput
+            print(
+                f"{concurrency:>12}{throughput:>10.1f}{throughput / baseline:>9.1f}x"
+                f"{errors:>8}{server.connections:>13}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
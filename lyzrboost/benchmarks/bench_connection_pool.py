@@ -0,0 +1,68 @@
+"""
+Benchmark: connection reuse of the pooled AgentClient.
+
+Sends 1,000 agent requests to a local stub server, first with a fresh
+``requests.post`` per call (the old transport) and then through the shared
+pooled client, and reports how many TCP connections each approach opened.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [--calls 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lyzrboost.core.agent_api import send_agent_request
+from lyzrboost.core.client import AgentClient
+from stub_server import StubAgentServer
+
+
+def run_unpooled(server: StubAgentServer, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        response = requests.post(
+            server.url,
+            headers={"Content-Type": "application/json"},
+            json={"user_id": "bench", "agent_id": "agent", "session_id": "s", "message": str(i)},
+            timeout=10
+        )
+        response.raise_for_status()
+        response.json()
+    return time.perf_counter() - start
+
+
+def run_pooled(server: StubAgentServer, calls: int) -> float:
+    client = AgentClient(endpoint=server.url)
+    start = time.perf_counter()
+    for i in range(calls):
+        send_agent_request("bench", "agent", "s", str(i), client=client)
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args()
+
+    with StubAgentServer() as server:
+        print(f"{'transport':<12}{'calls':>8}{'connections':>14}{'reused':>10}{'seconds':>10}")
+
+        for label, runner in (("requests.post", run_unpooled), ("AgentClient", run_pooled)):
+            server.reset()
+            elapsed = runner(server, args.calls)
+            reused = server.requests - server.connections
+            print(f"{label:<12}{server.requests:>8}{server.connections:>14}{reused:>10}{elapsed:>10.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
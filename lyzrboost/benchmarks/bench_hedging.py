@@ -0,0 +1,87 @@
+"""
+Benchmark: tail latency with and without hedged agent calls.
+
+A local stub server answers most requests quickly but a small fraction very
+slowly. The same calls are sent with a plain AgentClient and with one using
+a HedgePolicy, and the latency percentiles and extra requests are reported.
+
+Usage:
+    python benchmarks/bench_hedging.py [--calls 400] [--slow-rate 0.03]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lyzrboost.core.client import AgentClient
+from lyzrboost.core.hedging import HedgePolicy
+from stub_server import StubAgentServer
+
+
+def percentile(latencies: List[float], p: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def run(client: AgentClient, calls: int, workers: int) -> List[float]:
+    def one(i: int) -> float:
+        start = time.perf_counter()
+        client.send("bench", "agent", "agent", f"message {i}")
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(one, range(calls)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--fast", type=float, default=0.01, help="Typical response time in seconds")
+    parser.add_argument("--slow", type=float, default=0.5, help="Response time of slow outliers")
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="Fraction of slow responses")
+    parser.add_argument("--max-hedge-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+
+    def delay() -> float:
+        return args.slow if rng.random() < args.slow_rate else args.fast * rng.uniform(0.8, 1.2)
+
+    with StubAgentServer(delay=delay) as server:
+        with AgentClient(endpoint=server.url) as client:
+            plain = run(client, args.calls, args.workers)
+        plain_requests = server.requests
+        server.reset()
+
+        hedging = HedgePolicy(percentile=95, max_hedge_rate=args.max_hedge_rate)
+        with AgentClient(endpoint=server.url, hedge_policy=hedging) as client:
+            hedged = run(client, args.calls, args.workers)
+        hedged_requests = server.requests
+
+    print(f"{args.calls} calls, {args.slow_rate:.0%} take {args.slow}s instead of ~{args.fast}s")
+    print(f"{'':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'requests':>10}")
+    for label, latencies, requests_sent in (
+        ("plain", plain, plain_requests),
+        ("hedged", hedged, hedged_requests),
+    ):
+        print(
+            f"{label:<10}"
+            f"{percentile(latencies, 50) * 1000:>10.1f}"
+            f"{percentile(latencies, 95) * 1000:>10.1f}"
+            f"{percentile(latencies, 99) * 1000:>10.1f}"
+            f"{max(latencies) * 1000:>10.1f}"
+            f"{requests_sent:>10}"
+        )
+    print(f"Hedge stats: {hedging.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
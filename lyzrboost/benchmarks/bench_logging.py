@@ -0,0 +1,110 @@
+"""
+Micro-benchmark: per-call logging overhead on the agent_api hot path.
+
+Compares the previous eager f-string debug logging with the current lazy,
+guarded logging while DEBUG is disabled, using a multi-kilobyte response.
+It also times a full AgentClient.send() against an in-memory transport, so
+the logging cost can be read relative to the rest of the client overhead.
+
+Usage:
+    python benchmarks/bench_logging.py [--calls 20000] [--size 8192]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import timeit
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lyzrboost.core.client import AgentClient, extract_response_text
+from lyzrboost.utils.logger import truncate_payload
+
+logger = logging.getLogger("lyzrboost.core.client")
+
+
+def make_response(size: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response.encoding = "utf-8"
+    response._content = json.dumps({
+        "response": "ok",
+        "data": {"response": "x" * size, "sources": [{"id": i, "score": 0.5} for i in range(20)]}
+    }).encode("utf-8")
+    return response
+
+
+class InMemorySession(requests.Session):
+    """Session whose post() returns a canned response without any I/O."""
+
+    def __init__(self, response: requests.Response):
+        super().__init__()
+        self._response = response
+
+    def post(self, url, **kwargs):
+        return self._response
+
+
+def eager_logging(response: requests.Response, agent_id: str, endpoint: str) -> None:
+    # The logging calls as they were before they were made lazy
+    logger.debug(f"Sending request to {endpoint} for agent {agent_id}")
+    logger.debug(f"Raw API Response Content: {response.text}")
+    data = response.json()
+    logger.debug(f"Parsed API Response Data: {data}")
+    logger.debug(f"Received response from agent {agent_id}")
+    logger.debug(f"Extracting response from data: {data}")
+
+
+def lazy_logging(response: requests.Response, agent_id: str, endpoint: str) -> None:
+    logger.debug("Sending request to %s for agent %s", endpoint, agent_id)
+    data = response.json()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Raw API Response Content: %s", truncate_payload(response.text))
+        logger.debug("Parsed API Response Data: %s", truncate_payload(data))
+        logger.debug("Received response from agent %s", agent_id)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Extracting response from data: %s", truncate_payload(data))
+
+
+def per_call_us(func, calls: int) -> float:
+    return min(timeit.repeat(func, number=calls, repeat=3)) / calls * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=8192, help="Response text size in characters")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    response = make_response(args.size)
+    endpoint = "https://agent-prod.studio.lyzr.ai/v3/inference/chat/"
+
+    # json() parsing is common to both variants; report it so it can be subtracted
+    parse_only = per_call_us(lambda: response.json(), args.calls)
+    eager = per_call_us(lambda: eager_logging(response, "agent", endpoint), args.calls)
+    lazy = per_call_us(lambda: lazy_logging(response, "agent", endpoint), args.calls)
+
+    client = AgentClient(session=InMemorySession(response))
+    send = per_call_us(
+        lambda: extract_response_text(client.send("user", "agent", "session", "hello")),
+        args.calls
+    )
+
+    print(f"Response size: {len(response.content)} bytes, DEBUG disabled, {args.calls} calls")
+    print(f"{'json() parse only':<36}{parse_only:>10.2f} us/call")
+    print(f"{'eager f-string logging + parse':<36}{eager:>10.2f} us/call")
+    print(f"{'lazy guarded logging + parse':<36}{lazy:>10.2f} us/call")
+    print(f"{'logging overhead (eager)':<36}{eager - parse_only:>10.2f} us/call")
+    print(f"{'logging overhead (lazy)':<36}{lazy - parse_only:>10.2f} us/call")
+    print(f"{'AgentClient.send + extract (no I/O)':<36}{send:>10.2f} us/call")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
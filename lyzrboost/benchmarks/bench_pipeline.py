@@ -0,0 +1,75 @@
+"""
+Benchmark: time to first output of a streaming research -> write pipeline.
+
+A local stub server streams one word per event. The same two-stage chain
+runs twice: once with the writer waiting for the complete research output
+(as sequential workflow steps do), and once as a StreamingWorkflow where the
+writer starts on each markdown section as soon as it is complete.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sections 4] [--words 20] [--event-delay 0.01]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import AsyncIterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lyzrboost.core.async_client import AsyncAgentClient
+from lyzrboost.core.pipeline import (
+    MarkdownSectionChunker,
+    StreamingAgentCall,
+    StreamingWorkflow,
+    StreamStep,
+)
+from stub_server import StubAgentServer
+
+
+async def run(server: StubAgentServer, draft: str) -> None:
+    async with AsyncAgentClient(stream_endpoint=server.stream_url) as client:
+        research = StreamStep(StreamingAgentCall(client, "research", "bench"), name="research")
+        writer = StreamingAgentCall(client, "writer", "bench")
+        chunker = MarkdownSectionChunker()
+
+        async def write_after_research(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+            text = "".join([chunk async for chunk in chunks])
+
+            async def sections() -> AsyncIterator[str]:
+                for section in chunker.split(text):
+                    yield section
+
+            async for piece in writer(sections()):
+                yield piece
+
+        pipelines = [
+            ("sequential", StreamingWorkflow([research, StreamStep(write_after_research, name="write")])),
+            ("streaming", StreamingWorkflow([research, StreamStep(writer, name="write", chunker=chunker)])),
+        ]
+        for label, pipeline in pipelines:
+            await pipeline.arun(draft)
+            report = pipeline.last_report
+            print(f"{label:<12}first output {report.time_to_first_output:6.2f}s   total {report.elapsed:6.2f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sections", type=int, default=4)
+    parser.add_argument("--words", type=int, default=20, help="Words per section")
+    parser.add_argument("--event-delay", type=float, default=0.01, help="Seconds between streamed words")
+    args = parser.parse_args()
+
+    draft = "\n".join(
+        f"## Section {i}\n" + " ".join(f"word{j}" for j in range(args.words)) + "\n"
+        for i in range(args.sections)
+    )
+    print(f"{args.sections} sections of {args.words} words, {args.event_delay}s per streamed word")
+    with StubAgentServer(stream_delay=args.event_delay) as server:
+        asyncio.run(run(server, draft))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark: interactive latency while a batch job saturates the process.
+
+One tenant submits a large batch of agent calls while interactive requests
+arrive at a steady rate. With a plain FIFO thread pool the interactive
+requests queue behind the batch; with a WorkflowScheduler they are served
+first and the batch only uses the remaining capacity.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--batch 1000] [--interactive 80]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lyzrboost.core.client import AgentClient
+from lyzrboost.core.scheduler import WorkflowScheduler
+from stub_server import StubAgentServer
+
+
+def percentile(latencies: List[float], p: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def interactive_load(run: Callable[[Callable[[], None]], None], count: int, interval: float) -> List[float]:
+    """Issue ``count`` requests ``interval`` apart and return their latencies."""
+    latencies: List[float] = []
+    threads = []
+
+    def one() -> None:
+        start = time.perf_counter()
+        run(lambda: None)
+        latencies.append(time.perf_counter() - start)
+
+    for _ in range(count):
+        thread = threading.Thread(target=one)
+        thread.start()
+        threads.append(thread)
+        time.sleep(interval)
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--interactive", type=int, default=80)
+    parser.add_argument("--interval", type=float, default=0.025, help="Seconds between interactive requests")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.02, help="Agent response time in seconds")
+    args = parser.parse_args()
+
+    with StubAgentServer(delay=args.delay) as server, AgentClient(endpoint=server.url) as client:
+        def agent_call(_: object = None) -> None:
+            client.send("bench", "agent", "agent", "hello")
+
+        # FIFO pool shared by both kinds of traffic
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            batch = [pool.submit(agent_call) for _ in range(args.batch)]
+            fifo = interactive_load(lambda _: pool.submit(agent_call).result(), args.interactive, args.interval)
+            for future in batch:
+                future.cancel()
+
+        with WorkflowScheduler(max_concurrency=args.concurrency) as scheduler:
+            stop = threading.Event()
+
+            def consume_batch() -> None:
+                with scheduler.map(agent_call, range(args.batch), tenant="bulk", priority="batch") as run:
+                    for _ in run:
+                        if stop.is_set():
+                            break
+
+            consumer = threading.Thread(target=consume_batch)
+            consumer.start()
+            scheduled = interactive_load(
+                lambda _: scheduler.call(agent_call, tenant="chat", priority="interactive"),
+                args.interactive,
+                args.interval
+            )
+            stats = scheduler.stats()
+            stop.set()
+            consumer.join()
+
+    print(f"{args.interactive} interactive requests alongside a {args.batch}-call batch, "
+          f"{args.concurrency} slots, {args.delay * 1000:.0f} ms per call")
+    print(f"{'':<12}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for label, latencies in (("fifo pool", fifo), ("scheduler", scheduled)):
+        print(
+            f"{label:<12}{percentile(latencies, 50) * 1000:>10.1f}"
+            f"{percentile(latencies, 95) * 1000:>10.1f}{max(latencies) * 1000:>10.1f}"
+        )
+    for name, entry in stats["classes"].items():
+        print(
+            f"{name:<12} completed {entry['completed']:>5}  queued {entry['queued']:>5}  "
+            f"wait p95 {entry['wait_p95'] * 1000:7.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Benchmark: cost of persisting sessions in AgentManager.store_interaction.
+
+The same conversation workload is stored with no backend, the memory
+backend, the SQLite backend (batched, and committing after every call for
+comparison) and the append-only log backend. The per-call latency of
+store_interaction and the time to reload a session after a restart are
+reported.
+
+Usage:
+    python benchmarks/bench_session_backends.py [--sessions 200] [--turns 50]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lyzrboost.core.agent_manager import AgentManager
+from lyzrboost.core.session_backends import (
+    LogFileSessionBackend,
+    MemorySessionBackend,
+    SessionBackend,
+    SQLiteSessionBackend,
+)
+
+
+def percentile(latencies: List[float], p: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def run(
+    make_backend: Optional[Callable[[], SessionBackend]],
+    sessions: int,
+    turns: int,
+    commit_each: bool = False
+) -> List[float]:
+    backend = make_backend() if make_backend else None
+    latencies = []
+    with AgentManager(session_backend=backend, history_max_turns=20) as manager:
+        ids = [manager.generate_session_id(agent_id="bench") for _ in range(sessions)]
+        response = "An answer of typical length. " * 10
+        for turn in range(turns):
+            for session_id in ids:
+                start = time.perf_counter()
+                manager.store_interaction(session_id, f"question {turn}", response)
+                if commit_each:
+                    backend.flush()
+                latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def reload_time(make_backend: Callable[[], SessionBackend], probes: int) -> float:
+    """Open the backend as after a restart and load ``probes`` sessions; return seconds."""
+    start = time.perf_counter()
+    with AgentManager(session_backend=make_backend()) as manager:
+        session_ids = manager.find_sessions("bench")[:probes]
+        for session_id in session_ids:
+            manager.get_session_history(session_id)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=50, help="Interactions stored per session")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="lyzrboost-bench-")
+    sqlite_path = os.path.join(directory, "sessions.db")
+    log_path = os.path.join(directory, "sessions.log")
+    sync_path = os.path.join(directory, "sessions-sync.db")
+    setups = [
+        ("memory only", None, False),
+        ("memory", MemorySessionBackend, False),
+        ("sqlite batched", lambda: SQLiteSessionBackend(sqlite_path), False),
+        ("sqlite per call", lambda: SQLiteSessionBackend(sync_path), True),
+        ("log file", lambda: LogFileSessionBackend(log_path), False),
+    ]
+
+    print(f"{args.sessions} sessions x {args.turns} interactions, histories capped at 20 turns")
+    print(f"{'backend':<18}{'p50 us':>10}{'p99 us':>10}{'mean us':>10}")
+    for label, make_backend, commit_each in setups:
+        latencies = run(make_backend, args.sessions, args.turns, commit_each)
+        print(
+            f"{label:<18}{percentile(latencies, 50) * 1e6:>10.1f}{percentile(latencies, 99) * 1e6:>10.1f}"
+            f"{sum(latencies) / len(latencies) * 1e6:>10.1f}"
+        )
+
+    for label, make_backend in (
+        ("sqlite", lambda: SQLiteSessionBackend(sqlite_path)),
+        ("log file", lambda: LogFileSessionBackend(log_path)),
+    ):
+        print(f"restart + load 50 sessions ({label}): {reload_time(make_backend, 50) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
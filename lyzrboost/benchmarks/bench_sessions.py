@@ -0,0 +1,134 @@
+"""
+Benchmark: AgentManager throughput under concurrent session traffic.
+
+Worker threads hammer a shared pool of sessions with a mix of
+store_interaction, get_history_window, clear_session and delete_session
+calls. Histories are bounded and compacted by a summarizer that stands in
+for an agent call (it sleeps, releasing the GIL). Three setups are compared:
+
+- the manager behind one global lock, the simple way to make the old
+  manager safe (every summarizer call stalls the whole server);
+- the default manager, one store lock plus a lock per history;
+- the store striped into ``--shards`` locked shards.
+
+The difference between the last two is the effect of lock striping alone;
+use ``--summary-delay 0`` to measure pure store contention.
+
+Usage:
+    python benchmarks/bench_sessions.py [--threads 1,2,4,8,16] [--shards 16] [--seconds 1.0]
+"""
+
+import argparse
+import functools
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lyzrboost.core.agent_manager import AgentManager
+
+
+class GlobalLockManager(AgentManager):
+    """AgentManager with every public call serialized by one lock."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._global_lock = threading.Lock()
+        for name in ("generate_session_id", "store_interaction", "get_history_window",
+                     "clear_session", "delete_session"):
+            setattr(self, name, self._serialized(getattr(self, name)))
+
+    def _serialized(self, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self._global_lock:
+                return method(*args, **kwargs)
+        return wrapper
+
+
+def make_summarizer(delay: float) -> Callable[[Optional[str], List[Dict[str, Any]]], str]:
+    def summarize(previous: Optional[str], dropped: List[Dict[str, Any]]) -> str:
+        time.sleep(delay)
+        return f"{len(dropped)} turns about {dropped[-1]['user_message']}"
+    return summarize
+
+
+def run(manager: AgentManager, threads: int, sessions: int, seconds: float) -> Dict[str, int]:
+    """Run the workload and return the number of operations and unexpected errors."""
+    pool = [manager.generate_session_id() for _ in range(sessions)]
+    stop = threading.Event()
+    counts = {"ops": 0, "errors": 0}
+    counts_lock = threading.Lock()
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        ops = errors = 0
+        while not stop.is_set():
+            slot = rng.randrange(sessions)
+            session_id = pool[slot]
+            roll = rng.random()
+            try:
+                if roll < 0.6:
+                    manager.store_interaction(session_id, f"question {ops}", "answer " * 20)
+                elif roll < 0.9:
+                    manager.get_history_window(session_id, max_turns=4)
+                elif roll < 0.97:
+                    manager.clear_session(session_id)
+                else:
+                    manager.delete_session(session_id)
+                    pool[slot] = manager.generate_session_id()
+            except KeyError:
+                # Another thread deleted the session first
+                pass
+            except Exception:
+                errors += 1
+            ops += 1
+        with counts_lock:
+            counts["ops"] += ops
+            counts["errors"] += errors
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", default="1,2,4,8,16", help="Comma-separated thread counts")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Duration of each run")
+    parser.add_argument("--sessions", type=int, default=256)
+    parser.add_argument("--shards", type=int, default=16, help="Shards of the striped store")
+    parser.add_argument("--max-turns", type=int, default=8, help="History turns kept per session")
+    parser.add_argument("--summary-delay", type=float, default=0.002, help="Seconds per summarizer call")
+    args = parser.parse_args()
+
+    options = dict(history_max_turns=args.max_turns, history_summarizer=make_summarizer(args.summary_delay))
+    thread_counts = [int(n) for n in args.threads.split(",")]
+    print(f"{args.sessions} shared sessions, {args.max_turns} turns per history, "
+          f"{args.summary_delay * 1000:.1f} ms summarizer, {args.seconds}s per run")
+    print(f"{'threads':>8}{'global lock':>14}{'1 shard':>12}{f'{args.shards} shards':>12}{'errors':>8}   (ops/s)")
+    for threads in thread_counts:
+        results = [
+            run(GlobalLockManager(**options), threads, args.sessions, args.seconds),
+            run(AgentManager(session_shards=1, **options), threads, args.sessions, args.seconds),
+            run(AgentManager(session_shards=args.shards, **options), threads, args.sessions, args.seconds),
+        ]
+        rates = [result["ops"] / args.seconds for result in results]
+        print(
+            f"{threads:>8}{rates[0]:>14.0f}{rates[1]:>12.0f}{rates[2]:>12.0f}"
+            f"{sum(result['errors'] for result in results):>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
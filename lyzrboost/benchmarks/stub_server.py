@@ -0,0 +1,194 @@
+"""
+Local stub of the Lyzr inference endpoint used by the benchmarks.
+
+The server speaks HTTP/1.1 with keep-alive and counts how many TCP
+connections and requests it has accepted, so benchmarks can report
+connection reuse without touching the real API.
+"""
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Union
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # One handler instance is created per TCP connection
+        self.server.stats_increment("connections")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.stats_increment("requests")
+
+        try:
+            message = json.loads(body).get("message", "")
+        except ValueError:
+            message = ""
+
+        delay = self.server.delay() if callable(self.server.delay) else self.server.delay
+        if delay:
+            time.sleep(delay)
+
+        if self.path.rstrip("/").endswith("/stream"):
+            self._stream(message)
+            return
+
+        failure = self.server.take_failure()
+        if failure is not None:
+            status, retry_after = failure
+            self.send_response(status)
+            if retry_after is not None:
+                self.send_header("Retry-After", str(retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = json.dumps({
+            "response": "ok",
+            "data": {"response": f"echo: {message}" + "x" * self.server.response_padding}
+        }).encode("utf-8")
+
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up on the request (e.g. a deadline or a cancelled hedge)
+            self.close_connection = True
+
+    def _stream(self, message):
+        """Answer with a Server-Sent Events stream, one word per event."""
+        # Neither content type names a charset, like many real servers
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if self.server.sse else "text/plain")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        words = f"echo: {message}".split(" ")
+        if self.server.sse:
+            events = [f"data: {json.dumps({'content': word + ' '}, ensure_ascii=False)}\n\n" for word in words]
+            events.append("data: [DONE]\n\n")
+        else:
+            events = [word + " " for word in words]
+        try:
+            for event in events:
+                body = event.encode("utf-8")
+                self.wfile.write(f"{len(body):X}\r\n".encode("ascii") + body + b"\r\n")
+                self.wfile.flush()
+                if self.server.stream_delay:
+                    time.sleep(self.server.stream_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client cancelled the stream
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+
+class StubAgentServer:
+    """
+    Threaded HTTP server that mimics the agent inference endpoint.
+
+    Usage:
+        with StubAgentServer(delay=0.01) as server:
+            send_agent_request(..., endpoint=server.url)
+            print(server.connections, server.requests)
+    """
+
+    def __init__(
+        self,
+        delay: Union[float, Callable[[], float]] = 0.0,
+        response_padding: int = 0,
+        port: int = 0,
+        stream_delay: float = 0.0,
+        sse: bool = True
+    ):
+        """
+        Initialize the stub server.
+
+        Args:
+            delay: Seconds to sleep before answering each request, or a
+                   callable returning them (e.g. to simulate slow outliers)
+            response_padding: Extra characters appended to each response body
+            port: Port to listen on (0 picks a free port)
+            stream_delay: Seconds to sleep between streamed events
+            sse: Stream Server-Sent Events; False streams plain text chunks
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.delay = delay
+        self._server.response_padding = response_padding
+        self._server.stream_delay = stream_delay
+        self._server.sse = sse
+        self._server.counters = {"connections": 0, "requests": 0}
+        self._server.counters_lock = threading.Lock()
+        self._server.stats_increment = self._increment
+        self._server.failures = []
+        self._server.take_failure = self._take_failure
+        self._thread: Optional[threading.Thread] = None
+
+    def _increment(self, name: str) -> None:
+        with self._server.counters_lock:
+            self._server.counters[name] += 1
+
+    def _take_failure(self):
+        with self._server.counters_lock:
+            if self._server.failures:
+                return self._server.failures.pop(0)
+        return None
+
+    def fail_next(self, count: int, status: int = 503, retry_after: Optional[float] = None) -> None:
+        """Answer the next ``count`` requests with an error status."""
+        with self._server.counters_lock:
+            self._server.failures.extend([(status, retry_after)] * count)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v3/inference/chat/"
+
+    @property
+    def stream_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v3/inference/stream/"
+
+    @property
+    def connections(self) -> int:
+        return self._server.counters["connections"]
+
+    @property
+    def requests(self) -> int:
+        return self._server.counters["requests"]
+
+    def reset(self) -> None:
+        with self._server.counters_lock:
+            for name in self._server.counters:
+                self._server.counters[name] = 0
+
+    def start(self) -> "StubAgentServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubAgentServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -27,7 +27,7 @@ def research_topic(topic):
     Research phase: Gather information about the topic.
     In a real scenario, this would use a specialized research agent.
     """
-    logger.info(f"Step 1: Researching topic '{topic}'")
+    logger.info("Step 1: Researching topic '%s'", topic)
     
     message = (
         f"You are a research assistant. Research the topic '{topic}' "
@@ -56,7 +56,7 @@ def write_content(data):
     topic = data["topic"]
     research = data["research"]
     
-    logger.info(f"Step 2: Writing content for '{topic}'")
+    logger.info("Step 2: Writing content for '%s'", topic)
     
     message = (
         f"You are a content writer. Based on the following research about '{topic}', "
@@ -83,7 +83,7 @@ def edit_content(data):
     topic = data["topic"]
     draft = data["draft_content"]
     
-    logger.info(f"Step 3: Editing content for '{topic}'")
+    logger.info("Step 3: Editing content for '%s'", topic)
     
     message = (
         f"You are an editor. Review and improve the following draft blog post about '{topic}'. "
@@ -3,13 +3,17 @@ Command-line interface for LyzrBoost.
 """
 
 import argparse
+import json
 import sys
 import os
 import logging
 from typing import List, Optional, Dict, Any
 
 from ..core.agent_api import send_agent_request, get_agent_response, APIError
-from ..core.workflow import Workflow, create_workflow_from_config
+from ..core.client import AgentClient
+from ..core.hedging import HedgePolicy
+from ..core.workflow import MissingInputError, Workflow, create_workflow_from_config
+from ..core.compiler import select_output
 from ..utils.config import load_config, ConfigError
 from ..utils.logger import setup_logger
 
@@ -47,7 +51,20 @@ def main(args: Optional[List[str]] = None) -> int:
     # 'run' command - Run a workflow
     run_parser = subparsers.add_parser("run", help="Run a workflow")
     run_parser.add_argument("workflow_file", help="Path to workflow configuration file")
-    run_parser.add_argument("--input", "-i", help="Input data for the workflow")
+    run_parser.add_argument("--input", "-i", default="", help="Input data for the workflow")
+    run_parser.add_argument(
+        "--var",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Value for a variable declared under 'inputs' (can be used multiple times)"
+    )
+    run_parser.add_argument("--user", help="User ID for agent calls (overrides the config)")
+    run_parser.add_argument(
+        "--output-format",
+        choices=["default", "final_only", "json"],
+        help="How to print the result (defaults to the config's output_format)"
+    )
     
     # 'debug' command - Debug an agent interaction
     debug_parser = subparsers.add_parser("debug", help="Debug an agent interaction")
@@ -88,7 +105,7 @@ def main(args: Optional[List[str]] = None) -> int:
             return 0
             
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return 1
 
 def run_workflow_command(args: argparse.Namespace, api_key: Optional[str], logger: logging.Logger) -> int:
@@ -105,19 +122,47 @@ def run_workflow_command(args: argparse.Namespace, api_key: Optional[str], logge
     """
     try:
         # Load the workflow configuration
-        logger.info(f"Loading workflow from {args.workflow_file}")
+        logger.info("Loading workflow from %s", args.workflow_file)
         config = load_config(args.workflow_file)
-        
-        # This is a placeholder for more sophisticated workflow loading
-        # In a real implementation, we'd parse the steps and create callables
-        logger.error("Workflow execution from config files is not yet implemented")
-        return 1
+        if args.output_format:
+            config["output_format"] = args.output_format
+            
+        workflow_input = {"input": args.input}
+        for assignment in args.var:
+            name, sep, value = assignment.partition("=")
+            if not sep:
+                raise ConfigError(f"Invalid --var '{assignment}', expected NAME=VALUE")
+            workflow_input[name] = value
+            
+        client_options = {"api_key": api_key}
+        if config.get("endpoint"):
+            client_options["endpoint"] = config["endpoint"]
+        if config.get("hedge"):
+            client_options["hedge_policy"] = HedgePolicy(**config["hedge"])
+            
+        # Validates every step and template before any agent is called
+        with AgentClient(**client_options) as client:
+            workflow = create_workflow_from_config(config, client=client, user_id=args.user)
+            result = workflow.run(workflow_input)
+            
+        output = select_output(config, result)
+        if config.get("output_format") == "json":
+            print(json.dumps(output, indent=2))
+        elif isinstance(output, dict):
+            for key, value in output.items():
+                print(f"{key}: {value}")
+        else:
+            print(output)
+        return 0
         
     except ConfigError as e:
-        logger.error(f"Configuration error: {str(e)}")
+        logger.error("Configuration error: %s", e)
+        return 1
+    except MissingInputError as e:
+        logger.error("%s (pass each one with --var NAME=VALUE)", e)
         return 1
     except Exception as e:
-        logger.error(f"Error running workflow: {str(e)}")
+        logger.error("Error running workflow: %s", e)
         return 1
 
 def debug_agent_command(args: argparse.Namespace, api_key: Optional[str], logger: logging.Logger) -> int:
@@ -136,7 +181,7 @@ def debug_agent_command(args: argparse.Namespace, api_key: Optional[str], logger
         # Use agent ID as session ID if not provided
         session_id = args.session or args.agent
         
-        logger.info(f"Sending debug message to agent {args.agent}")
+        logger.info("Sending debug message to agent %s", args.agent)
         
         # Send the request to the agent
         response = send_agent_request(
@@ -148,7 +193,7 @@ def debug_agent_command(args: argparse.Namespace, api_key: Optional[str], logger
         )
         
         # Print the full response in debug mode
-        logger.debug(f"Full response: {response}")
+        logger.debug("Full response: %s", response)
         
         # Print just the response text for normal output
         text_response = response.get("data", {}).get("response", "")
@@ -157,10 +202,10 @@ def debug_agent_command(args: argparse.Namespace, api_key: Optional[str], logger
         return 0
         
     except APIError as e:
-        logger.error(f"API error: {str(e)}")
+        logger.error("API error: %s", e)
         return 1
     except Exception as e:
-        logger.error(f"Error debugging agent: {str(e)}")
+        logger.error("Error debugging agent: %s", e)
         return 1
 
 def show_version_command() -> int:
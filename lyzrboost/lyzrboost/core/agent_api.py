@@ -2,29 +2,32 @@
 Module for interacting with Lyzr agent inference API.
 """
 
-import requests
 import logging
-import json
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional
+
+# DEFAULT_API_ENDPOINT and APIError are re-exported for backward compatibility
+from .client import (
+    AgentClient,
+    DEFAULT_API_ENDPOINT,
+    extract_response_text,
+    get_default_client,
+)
+from .errors import APIError
+from .batch import send_agent_requests_many
+from .streaming import AgentStream
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Constants
-DEFAULT_API_ENDPOINT = "https://agent-prod.studio.lyzr.ai/v3/inference/chat/"
-
-class APIError(Exception):
-    """Exception raised for API errors."""
-    pass
-
 def send_agent_request(
     user_id: str,
     agent_id: str,
     session_id: str,
     message: str,
     api_key: Optional[str] = None,
-    endpoint: str = DEFAULT_API_ENDPOINT,
-    timeout: int = 60,
+    endpoint: Optional[str] = None,
+    timeout: Optional[float] = None,
+    client: Optional[AgentClient] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -36,8 +39,11 @@ def send_agent_request(
         session_id: Session identifier for conversation continuity
         message: The message to send to the agent
         api_key: API key for authentication (if None, must be set in environment)
-        endpoint: API endpoint URL (defaults to production endpoint)
-        timeout: Request timeout in seconds
+        endpoint: API endpoint URL (defaults to the client's endpoint, which is
+                  the production endpoint unless configured otherwise)
+        timeout: Request timeout in seconds (defaults to the client's timeout, 60s)
+        client: AgentClient to send the request with (defaults to the shared
+                pooled client, so connections are reused across calls)
         **kwargs: Additional parameters to include in the request
         
     Returns:
@@ -46,52 +52,19 @@ def send_agent_request(
     Raises:
         APIError: If the API request fails
     """
-    headers = {
-        "Content-Type": "application/json",
-    }
-    
-    # Add API key if provided
-    if api_key:
-        headers["x-api-key"] = api_key
-        
-    # Prepare the payload
-    payload = {
-        "user_id": user_id,
-        "agent_id": agent_id,
-        "session_id": session_id,
-        "message": message,
-        **kwargs
-    }
-    
-    logger.debug(f"Sending request to {endpoint} for agent {agent_id}")
-    
-    try:
-        response = requests.post(
-            endpoint,
-            headers=headers,
-            json=payload,
-            timeout=timeout
-        )
-        
-        # Check for HTTP errors
-        response.raise_for_status()
+    if client is None:
+        client = get_default_client()
 
-        # ADDED: Print raw response content for debugging
-        logger.debug(f"Raw API Response Content: {response.text}")
-
-        # Parse the response
-        data = response.json()
-        logger.debug(f"Parsed API Response Data: {data}")
-        logger.debug(f"Received response from agent {agent_id}")
-        return data
-        
-    except requests.exceptions.RequestException as e:
-        logger.error(f"API request failed: {str(e)}")
-        raise APIError(f"Failed to communicate with Lyzr API: {str(e)}")
-    
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse API response: {str(e)}")
-        raise APIError(f"Invalid response from Lyzr API: {str(e)}")
+    return client.send(
+        user_id=user_id,
+        agent_id=agent_id,
+        session_id=session_id,
+        message=message,
+        api_key=api_key,
+        endpoint=endpoint,
+        timeout=timeout,
+        **kwargs
+    )
 
 def get_agent_response(
     user_id: str,
@@ -132,12 +105,49 @@ def get_agent_response(
         **kwargs
     )
     
-    # Extract just the text response
-    # Note: This assumes a specific response format and may need adjustment
-    try:
-        # ADDED: Log the data being processed
-        logger.debug(f"Extracting response from data: {response_data}")
-        return response_data.get("data", {}).get("response", "")
-    except (AttributeError, KeyError) as e:
-        logger.error(f"Failed to extract response text: {str(e)}")
-        raise APIError(f"Unexpected response format: {str(e)}") 
\ No newline at end of file
+    return extract_response_text(response_data)
+
+def stream_agent_response(
+    user_id: str,
+    agent_id: str,
+    session_id: Optional[str] = None,
+    message: str = "",
+    api_key: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    timeout: Optional[float] = None,
+    client: Optional[AgentClient] = None,
+    **kwargs
+) -> AgentStream:
+    """
+    Stream an agent's response as incremental text chunks.
+    
+    Args:
+        user_id: Unique identifier for the user
+        agent_id: ID of the Lyzr agent to query
+        session_id: Session identifier (defaults to agent_id if None)
+        message: The message to send to the agent
+        api_key: API key for authentication
+        endpoint: Streaming endpoint URL (defaults to the client's stream endpoint)
+        timeout: Seconds to wait for the connection and between chunks
+        client: AgentClient to use (defaults to the shared pooled client)
+        **kwargs: Additional parameters to include in the request
+        
+    Returns:
+        AgentStream that yields text chunks; call cancel() to stop early
+        
+    Raises:
+        APIError: If the stream cannot be opened
+    """
+    if client is None:
+        client = get_default_client()
+        
+    return client.stream(
+        user_id=user_id,
+        agent_id=agent_id,
+        session_id=session_id,
+        message=message,
+        api_key=api_key,
+        endpoint=endpoint,
+        timeout=timeout,
+        **kwargs
+    )
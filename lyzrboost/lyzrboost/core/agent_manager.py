@@ -3,9 +3,24 @@ Module for managing agent sessions and API configurations.
 """
 
 import os
+import threading
+import time
 import uuid
 import logging
-from typing import Dict, Optional, List, Any
+import weakref
+from typing import Dict, Optional, List, Any, Union
+
+from .history import SessionHistory, Summarizer
+from .session_backends import SessionBackend
+from .sessions import (
+    DEFAULT_MAX_SESSIONS,
+    EVICT_CAPACITY,
+    EVICT_EXPIRED,
+    EVICT_IDLE,
+    EvictionCallback,
+    SessionStore,
+    ShardedSessionStore,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,15 +33,69 @@ class AgentManager:
     - Generate and track session IDs
     - Store and retrieve agent configurations
     - Manage API keys and endpoints
+    
+    Sessions live in a bounded SessionStore: the least recently used
+    session is evicted once ``max_sessions`` is reached, and sessions can
+    expire after a period of inactivity or a fixed lifetime.
+    
+    Each session's history is a SessionHistory, optionally bounded to the
+    last ``history_max_turns`` turns and/or a character or token budget,
+    with an optional summarizer that compacts old turns into a rolling
+    summary.
+    
+    The manager is safe to share between threads. The session store's lock
+    is only held for short lookups and every history has its own lock, so
+    requests for different sessions do not wait for each other's history
+    updates or summarizer calls. ``session_shards`` optionally splits the
+    store into independently locked shards (lock striping) for servers
+    whose threads contend on the store lock itself.
+    
+    With a ``session_backend`` sessions are persisted and survive restarts.
+    The in-memory store then acts as a read-through LRU cache of hot
+    sessions: sessions evicted for capacity stay in the backend and are
+    loaded again on their next use, while sessions that expire are removed
+    from the backend as well.
     """
     
-    def __init__(self, api_key: Optional[str] = None, default_endpoint: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        default_endpoint: Optional[str] = None,
+        max_sessions: Optional[int] = DEFAULT_MAX_SESSIONS,
+        session_idle_ttl: Optional[float] = None,
+        session_ttl: Optional[float] = None,
+        on_session_evicted: Optional[EvictionCallback] = None,
+        session_store: Optional[Union[SessionStore, ShardedSessionStore]] = None,
+        history_max_turns: Optional[int] = None,
+        history_max_chars: Optional[int] = None,
+        history_max_tokens: Optional[int] = None,
+        history_summarizer: Optional[Summarizer] = None,
+        session_shards: int = 1,
+        session_backend: Optional[SessionBackend] = None
+    ):
         """
         Initialize the AgentManager.
         
         Args:
             api_key: Optional API key for Lyzr services
             default_endpoint: Optional API endpoint URL
+            max_sessions: Maximum number of sessions kept (None for no limit)
+            session_idle_ttl: Seconds a session may go unused before it is evicted
+            session_ttl: Seconds after creation a session is evicted regardless of use
+            on_session_evicted: Optional callback invoked as
+                                ``callback(session_id, record, reason)`` for every
+                                evicted session
+            session_store: Optional pre-configured store (the other session
+                           options are then ignored)
+            history_max_turns: Maximum number of turns kept per session (None for no limit)
+            history_max_chars: Maximum number of message characters kept per session
+            history_max_tokens: Maximum number of estimated tokens kept per session
+            history_summarizer: Optional function ``(previous_summary, dropped_turns) -> summary``
+                                that compacts turns dropped from a session's history
+            session_shards: Number of lock stripes the session store is split into
+                            (1 keeps a single store)
+            session_backend: Optional persistent storage for sessions (None keeps
+                             sessions in memory only)
         """
         # Use provided API key or check environment variable
         self.api_key = api_key or os.environ.get("LYZR_API_KEY")
@@ -34,8 +103,38 @@ class AgentManager:
         # Use provided endpoint or default from agent_api
         self.default_endpoint = default_endpoint
         
-        # Dictionary to store active sessions
-        self._sessions: Dict[str, Dict[str, Any]] = {}
+        # Bounded store of active sessions
+        if session_store is None and session_shards > 1:
+            session_store = ShardedSessionStore(
+                shards=session_shards,
+                max_sessions=max_sessions,
+                idle_ttl=session_idle_ttl,
+                ttl=session_ttl,
+                on_evict=on_session_evicted
+            )
+        elif session_store is None:
+            session_store = SessionStore(
+                max_sessions=max_sessions,
+                idle_ttl=session_idle_ttl,
+                ttl=session_ttl,
+                on_evict=on_session_evicted
+            )
+        self._sessions = session_store
+        
+        # Persistent storage behind the in-memory store
+        self._session_backend = session_backend
+        if session_backend is not None:
+            self._sessions.add_eviction_listener(self._on_session_evicted)
+        # One lock per session, shared by every in-memory copy of it, so a
+        # reload from the backend and a write to an evicted copy never overlap
+        self._session_locks: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self._session_locks_guard = threading.Lock()
+        
+        # Policy applied to every new session history
+        self.history_max_turns = history_max_turns
+        self.history_max_chars = history_max_chars
+        self.history_max_tokens = history_max_tokens
+        self.history_summarizer = history_summarizer
         
         # Dictionary to cache agent metadata
         self._agent_cache: Dict[str, Dict[str, Any]] = {}
@@ -56,28 +155,96 @@ class AgentManager:
         # Create a unique ID
         session_id = f"{prefix}{uuid.uuid4().hex}"
         
-        # Initialize the session data
-        self._sessions[session_id] = {
+        # Initialize the session data (the store sets created_at and last_access)
+        record = self._sessions.create(session_id, {
             "created_at": None,
             "last_access": None,
             "agent_id": agent_id,
-            "history": []
-        }
+            "history": self._new_history(session_id)
+        })
+        if self._session_backend is not None:
+            self._session_backend.save_session(session_id, agent_id, record["created_at"], record["last_access"])
         
-        logger.debug(f"Generated new session ID: {session_id}")
+        logger.debug("Generated new session ID: %s", session_id)
         return session_id
     
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Get the session data for a given session ID.
         
+        Reading a session counts as using it and updates its ``last_access``.
+        A session that is not in memory is loaded from the session backend.
+        
         Args:
             session_id: The session ID to retrieve
             
         Returns:
-            Session data dictionary or None if not found
+            Session data dictionary or None if not found or expired
         """
-        return self._sessions.get(session_id)
+        session = self._sessions.get(session_id)
+        if session is None and self._session_backend is not None:
+            session = self._load_session(session_id)
+        return session
+    
+    def _load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        # Waits for writes still going to an evicted copy, so the load sees them
+        with self._session_lock(session_id):
+            session = self._sessions.get(session_id)
+            if session is not None:
+                # Loaded by another thread meanwhile
+                return session
+            stored = self._session_backend.load(session_id)
+            if stored is None:
+                return None
+            history = self._new_history(session_id)
+            history.restore(stored["turns"], stored["summary"], stored["total_turns"])
+            session = self._sessions.restore(session_id, {
+                "created_at": stored["created_at"],
+                "last_access": stored["last_access"],
+                "agent_id": stored["agent_id"],
+                "history": history
+            })
+        if session is None:
+            # Expired while it was out of memory
+            self._session_backend.delete(session_id)
+        return session
+    
+    def _session_lock(self, session_id: str) -> Any:
+        with self._session_locks_guard:
+            lock = self._session_locks.get(session_id)
+            if lock is None:
+                lock = threading.RLock()
+                self._session_locks[session_id] = lock
+            return lock
+    
+    def _is_current(self, session_id: str, session: Dict[str, Any]) -> bool:
+        # False once the record was evicted (and possibly reloaded as a new
+        # copy); call with the history lock held
+        return self._session_backend is None or self._sessions.get(session_id, touch=False) is session
+    
+    def _on_session_evicted(self, session_id: str, record: Dict[str, Any], reason: str) -> None:
+        if reason in (EVICT_IDLE, EVICT_EXPIRED):
+            self._session_backend.delete(session_id)
+        elif reason == EVICT_CAPACITY:
+            # Only the cached copy is dropped; keep its last use for the idle TTL
+            self._session_backend.save_session(
+                session_id, record["agent_id"], record["created_at"], record["last_access"]
+            )
+    
+    def _new_history(self, session_id: str) -> SessionHistory:
+        return SessionHistory(
+            max_turns=self.history_max_turns,
+            max_chars=self.history_max_chars,
+            max_tokens=self.history_max_tokens,
+            summarizer=self.history_summarizer,
+            lock=self._session_lock(session_id) if self._session_backend is not None else None
+        )
+    
+    def _require_session(self, session_id: str) -> Dict[str, Any]:
+        session = self.get_session(session_id)
+        if session is None:
+            raise KeyError(f"Session {session_id} not found")
+        return session
     
     def store_interaction(
         self,
@@ -89,6 +256,9 @@ class AgentManager:
         """
         Store an interaction in the session history.
         
+        Old turns beyond the history limits are dropped (and summarized when
+        a summarizer is configured).
+        
         Args:
             session_id: The session ID to update
             user_message: The message sent by the user
@@ -98,20 +268,29 @@ class AgentManager:
         Raises:
             KeyError: If the session_id is not found
         """
-        if session_id not in self._sessions:
-            raise KeyError(f"Session {session_id} not found")
-            
         # Create the interaction record
         interaction = {
             "user_message": user_message,
             "agent_response": agent_response,
-            "timestamp": None,  # Placeholder for timestamp
+            "timestamp": time.time(),
             "metadata": metadata or {}
         }
         
-        # Add to session history
-        self._sessions[session_id]["history"].append(interaction)
-        logger.debug(f"Stored interaction in session {session_id}")
+        # Add to session history, persisting in the same order as in memory
+        while True:
+            session = self._require_session(session_id)
+            history = session["history"]
+            with history.lock:
+                # An evicted copy would reuse turn numbers of the reloaded one
+                if not self._is_current(session_id, session):
+                    continue
+                history.append(interaction)
+                if self._session_backend is not None:
+                    self._session_backend.append_turn(
+                        session_id, history.total_turns, interaction, len(history), history.summary
+                    )
+                break
+        logger.debug("Stored interaction in session %s", session_id)
     
     def get_session_history(self, session_id: str) -> List[Dict[str, Any]]:
         """
@@ -121,19 +300,80 @@ class AgentManager:
             session_id: The session ID to retrieve history for
             
         Returns:
-            List of interaction records
+            List of the interaction records kept in the history, oldest first
+            (a copy; see get_history for the summary of dropped turns)
             
         Raises:
             KeyError: If the session_id is not found
         """
-        if session_id not in self._sessions:
-            raise KeyError(f"Session {session_id} not found")
+        return self._require_session(session_id)["history"].to_list()
+    
+    def get_history(self, session_id: str) -> SessionHistory:
+        """
+        Get the live history object of a session.
+        
+        Args:
+            session_id: The session ID to retrieve history for
             
-        return self._sessions[session_id]["history"]
+        Returns:
+            The session's SessionHistory, with the rolling ``summary`` of
+            dropped turns and the ``total_turns`` count
+            
+        Raises:
+            KeyError: If the session_id is not found
+        """
+        return self._require_session(session_id)["history"]
+    
+    def get_history_window(
+        self,
+        session_id: str,
+        max_turns: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the most recent interactions of a session that fit in a window.
+        
+        Only the returned turns are visited, so the cost does not grow with
+        the length of the conversation.
+        
+        Args:
+            session_id: The session ID to retrieve history for
+            max_turns: Maximum number of interactions to return
+            max_chars: Maximum number of message characters to return
+            
+        Returns:
+            List of interaction records, oldest first
+            
+        Raises:
+            KeyError: If the session_id is not found
+        """
+        return self._require_session(session_id)["history"].window(max_turns, max_chars)
+    
+    def build_history_prompt(
+        self,
+        session_id: str,
+        max_turns: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ) -> str:
+        """
+        Render a session's summary and recent interactions as prompt context.
+        
+        Args:
+            session_id: The session ID to render
+            max_turns: Maximum number of interactions to include
+            max_chars: Maximum number of message characters to include
+            
+        Returns:
+            Conversation text, or '' for a new session
+            
+        Raises:
+            KeyError: If the session_id is not found
+        """
+        return self._require_session(session_id)["history"].render(max_turns, max_chars)
     
     def clear_session(self, session_id: str) -> None:
         """
-        Clear a session's history.
+        Clear a session's history and summary.
         
         Args:
             session_id: The session ID to clear
@@ -141,11 +381,17 @@ class AgentManager:
         Raises:
             KeyError: If the session_id is not found
         """
-        if session_id not in self._sessions:
-            raise KeyError(f"Session {session_id} not found")
-            
-        self._sessions[session_id]["history"] = []
-        logger.debug(f"Cleared history for session {session_id}")
+        while True:
+            session = self._require_session(session_id)
+            history = session["history"]
+            with history.lock:
+                if not self._is_current(session_id, session):
+                    continue
+                history.clear()
+                if self._session_backend is not None:
+                    self._session_backend.clear_history(session_id)
+                break
+        logger.debug("Cleared history for session %s", session_id)
     
     def delete_session(self, session_id: str) -> None:
         """
@@ -157,11 +403,65 @@ class AgentManager:
         Raises:
             KeyError: If the session_id is not found
         """
-        if session_id not in self._sessions:
-            raise KeyError(f"Session {session_id} not found")
+        removed = self._session_backend is not None and self._session_backend.delete(session_id)
+        try:
+            self._sessions.delete(session_id)
+        except KeyError:
+            if not removed:
+                raise
+        logger.debug("Deleted session %s", session_id)
+    
+    def find_sessions(self, agent_id: str) -> List[str]:
+        """
+        Get the IDs of the sessions of an agent.
+        
+        Uses the session backend's agent index when there is one; otherwise
+        the sessions in memory are scanned.
+        
+        Args:
+            agent_id: The agent ID to look up
             
-        del self._sessions[session_id]
-        logger.debug(f"Deleted session {session_id}")
+        Returns:
+            List of session IDs
+        """
+        if self._session_backend is not None:
+            return self._session_backend.find_by_agent(agent_id)
+        return sorted(
+            session_id for session_id, record in self._sessions.items()
+            if record.get("agent_id") == agent_id
+        )
+        
+    def purge_expired_sessions(self) -> int:
+        """
+        Evict every session whose idle or absolute TTL has passed.
+        
+        Expired sessions are also dropped as they are looked up and while new
+        sessions are created; call this to release their memory right away.
+        
+        Returns:
+            Number of sessions evicted
+        """
+        evicted = self._sessions.purge_expired()
+        if self._session_backend is not None:
+            now = time.time()
+            idle_ttl, ttl = self._sessions.idle_ttl, self._sessions.ttl
+            # Sessions still in memory were just checked and may have newer use
+            evicted += self._session_backend.purge(
+                idle_before=now - idle_ttl if idle_ttl is not None else None,
+                created_before=now - ttl if ttl is not None else None,
+                exclude={session_id for session_id, _ in self._sessions.items()}
+            )
+        return evicted
+        
+    def session_stats(self) -> Dict[str, Any]:
+        """
+        Get session store statistics.
+        
+        Returns:
+            Dict with sessions, max_sessions, interactions, approx_bytes,
+            hits, misses and evictions per reason
+        """
+        return self._sessions.stats()
         
     def get_api_key(self) -> Optional[str]:
         """
@@ -170,4 +470,15 @@ class AgentManager:
         Returns:
             The API key or None if not set
         """
-        return self.api_key 
\ No newline at end of file
+        return self.api_key 
+        
+    def close(self) -> None:
+        """Flush and close the session backend, if any."""
+        if self._session_backend is not None:
+            self._session_backend.close()
+    
+    def __enter__(self) -> "AgentManager":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,603 @@
+"""
+Asyncio client for the Lyzr agent inference API.
+
+Requires the optional ``aiohttp`` dependency (``pip install lyzrboost[async]``).
+"""
+
+import asyncio
+import codecs
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .client import (
+    BaseAgentClient,
+    DEFAULT_API_ENDPOINT,
+    DEFAULT_TIMEOUT,
+    extract_response_text,
+)
+from .errors import APIError, APIConnectionError, APITimeoutError, DeadlineExceeded
+from ..utils.logger import truncate_payload
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreakerRegistry
+from .deadline import clamp_timeout, current_deadline, remaining_time, within_deadline_async
+from .hedging import HedgePolicy
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, parse_retry_after
+from .singleflight import AsyncSingleFlight, make_flight_key
+from .streaming import DEFAULT_STREAM_ENDPOINT, SSEDecoder, event_text
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+def _map_client_error(error: Exception) -> APIError:
+    """
+    Convert an aiohttp or timeout exception into the matching APIError.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return APIError(
+            f"Failed to communicate with Lyzr API: {str(error)}",
+            status_code=error.status,
+            retry_after=parse_retry_after(error.headers.get("Retry-After")) if error.headers else None
+        )
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return APIConnectionError(f"Failed to communicate with Lyzr API: {str(error)}")
+    if isinstance(error, asyncio.TimeoutError):
+        return APITimeoutError("Failed to communicate with Lyzr API: request timed out")
+    return APIError(f"Failed to communicate with Lyzr API: {str(error)}")
+
+
+class AsyncAgentStream:
+    """
+    Async iterator over the text chunks of a streamed agent response.
+
+    Asyncio counterpart of AgentStream: Server-Sent Events responses are
+    parsed event by event, any other response is yielded as it arrives, and
+    the received text is accumulated in ``text``. ``cancel()``, leaving an
+    ``async with`` block or breaking out of the loop closes the connection.
+    """
+
+    def __init__(self, response: "aiohttp.ClientResponse", agent_id: str = "", chunk_size: int = 1024):
+        """
+        Initialize the stream.
+
+        Args:
+            response: An open aiohttp response
+            agent_id: ID of the agent, used in log messages
+            chunk_size: Read size for non-SSE responses
+        """
+        self.response = response
+        self.agent_id = agent_id
+        self.chunk_size = chunk_size
+        self._parts: List[str] = []
+        self._cancelled = False
+        self._iterator: Optional[AsyncIterator[str]] = None
+
+    @property
+    def is_sse(self) -> bool:
+        """True if the server answered with an event stream."""
+        return "text/event-stream" in self.response.headers.get("Content-Type", "")
+
+    @property
+    def cancelled(self) -> bool:
+        """True if cancel() was called."""
+        return self._cancelled
+
+    @property
+    def text(self) -> str:
+        """All text received so far."""
+        return "".join(self._parts)
+
+    async def _chunks(self) -> AsyncIterator[str]:
+        if self.is_sse:
+            decoder = SSEDecoder()
+            async for raw in self.response.content:
+                data = decoder.feed(raw.decode("utf-8").rstrip("\n"))
+                if data is not None:
+                    chunk = event_text(data)
+                    if chunk:
+                        yield chunk
+                if decoder.done:
+                    return
+            data = decoder.flush()
+            if data is not None and event_text(data):
+                yield event_text(data)
+        else:
+            decoder = codecs.getincrementaldecoder(self.response.charset or "utf-8")(errors="replace")
+            async for raw in self.response.content.iter_chunked(self.chunk_size):
+                chunk = decoder.decode(raw)
+                if chunk:
+                    yield chunk
+            chunk = decoder.decode(b"", final=True)
+            if chunk:
+                yield chunk
+
+    async def _generate(self) -> AsyncIterator[str]:
+        try:
+            async for chunk in self._chunks():
+                if self._cancelled:
+                    break
+                self._parts.append(chunk)
+                yield chunk
+            logger.debug("Stream from agent %s finished", self.agent_id)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if self._cancelled:
+                return
+            logger.error("Streaming from agent %s failed: %s", self.agent_id, e)
+            if isinstance(e, asyncio.TimeoutError):
+                raise APITimeoutError("Stream from Lyzr API timed out") from e
+            raise APIError(f"Failed to read stream from Lyzr API: {str(e)}") from e
+        finally:
+            self.response.close()
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        if self._iterator is None:
+            self._iterator = self._generate()
+        return self._iterator
+
+    async def __anext__(self) -> str:
+        return await self.__aiter__().__anext__()
+
+    def cancel(self) -> None:
+        """
+        Stop the stream and close the connection.
+        """
+        if not self._cancelled:
+            logger.debug("Cancelling stream from agent %s", self.agent_id)
+            self._cancelled = True
+            self.response.close()
+
+    def close(self) -> None:
+        """Alias for cancel()."""
+        self.cancel()
+
+    async def collect(self, on_chunk: Optional[Callable[[str], Any]] = None) -> str:
+        """
+        Consume the rest of the stream and return the full text.
+
+        Args:
+            on_chunk: Optional callback invoked with every chunk as it arrives
+
+        Returns:
+            The complete response text
+        """
+        async for chunk in self:
+            if on_chunk is not None:
+                on_chunk(chunk)
+        return self.text
+
+    async def __aenter__(self) -> "AsyncAgentStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.cancel()
+
+
+class AsyncAgentClient(BaseAgentClient):
+    """
+    Asyncio counterpart of AgentClient.
+
+    All calls share one ``aiohttp`` connection pool, and a per-client semaphore
+    bounds how many requests are in flight at once, so a single event loop can
+    keep many agent calls open without a thread per call.
+
+    The client must be used from one event loop; create it inside the loop
+    (or use ``async with``) and close it when done.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        endpoint: str = DEFAULT_API_ENDPOINT,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        pool_limit: Optional[int] = None,
+        pool_limit_per_host: int = 0,
+        headers: Optional[Dict[str, str]] = None,
+        session: Optional["aiohttp.ClientSession"] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        cache: Optional[ResponseCache] = None,
+        single_flight: Optional[AsyncSingleFlight] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        stream_endpoint: str = DEFAULT_STREAM_ENDPOINT
+    ):
+        """
+        Initialize the async client.
+
+        Args:
+            api_key: Default API key sent as ``x-api-key`` (can be overridden per call)
+            endpoint: Default API endpoint URL
+            timeout: Default request timeout in seconds
+            max_concurrency: Maximum number of requests in flight at once
+            pool_limit: Maximum number of pooled connections (defaults to max_concurrency)
+            pool_limit_per_host: Maximum connections per host (0 means no extra limit)
+            headers: Extra headers sent with every request
+            session: Optional pre-configured aiohttp session to use
+            retry_policy: Optional policy for retrying transient failures
+                          (no retries if None)
+            rate_limiter: Optional limiter every attempt must get a token from
+            circuit_breakers: Optional registry of per-endpoint/agent circuit
+                              breakers; open circuits fail fast with CircuitOpenError
+            cache: Optional response cache consulted before sending a request
+            single_flight: Optional AsyncSingleFlight; concurrent identical requests
+                           then share one upstream call
+            hedge_policy: Optional policy sending a duplicate request when a
+                          call is slower than recent calls usually are; the
+                          losing request is cancelled
+            stream_endpoint: Default endpoint URL for streamed responses
+
+        Raises:
+            ImportError: If aiohttp is not installed
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncAgentClient requires aiohttp. Install it with: pip install lyzrboost[async]"
+            )
+
+        super().__init__(
+            api_key=api_key,
+            endpoint=endpoint,
+            timeout=timeout,
+            headers=headers,
+            stream_endpoint=stream_endpoint
+        )
+        self.max_concurrency = max_concurrency
+        self.pool_limit = pool_limit or max_concurrency
+        self.pool_limit_per_host = pool_limit_per_host
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers
+        self.cache = cache
+        self.single_flight = single_flight
+        self.hedge_policy = hedge_policy
+
+        self._session = session
+        self._owns_session = session is None
+        # Created lazily so they bind to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        logger.debug("AsyncAgentClient initialized (max_concurrency=%d)", max_concurrency)
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.pool_limit_per_host
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._session
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _cache_io(self, func: Callable[..., Any], *args: Any) -> Any:
+        # A disk-backed cache would otherwise stall every task on the loop
+        if self.cache.blocking:
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+        return func(*args)
+
+    async def send(
+        self,
+        user_id: str,
+        agent_id: str,
+        session_id: str,
+        message: str,
+        api_key: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+        use_cache: Optional[bool] = None,
+        hedge: Optional[bool] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Send a request to a Lyzr agent and get the response.
+
+        Transient failures are retried if the client has a retry_policy, and
+        each attempt first awaits a token if the client has a rate_limiter.
+        The concurrency slot is not held while backing off or rate limited.
+        With circuit_breakers, calls to a degraded endpoint fail fast. With a
+        cache, repeated identical calls are answered without a request, and
+        with single_flight, identical calls already in flight are joined
+        (except under a deadline, which bounds only its own call). With
+        a hedge_policy, a slow call gets a duplicate request; the first
+        response wins and the other request is cancelled.
+
+        Args:
+            user_id: Unique identifier for the user
+            agent_id: ID of the Lyzr agent to query
+            session_id: Session identifier for conversation continuity
+            message: The message to send to the agent
+            api_key: API key for this call (defaults to the client's key)
+            endpoint: API endpoint URL (defaults to the client's endpoint)
+            timeout: Request timeout in seconds (defaults to the client's timeout)
+            use_cache: Per-call cache override (False bypasses the cache, True
+                       caches even session-bound calls); ignored without a cache
+            hedge: Per-call hedging override (False never hedges, True hedges
+                   even session-bound calls); ignored without a hedge_policy
+            **kwargs: Additional parameters to include in the request
+
+        Returns:
+            Dict containing the agent's response
+
+        Raises:
+            APIError: If the API request fails
+        """
+        endpoint = endpoint or self.endpoint
+        timeout = timeout if timeout is not None else self.timeout
+        request = self.build_request(user_id, agent_id, session_id, message, api_key, **kwargs)
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(endpoint, agent_id, session_id, message, kwargs, use_cache)
+            if cache_key is not None:
+                cached = await self._cache_io(self.cache.get, cache_key)
+                if cached is not None:
+                    logger.debug("Cache hit for agent %s", agent_id)
+                    return cached
+
+        hedge_request = None
+        if self.hedge_policy is not None and self.hedge_policy.applies_to(agent_id, session_id, hedge):
+            hedge_request = self.build_hedge_request(
+                endpoint, user_id, agent_id, session_id, message, api_key, **kwargs
+            )
+
+        async def call() -> Dict[str, Any]:
+            if hedge_request is None:
+                data = await self._execute(endpoint, agent_id, request, api_key, timeout)
+            else:
+                data = await self.hedge_policy.call_async(
+                    lambda: self._execute(endpoint, agent_id, request, api_key, timeout),
+                    lambda: self._execute(*hedge_request, api_key, timeout)
+                )
+
+            if cache_key is not None:
+                await self._cache_io(self.cache.set, cache_key, data)
+            return data
+
+        if self.single_flight is None or current_deadline() is not None:
+            # A follower would be bound by the leader's deadline instead of its own
+            return await call()
+        flight_key = make_flight_key(endpoint, api_key or self.api_key, request["payload"], timeout)
+        return await self.single_flight.do(flight_key, call)
+
+    async def _execute(
+        self,
+        endpoint: str,
+        agent_id: str,
+        request: Dict[str, Any],
+        api_key: Optional[str],
+        timeout: float
+    ) -> Dict[str, Any]:
+        """
+        Send a request through the rate limiter, circuit breaker and retry policy.
+        """
+        async def attempt() -> Dict[str, Any]:
+            if self.rate_limiter is not None:
+                acquired = await self.rate_limiter.acquire_async(
+                    self.rate_limiter.make_key(api_key or self.api_key, agent_id),
+                    timeout=remaining_time()
+                )
+                if not acquired:
+                    raise DeadlineExceeded("Deadline would expire while waiting for the rate limiter")
+            async with self._get_semaphore():
+                # Each attempt gets at most the time left until the caller's deadline
+                attempt_timeout = clamp_timeout(timeout)
+
+                async def post() -> Dict[str, Any]:
+                    return await within_deadline_async(
+                        lambda: self._post(endpoint, request, agent_id, attempt_timeout), timeout, attempt_timeout
+                    )
+
+                if self.circuit_breakers is not None:
+                    return await self.circuit_breakers.get(endpoint, agent_id).call_async(post)
+                return await post()
+
+        if self.retry_policy is None:
+            return await attempt()
+        return await self.retry_policy.call_async(attempt)
+
+    async def _post(
+        self,
+        endpoint: str,
+        request: Dict[str, Any],
+        agent_id: str,
+        timeout: float
+    ) -> Dict[str, Any]:
+        """
+        Perform a single HTTP attempt and map failures to APIError.
+        """
+        session = self._get_session()
+        logger.debug("Sending request to %s for agent %s", endpoint, agent_id)
+
+        try:
+            async with session.post(
+                endpoint,
+                headers=request["headers"],
+                json=request["payload"],
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                # Check for HTTP errors
+                response.raise_for_status()
+
+                text = await response.text()
+
+            # Parse the response
+            data = json.loads(text)
+
+            # Payload logging is guarded so nothing is formatted unless DEBUG is enabled
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw API Response Content: %s", truncate_payload(text))
+                logger.debug("Parsed API Response Data: %s", truncate_payload(data))
+                logger.debug("Received response from agent %s", agent_id)
+            return data
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("API request failed: %s", str(e) or "request timed out")
+            raise _map_client_error(e) from e
+
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse API response: %s", e)
+            raise APIError(f"Invalid response from Lyzr API: {str(e)}") from e
+
+    async def stream(
+        self,
+        user_id: str,
+        agent_id: str,
+        session_id: Optional[str] = None,
+        message: str = "",
+        api_key: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> AsyncAgentStream:
+        """
+        Send a request and stream the agent's response as it is generated.
+
+        Retries, rate limiting and circuit breaking apply to opening the
+        stream; once chunks start arriving, failures are raised to the reader.
+        The concurrency slot is only held while the stream is being opened.
+
+        Args:
+            user_id: Unique identifier for the user
+            agent_id: ID of the Lyzr agent to query
+            session_id: Session identifier (defaults to agent_id if None)
+            message: The message to send to the agent
+            api_key: API key for this call (defaults to the client's key)
+            endpoint: Streaming endpoint URL (defaults to the client's stream_endpoint)
+            timeout: Seconds to wait for the connection and between chunks
+            **kwargs: Additional parameters to include in the request
+
+        Returns:
+            AsyncAgentStream yielding text chunks
+
+        Raises:
+            APIError: If the stream cannot be opened
+        """
+        if session_id is None:
+            session_id = agent_id
+        endpoint = endpoint or self.stream_endpoint
+        timeout = timeout if timeout is not None else self.timeout
+        request = self.build_request(user_id, agent_id, session_id, message, api_key, **kwargs)
+        request["headers"]["Accept"] = "text/event-stream"
+
+        async def attempt() -> AsyncAgentStream:
+            if self.rate_limiter is not None:
+                acquired = await self.rate_limiter.acquire_async(
+                    self.rate_limiter.make_key(api_key or self.api_key, agent_id),
+                    timeout=remaining_time()
+                )
+                if not acquired:
+                    raise DeadlineExceeded("Deadline would expire while waiting for the rate limiter")
+            async with self._get_semaphore():
+                attempt_timeout = clamp_timeout(timeout)
+
+                async def open_stream() -> AsyncAgentStream:
+                    return await within_deadline_async(
+                        lambda: self._open_stream(endpoint, request, agent_id, attempt_timeout), timeout, attempt_timeout
+                    )
+
+                if self.circuit_breakers is not None:
+                    return await self.circuit_breakers.get(endpoint, agent_id).call_async(open_stream)
+                return await open_stream()
+
+        if self.retry_policy is None:
+            return await attempt()
+        return await self.retry_policy.call_async(attempt)
+
+    async def _open_stream(
+        self,
+        endpoint: str,
+        request: Dict[str, Any],
+        agent_id: str,
+        timeout: float
+    ) -> AsyncAgentStream:
+        """
+        Open a streamed response and map failures to APIError.
+        """
+        session = self._get_session()
+        logger.debug("Opening stream to %s for agent %s", endpoint, agent_id)
+
+        try:
+            response = await session.post(
+                endpoint,
+                headers=request["headers"],
+                json=request["payload"],
+                # No total limit: the timeout applies to connecting and to each read
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+            )
+            try:
+                response.raise_for_status()
+            except aiohttp.ClientResponseError:
+                response.release()
+                raise
+            return AsyncAgentStream(response, agent_id=agent_id)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error("API request failed: %s", str(e) or "request timed out")
+            raise _map_client_error(e) from e
+
+    async def get_response(
+        self,
+        user_id: str,
+        agent_id: str,
+        session_id: Optional[str] = None,
+        message: str = "",
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Send a request and return just the agent's text response.
+
+        Args:
+            user_id: Unique identifier for the user
+            agent_id: ID of the Lyzr agent to query
+            session_id: Session identifier (defaults to agent_id if None)
+            message: The message to send to the agent
+            api_key: API key for this call (defaults to the client's key)
+            **kwargs: Additional parameters passed to send()
+
+        Returns:
+            String containing the agent's text response
+
+        Raises:
+            APIError: If the API request fails
+        """
+        if session_id is None:
+            session_id = agent_id
+
+        response_data = await self.send(
+            user_id=user_id,
+            agent_id=agent_id,
+            session_id=session_id,
+            message=message,
+            api_key=api_key,
+            **kwargs
+        )
+        return extract_response_text(response_data)
+
+    async def close(self) -> None:
+        """
+        Close the underlying aiohttp session if this client created it.
+        """
+        if self._session is not None and self._owns_session and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> "AsyncAgentClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
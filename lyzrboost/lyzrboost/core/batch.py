@@ -0,0 +1,86 @@
+"""
+Bulk helpers for fanning agent requests out over many messages.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+from .client import AgentClient, get_default_client
+from ..utils.concurrency import BatchResult, bounded_map
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_BATCH_CONCURRENCY = 8
+
+_RECORD_FIELDS = ("user_id", "agent_id", "session_id", "message")
+
+AgentRecord = Union[Sequence[Any], Dict[str, Any]]
+
+
+def _normalize_record(record: AgentRecord) -> Dict[str, Any]:
+    if isinstance(record, dict):
+        missing = [field for field in ("user_id", "agent_id", "message") if field not in record]
+        if missing:
+            raise ValueError(f"Batch record is missing fields: {', '.join(missing)}")
+        request = dict(record)
+        if request.get("session_id") is None:
+            request["session_id"] = request["agent_id"]
+        return request
+
+    if len(record) != len(_RECORD_FIELDS):
+        raise ValueError(
+            "Batch records must be (user_id, agent_id, session_id, message) tuples or dicts"
+        )
+    request = dict(zip(_RECORD_FIELDS, record))
+    if request["session_id"] is None:
+        request["session_id"] = request["agent_id"]
+    return request
+
+
+def send_agent_requests_many(
+    records: Iterable[AgentRecord],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ordered: bool = True,
+    client: Optional[AgentClient] = None,
+    **kwargs
+) -> Iterator[BatchResult]:
+    """
+    Send many agent requests with bounded parallelism.
+
+    Each record is either a ``(user_id, agent_id, session_id, message)`` tuple
+    or a dict with those keys (plus any extra payload fields). A ``None``
+    session_id defaults to the agent_id, as in get_agent_response.
+
+    Requests go through one pooled client, so connections are reused across
+    the whole batch as long as ``concurrency`` does not exceed the client's
+    per-host pool size. Failures are captured per item and never abort the batch.
+
+    Args:
+        records: Iterable of request records (consumed lazily)
+        concurrency: Maximum number of requests in flight at once
+        ordered: Yield results in input order (True) or as they complete (False)
+        client: AgentClient to use (defaults to the shared pooled client)
+        **kwargs: Extra arguments passed to every AgentClient.send call
+                  (e.g. api_key, endpoint, timeout); fields set on a
+                  record take precedence
+
+    Yields:
+        BatchResult per record; ``result`` holds the response dict and
+        ``error`` the exception (usually APIError) if the request failed
+    """
+    if client is None:
+        client = get_default_client()
+
+    if concurrency > client.pool_maxsize:
+        logger.warning(
+            "Batch concurrency %d exceeds the client pool size %d; extra connections will not be reused",
+            concurrency, client.pool_maxsize
+        )
+
+    def send_one(record: AgentRecord) -> Dict[str, Any]:
+        request = {**kwargs, **_normalize_record(record)}
+        return client.send(**request)
+
+    return bounded_map(send_one, records, max_workers=concurrency, ordered=ordered)
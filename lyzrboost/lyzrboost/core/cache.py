@@ -0,0 +1,384 @@
+"""
+Response cache for deterministic agent calls.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CACHE_TTL = 300.0
+DEFAULT_CACHE_SIZE = 1024
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a prompt so trivially different copies share a cache entry.
+
+    Line endings are unified and leading/trailing whitespace is stripped from
+    the message and from each line; the wording itself is left untouched.
+
+    Args:
+        message: Message text
+
+    Returns:
+        Normalized message text
+    """
+    lines = message.replace("\r\n", "\n").replace("\r", "\n").strip().split("\n")
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def make_cache_key(
+    endpoint: str,
+    agent_id: str,
+    message: str,
+    extra: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Build a cache key for an agent request.
+
+    Args:
+        endpoint: API endpoint URL
+        agent_id: ID of the agent queried
+        message: Message sent to the agent
+        extra: Additional payload fields sent with the request
+
+    Returns:
+        Hex digest identifying the request
+    """
+    material = json.dumps(
+        [endpoint, agent_id, normalize_message(message), extra or {}],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class CacheBackend:
+    """
+    Storage interface for ResponseCache.
+
+    Backends store values with an absolute expiry time (``time.time()``)
+    and evict least-recently-used entries once they hold ``maxsize`` items.
+    Backends that do I/O set ``blocking``, so that async clients call them
+    on an executor.
+    """
+
+    blocking = False
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        """Store a value until ``expires_at``."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove every value."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache backend.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        super().__init__(maxsize)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers get their own copy so they cannot mutate the cached response
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    On-disk cache backend that survives restarts.
+
+    Values are stored as JSON, so only JSON-serializable responses can be
+    cached (which is always the case for agent API responses).
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, maxsize: int = DEFAULT_CACHE_SIZE * 10):
+        """
+        Initialize the backend.
+
+        Args:
+            path: Path to the SQLite database file (created if missing)
+            maxsize: Maximum number of entries kept on disk
+        """
+        super().__init__(maxsize)
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self._connection.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None
+            self._connection.execute(
+                "UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        encoded = json.dumps(value)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, encoded, expires_at, time.time())
+            )
+            count = self._connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+            if count > self.maxsize:
+                # Drop expired entries first, then the least recently used ones
+                self._connection.execute(
+                    "DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),)
+                )
+                overflow = self._connection.execute(
+                    "SELECT COUNT(*) FROM response_cache"
+                ).fetchone()[0] - self.maxsize
+                if overflow > 0:
+                    self._connection.execute(
+                        "DELETE FROM response_cache WHERE key IN ("
+                        "SELECT key FROM response_cache ORDER BY accessed_at LIMIT ?)",
+                        (overflow,)
+                    )
+                    self.evictions += overflow
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM response_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class ResponseCache:
+    """
+    Opt-in cache of agent responses.
+
+    Entries are keyed on the endpoint, agent ID, normalized message and any
+    extra payload fields. The user and session IDs are not part of the key,
+    so identical prompts from different callers share one entry.
+
+    Conversational calls depend on the session history, so by default a call
+    is only cached when its session_id equals its agent_id, which is what
+    get_agent_response uses for one-off calls without a session.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = DEFAULT_CACHE_TTL,
+        cache_sessions: bool = False
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage backend (defaults to an in-memory LRU)
+            ttl: Seconds an entry stays valid
+            cache_sessions: Also cache calls bound to a conversation session
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.cache_sessions = cache_sessions
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def blocking(self) -> bool:
+        """True if the backend does I/O, so async callers should use an executor."""
+        return self.backend.blocking
+
+    def is_cacheable(self, agent_id: str, session_id: Optional[str]) -> bool:
+        """
+        Check whether a call may be served from the cache.
+
+        Args:
+            agent_id: ID of the agent queried
+            session_id: Session the call belongs to
+
+        Returns:
+            True if the call is not bound to a conversation (or sessions are cached)
+        """
+        return self.cache_sessions or session_id is None or session_id == agent_id
+
+    def make_key(
+        self,
+        endpoint: str,
+        agent_id: str,
+        message: str,
+        extra: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build the cache key for a request (see make_cache_key)."""
+        return make_cache_key(endpoint, agent_id, message, extra)
+
+    def key_for(
+        self,
+        endpoint: str,
+        agent_id: str,
+        session_id: Optional[str],
+        message: str,
+        extra: Optional[Dict[str, Any]] = None,
+        use_cache: Optional[bool] = None
+    ) -> Optional[str]:
+        """
+        Get the cache key for a request, or None if it must bypass the cache.
+
+        Args:
+            endpoint: API endpoint URL
+            agent_id: ID of the agent queried
+            session_id: Session the call belongs to
+            message: Message sent to the agent
+            extra: Additional payload fields sent with the request
+            use_cache: Per-call override; False bypasses the cache and True
+                       caches even session-bound calls
+
+        Returns:
+            Cache key string or None
+        """
+        if use_cache is False:
+            return None
+        if use_cache is None and not self.is_cacheable(agent_id, session_id):
+            return None
+        return self.make_key(endpoint, agent_id, message, extra)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response and update the hit/miss counters.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a response for ``ttl`` seconds.
+
+        Args:
+            key: Cache key
+            value: Response to store
+        """
+        self.backend.set(key, value, time.time() + self.ttl)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with hits, misses, hit_rate, size and evictions
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(self.backend),
+            "evictions": self.backend.evictions,
+        }
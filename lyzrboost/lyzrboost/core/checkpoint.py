@@ -0,0 +1,155 @@
+"""
+Persistent checkpoints that let interrupted workflow runs resume.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """
+    Storage interface for workflow checkpoints.
+
+    A checkpoint is a JSON-serializable dict saved under the run ID. It
+    holds the workflow name, the names of its steps, the index of the next
+    step to run, the data that step receives and whether the run completed.
+    Each save replaces the previous checkpoint of the run.
+    """
+
+    def save(self, run_id: str, checkpoint: Dict[str, Any]) -> None:
+        """Store the checkpoint of a run, replacing any previous one."""
+        raise NotImplementedError
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Return the checkpoint of a run, or None if there is none."""
+        raise NotImplementedError
+
+    def delete(self, run_id: str) -> None:
+        """Remove the checkpoint of a run if present."""
+        raise NotImplementedError
+
+    def list_runs(self) -> List[str]:
+        """Return the IDs of all stored runs."""
+        raise NotImplementedError
+
+
+class JSONFileCheckpointStore(CheckpointStore):
+    """
+    Stores each run's checkpoint as a JSON file in a directory.
+
+    Files are written to a temporary file and renamed into place, so a crash
+    while saving never leaves a truncated checkpoint behind.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the checkpoint files (created if missing)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, run_id: str) -> str:
+        if not run_id or os.sep in run_id or (os.altsep and os.altsep in run_id) or run_id.startswith("."):
+            raise ValueError(f"Invalid run ID for a file name: {run_id!r}")
+        return os.path.join(self.directory, f"{run_id}.json")
+
+    def save(self, run_id: str, checkpoint: Dict[str, Any]) -> None:
+        encoded = json.dumps(checkpoint)
+        path = self._path(run_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".checkpoint-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(run_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def delete(self, run_id: str) -> None:
+        try:
+            os.remove(self._path(run_id))
+        except FileNotFoundError:
+            pass
+
+    def list_runs(self) -> List[str]:
+        return sorted(
+            name[:-len(".json")] for name in os.listdir(self.directory)
+            if name.endswith(".json") and not name.startswith(".")
+        )
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    Stores checkpoints in a SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: Path to the SQLite database file (created if missing)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS workflow_checkpoints ("
+            "run_id TEXT PRIMARY KEY, checkpoint TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def save(self, run_id: str, checkpoint: Dict[str, Any]) -> None:
+        encoded = json.dumps(checkpoint)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO workflow_checkpoints (run_id, checkpoint, updated_at) "
+                "VALUES (?, ?, ?)",
+                (run_id, encoded, time.time())
+            )
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT checkpoint FROM workflow_checkpoints WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def delete(self, run_id: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM workflow_checkpoints WHERE run_id = ?", (run_id,))
+
+    def list_runs(self) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT run_id FROM workflow_checkpoints ORDER BY updated_at"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
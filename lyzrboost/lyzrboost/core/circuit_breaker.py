@@ -0,0 +1,338 @@
+"""
+Circuit breakers that fail fast while an agent endpoint is degraded.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .errors import APIError, APIConnectionError, APITimeoutError, CircuitOpenError, DeadlineExceeded
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+StateListener = Callable[[str, str, str], None]
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """
+    Check whether an error indicates a degraded endpoint.
+
+    Connection failures, timeouts and 5xx responses count as failures;
+    client errors such as 400 or 429 mean the endpoint itself is answering.
+    DeadlineExceeded does not count: the caller's deadline ran out, which
+    says nothing about the endpoint's health.
+
+    Args:
+        error: Exception raised by an agent call
+
+    Returns:
+        True if the error should count against the circuit
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(error, APIError):
+        return error.status_code is None or error.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding one endpoint/agent pair.
+
+    While closed, the outcomes of the last ``window_size`` calls are tracked.
+    Once at least ``minimum_calls`` have been seen, the circuit opens if the
+    failure rate reaches ``failure_rate_threshold`` or the share of calls
+    slower than ``slow_call_duration`` reaches ``slow_call_rate_threshold``.
+
+    While open, calls fail immediately with CircuitOpenError. After
+    ``open_timeout`` seconds the circuit becomes half-open and lets
+    ``half_open_max_calls`` probe calls through: if they all succeed quickly
+    it closes again, otherwise it reopens.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 1.0,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Name reported in events and errors
+            failure_rate_threshold: Failure share (0-1) at which the circuit opens
+            slow_call_duration: Calls taking longer than this many seconds count
+                                as slow (None disables latency tracking)
+            slow_call_rate_threshold: Slow-call share (0-1) at which the circuit opens
+            window_size: Number of recent calls considered
+            minimum_calls: Calls required in the window before the circuit can open
+            open_timeout: Seconds to stay open before letting a probe through
+            half_open_max_calls: Probe calls allowed (and required to succeed)
+                                 while half-open
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_timeout = open_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        # Each entry is a (failed, slow) pair
+        self._window = deque(maxlen=window_size)
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        self._listeners: List[StateListener] = []
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open if the timeout elapsed."""
+        with self._lock:
+            transition = self._check_open_timeout()
+        self._notify(transition)
+        return self._state
+
+    def add_listener(self, listener: StateListener) -> None:
+        """
+        Register a callback for state transitions.
+
+        Args:
+            listener: Called as ``listener(name, old_state, new_state)``
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, transition: Optional[tuple]) -> None:
+        if transition is None:
+            return
+        old_state, new_state = transition
+        logger.warning("Circuit '%s' changed from %s to %s", self.name, old_state, new_state)
+        for listener in list(self._listeners):
+            try:
+                listener(self.name, old_state, new_state)
+            except Exception as e:
+                logger.error("Circuit listener failed: %s", e)
+
+    def _transition(self, new_state: str) -> tuple:
+        old_state = self._state
+        self._state = new_state
+        if new_state == OPEN:
+            self._opened_at = time.monotonic()
+        elif new_state == HALF_OPEN:
+            self._half_open_in_flight = 0
+            self._half_open_successes = 0
+        elif new_state == CLOSED:
+            self._window.clear()
+        return old_state, new_state
+
+    def _check_open_timeout(self) -> Optional[tuple]:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_timeout:
+            return self._transition(HALF_OPEN)
+        return None
+
+    def before_call(self) -> None:
+        """
+        Reserve permission to make a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or no probe slot is free
+        """
+        with self._lock:
+            transition = self._check_open_timeout()
+            state = self._state
+
+            if state == OPEN:
+                remaining = self.open_timeout - (time.monotonic() - self._opened_at)
+                error = CircuitOpenError(
+                    f"Circuit '{self.name}' is open; failing fast",
+                    retry_after=max(0.0, remaining)
+                )
+            elif state == HALF_OPEN and self._half_open_in_flight >= self.half_open_max_calls:
+                error = CircuitOpenError(
+                    f"Circuit '{self.name}' is half-open and already probing; failing fast"
+                )
+            else:
+                error = None
+                if state == HALF_OPEN:
+                    self._half_open_in_flight += 1
+
+        self._notify(transition)
+        if error is not None:
+            raise error
+
+    def record(self, duration: float, error: Optional[BaseException] = None) -> None:
+        """
+        Record the outcome of a call admitted by before_call.
+
+        Args:
+            duration: Seconds the call took
+            error: Exception raised by the call, or None on success
+        """
+        # Cancelled calls (e.g. asyncio.CancelledError) and calls cut short by
+        # the caller's deadline say nothing about health
+        cancelled = error is not None and (
+            not isinstance(error, Exception) or isinstance(error, DeadlineExceeded)
+        )
+        failed = error is not None and is_endpoint_failure(error)
+        slow = self.slow_call_duration is not None and duration > self.slow_call_duration
+
+        with self._lock:
+            transition = None
+
+            if self._state == HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                if cancelled:
+                    pass
+                elif failed or slow:
+                    transition = self._transition(OPEN)
+                else:
+                    self._half_open_successes += 1
+                    if self._half_open_successes >= self.half_open_max_calls:
+                        transition = self._transition(CLOSED)
+
+            elif self._state == CLOSED and not cancelled:
+                self._window.append((failed, slow))
+                if len(self._window) >= self.minimum_calls and self._should_open():
+                    transition = self._transition(OPEN)
+
+        self._notify(transition)
+
+    def _should_open(self) -> bool:
+        calls = len(self._window)
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow_calls = sum(1 for _, slow in self._window if slow)
+        if failures / calls >= self.failure_rate_threshold:
+            return True
+        return self.slow_call_duration is not None and slow_calls / calls >= self.slow_call_rate_threshold
+
+    def call(self, func: Callable[[], Any]) -> Any:
+        """
+        Run ``func`` through the circuit.
+
+        Args:
+            func: Zero-argument callable performing the request
+
+        Returns:
+            The result of ``func``
+
+        Raises:
+            CircuitOpenError: If the circuit does not admit the call
+        """
+        self.before_call()
+        start = time.monotonic()
+        try:
+            result = func()
+        except BaseException as e:
+            self.record(time.monotonic() - start, e)
+            raise
+        self.record(time.monotonic() - start)
+        return result
+
+    async def call_async(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``func()`` through the circuit.
+
+        Args:
+            func: Zero-argument callable returning an awaitable for the request
+
+        Returns:
+            The result of ``func()``
+
+        Raises:
+            CircuitOpenError: If the circuit does not admit the call
+        """
+        self.before_call()
+        start = time.monotonic()
+        try:
+            result = await func()
+        except BaseException as e:
+            self.record(time.monotonic() - start, e)
+            raise
+        self.record(time.monotonic() - start)
+        return result
+
+
+class CircuitBreakerRegistry:
+    """
+    Creates and holds one CircuitBreaker per endpoint and agent.
+
+    Every breaker is created with the same settings, and listeners added
+    to the registry receive transitions from all of them.
+    """
+
+    def __init__(self, per_agent: bool = True, **breaker_options):
+        """
+        Initialize the registry.
+
+        Args:
+            per_agent: Keep a separate circuit for each agent on an endpoint
+                       (False shares one circuit per endpoint)
+            **breaker_options: Keyword arguments passed to every CircuitBreaker
+        """
+        self.per_agent = per_agent
+        self.breaker_options = breaker_options
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._listeners: List[StateListener] = []
+
+    def get(self, endpoint: str, agent_id: Optional[str] = None) -> CircuitBreaker:
+        """
+        Get (or create) the breaker for an endpoint and agent.
+
+        Args:
+            endpoint: API endpoint URL
+            agent_id: Agent ID (ignored if per_agent is False)
+
+        Returns:
+            The matching CircuitBreaker
+        """
+        name = f"{endpoint}#{agent_id}" if self.per_agent and agent_id else endpoint
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name=name, **self.breaker_options)
+                for listener in self._listeners:
+                    breaker.add_listener(listener)
+                self._breakers[name] = breaker
+            return breaker
+
+    def add_listener(self, listener: StateListener) -> None:
+        """
+        Register a callback for state transitions of every breaker.
+
+        Args:
+            listener: Called as ``listener(name, old_state, new_state)``
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            for breaker in self._breakers.values():
+                breaker.add_listener(listener)
+
+    def states(self) -> Dict[str, str]:
+        """
+        Get the current state of every breaker.
+
+        Returns:
+            Dict mapping breaker names to states
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.state for breaker in breakers}
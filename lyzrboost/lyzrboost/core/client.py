@@ -0,0 +1,639 @@
+"""
+Pooled HTTP transport for the Lyzr agent inference API.
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .errors import APIError, APIConnectionError, APITimeoutError, DeadlineExceeded
+from .cache import ResponseCache
+from .circuit_breaker import CircuitBreakerRegistry
+from .deadline import clamp_timeout, current_deadline, remaining_time, within_deadline
+from .hedging import HedgePolicy
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, parse_retry_after
+from .singleflight import SingleFlight, make_flight_key
+from .streaming import AgentStream, DEFAULT_STREAM_ENDPOINT
+from ..utils.logger import truncate_payload
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_API_ENDPOINT = "https://agent-prod.studio.lyzr.ai/v3/inference/chat/"
+DEFAULT_TIMEOUT = 60
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+class BaseAgentClient:
+    """
+    Configuration and request building shared by the sync and async clients.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        endpoint: str = DEFAULT_API_ENDPOINT,
+        timeout: float = DEFAULT_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+        stream_endpoint: str = DEFAULT_STREAM_ENDPOINT
+    ):
+        """
+        Initialize the shared client configuration.
+
+        Args:
+            api_key: Default API key sent as ``x-api-key`` (can be overridden per call)
+            endpoint: Default API endpoint URL
+            timeout: Default request timeout in seconds
+            headers: Extra headers sent with every request
+            stream_endpoint: Default endpoint URL for streamed responses
+        """
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.stream_endpoint = stream_endpoint
+        self.hedge_policy: Optional[HedgePolicy] = None
+
+        self.headers = {"Content-Type": "application/json"}
+        if headers:
+            self.headers.update(headers)
+
+    def build_request(
+        self,
+        user_id: str,
+        agent_id: str,
+        session_id: str,
+        message: str,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Build the headers and JSON payload for an agent request.
+
+        Args:
+            user_id: Unique identifier for the user
+            agent_id: ID of the Lyzr agent to query
+            session_id: Session identifier for conversation continuity
+            message: The message to send to the agent
+            api_key: API key for this call (defaults to the client's key)
+            **kwargs: Additional parameters to include in the payload
+
+        Returns:
+            Dict with ``headers`` and ``payload`` entries
+        """
+        headers = dict(self.headers)
+
+        api_key = api_key or self.api_key
+        if api_key:
+            headers["x-api-key"] = api_key
+
+        payload = {
+            "user_id": user_id,
+            "agent_id": agent_id,
+            "session_id": session_id,
+            "message": message,
+            **kwargs
+        }
+        return {"headers": headers, "payload": payload}
+
+    def build_hedge_request(
+        self,
+        endpoint: str,
+        user_id: str,
+        agent_id: str,
+        session_id: str,
+        message: str,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Build the duplicate request sent when a call is hedged.
+
+        The hedge goes to the hedge policy's alternate endpoint and agent if
+        it names them, otherwise to the same endpoint and agent as the call.
+
+        Args:
+            endpoint: Endpoint of the original call
+            user_id: Unique identifier for the user
+            agent_id: Agent of the original call
+            session_id: Session of the original call
+            message: The message to send to the agent
+            api_key: API key for this call (defaults to the client's key)
+            **kwargs: Additional parameters to include in the payload
+
+        Returns:
+            Tuple of (endpoint, agent_id, request)
+        """
+        policy = self.hedge_policy
+        hedge_endpoint = policy.alternate_endpoint or endpoint
+        hedge_agent = policy.alternate_agent_id or agent_id
+        if session_id == agent_id:
+            # Stateless call: the session follows the agent
+            session_id = hedge_agent
+        request = self.build_request(user_id, hedge_agent, session_id, message, api_key, **kwargs)
+        return hedge_endpoint, hedge_agent, request
+
+
+class AgentClient(BaseAgentClient):
+    """
+    Reusable transport for sending requests to Lyzr agents.
+
+    The client owns a ``requests.Session`` whose connection pools are kept
+    alive between calls, so consecutive agent calls to the same host reuse
+    an open TCP/TLS connection instead of repeating the handshake.
+
+    A single client can be shared by many threads.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        endpoint: str = DEFAULT_API_ENDPOINT,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        session: Optional[requests.Session] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        stream_endpoint: str = DEFAULT_STREAM_ENDPOINT,
+        hedge_policy: Optional[HedgePolicy] = None
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Default API key sent as ``x-api-key`` (can be overridden per call)
+            endpoint: Default API endpoint URL
+            timeout: Default request timeout in seconds
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum number of keep-alive connections per host
+            pool_block: Whether to block when the per-host pool is exhausted
+                        instead of opening a throw-away connection
+            headers: Extra headers sent with every request
+            session: Optional pre-configured session to use instead of creating one
+            retry_policy: Optional policy for retrying transient failures
+                          (no retries if None)
+            rate_limiter: Optional limiter every attempt must get a token from
+            circuit_breakers: Optional registry of per-endpoint/agent circuit
+                              breakers; open circuits fail fast with CircuitOpenError
+            cache: Optional response cache consulted before sending a request
+            single_flight: Optional SingleFlight; concurrent identical requests
+                           then share one upstream call
+            stream_endpoint: Default endpoint URL for streamed responses
+            hedge_policy: Optional policy sending a duplicate request when a
+                          call is slower than recent calls usually are
+        """
+        super().__init__(
+            api_key=api_key,
+            endpoint=endpoint,
+            timeout=timeout,
+            headers=headers,
+            stream_endpoint=stream_endpoint
+        )
+        self.pool_maxsize = pool_maxsize
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers
+        self.cache = cache
+        self.single_flight = single_flight
+        self.hedge_policy = hedge_policy
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor_lock = threading.Lock()
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+        logger.debug("AgentClient initialized (pool_maxsize=%d)", pool_maxsize)
+
+    def send(
+        self,
+        user_id: str,
+        agent_id: str,
+        session_id: str,
+        message: str,
+        api_key: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+        use_cache: Optional[bool] = None,
+        hedge: Optional[bool] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Send a request to a Lyzr agent over the pooled session.
+
+        Transient failures are retried if the client has a retry_policy, and
+        each attempt first waits for a token if the client has a rate_limiter.
+        With circuit_breakers, calls to a degraded endpoint fail fast. With a
+        cache, repeated identical calls are answered without a request, and
+        with single_flight, identical calls already in flight are joined
+        (except under a deadline, which bounds only its own call). With
+        a hedge_policy, a slow call gets a duplicate request and the first
+        response wins.
+
+        Args:
+            user_id: Unique identifier for the user
+            agent_id: ID of the Lyzr agent to query
+            session_id: Session identifier for conversation continuity
+            message: The message to send to the agent
+            api_key: API key for this call (defaults to the client's key)
+            endpoint: API endpoint URL (defaults to the client's endpoint)
+            timeout: Request timeout in seconds (defaults to the client's timeout)
+            use_cache: Per-call cache override (False bypasses the cache, True
+                       caches even session-bound calls); ignored without a cache
+            hedge: Per-call hedging override (False never hedges, True hedges
+                   even session-bound calls); ignored without a hedge_policy
+            **kwargs: Additional parameters to include in the request
+
+        Returns:
+            Dict containing the agent's response
+
+        Raises:
+            APIError: If the API request fails
+        """
+        endpoint = endpoint or self.endpoint
+        timeout = timeout if timeout is not None else self.timeout
+        request = self.build_request(user_id, agent_id, session_id, message, api_key, **kwargs)
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(endpoint, agent_id, session_id, message, kwargs, use_cache)
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.debug("Cache hit for agent %s", agent_id)
+                    return cached
+
+        hedge_request = None
+        if self.hedge_policy is not None and self.hedge_policy.applies_to(agent_id, session_id, hedge):
+            hedge_request = self.build_hedge_request(
+                endpoint, user_id, agent_id, session_id, message, api_key, **kwargs
+            )
+
+        def call() -> Dict[str, Any]:
+            if hedge_request is None:
+                data = self._execute(endpoint, agent_id, request, api_key, timeout)
+            else:
+                data = self.hedge_policy.call(
+                    lambda: self._execute(endpoint, agent_id, request, api_key, timeout),
+                    lambda: self._execute(*hedge_request, api_key, timeout),
+                    self._get_hedge_executor()
+                )
+
+            if cache_key is not None:
+                self.cache.set(cache_key, data)
+            return data
+
+        if self.single_flight is None or current_deadline() is not None:
+            # A follower would be bound by the leader's deadline instead of its own
+            return call()
+        flight_key = make_flight_key(endpoint, api_key or self.api_key, request["payload"], timeout)
+        return self.single_flight.do(flight_key, call)
+
+    def _execute(
+        self,
+        endpoint: str,
+        agent_id: str,
+        request: Dict[str, Any],
+        api_key: Optional[str],
+        timeout: float
+    ) -> Dict[str, Any]:
+        """
+        Send a request through the rate limiter, circuit breaker and retry policy.
+        """
+        def attempt() -> Dict[str, Any]:
+            self._acquire_rate_limit(api_key, agent_id)
+            # Each attempt gets at most the time left until the caller's deadline
+            attempt_timeout = clamp_timeout(timeout)
+
+            def post() -> Dict[str, Any]:
+                return within_deadline(
+                    lambda: self._post(endpoint, request, agent_id, attempt_timeout), timeout, attempt_timeout
+                )
+
+            if self.circuit_breakers is not None:
+                return self.circuit_breakers.get(endpoint, agent_id).call(post)
+            return post()
+
+        if self.retry_policy is None:
+            return attempt()
+        return self.retry_policy.call(attempt)
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """
+        Get the thread pool hedged calls run on, creating it on first use.
+        """
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                # Threads start on demand; keep enough that a primary request
+                # never queues behind other callers' requests
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=max(32, self.pool_maxsize * 4),
+                    thread_name_prefix="lyzr-hedge"
+                )
+            return self._hedge_executor
+
+    def _acquire_rate_limit(self, api_key: Optional[str], agent_id: str) -> None:
+        """
+        Wait for a rate-limit token, but never past the caller's deadline.
+        """
+        if self.rate_limiter is None:
+            return
+        key = self.rate_limiter.make_key(api_key or self.api_key, agent_id)
+        if not self.rate_limiter.acquire(key, timeout=remaining_time()):
+            raise DeadlineExceeded("Deadline would expire while waiting for the rate limiter")
+
+    def _post(
+        self,
+        endpoint: str,
+        request: Dict[str, Any],
+        agent_id: str,
+        timeout: float
+    ) -> Dict[str, Any]:
+        """
+        Perform a single HTTP attempt and map failures to APIError.
+        """
+        logger.debug("Sending request to %s for agent %s", endpoint, agent_id)
+
+        try:
+            response = self.session.post(
+                endpoint,
+                headers=request["headers"],
+                json=request["payload"],
+                timeout=timeout
+            )
+
+            # Check for HTTP errors
+            response.raise_for_status()
+
+            # Parse the response
+            data = response.json()
+
+            # Payload logging is guarded so nothing is decoded or formatted
+            # unless DEBUG is enabled
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw API Response Content: %s", truncate_payload(response.text))
+                logger.debug("Parsed API Response Data: %s", truncate_payload(data))
+                logger.debug("Received response from agent %s", agent_id)
+            return data
+
+        except requests.exceptions.HTTPError as e:
+            logger.error("API request failed: %s", e)
+            response = e.response
+            raise APIError(
+                f"Failed to communicate with Lyzr API: {str(e)}",
+                status_code=response.status_code if response is not None else None,
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                if response is not None else None
+            ) from e
+
+        except requests.exceptions.RequestException as e:
+            logger.error("API request failed: %s", e)
+            raise _map_request_exception(e) from e
+
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse API response: %s", e)
+            raise APIError(f"Invalid response from Lyzr API: {str(e)}") from e
+
+    def stream(
+        self,
+        user_id: str,
+        agent_id: str,
+        session_id: Optional[str] = None,
+        message: str = "",
+        api_key: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> AgentStream:
+        """
+        Send a request and stream the agent's response as it is generated.
+
+        Retries, rate limiting and circuit breaking apply to opening the
+        stream; once chunks start arriving, failures are raised to the reader.
+
+        Args:
+            user_id: Unique identifier for the user
+            agent_id: ID of the Lyzr agent to query
+            session_id: Session identifier (defaults to agent_id if None)
+            message: The message to send to the agent
+            api_key: API key for this call (defaults to the client's key)
+            endpoint: Streaming endpoint URL (defaults to the client's stream_endpoint)
+            timeout: Seconds to wait for the connection and between chunks
+            **kwargs: Additional parameters to include in the request
+
+        Returns:
+            AgentStream yielding text chunks
+
+        Raises:
+            APIError: If the stream cannot be opened
+        """
+        if session_id is None:
+            session_id = agent_id
+        endpoint = endpoint or self.stream_endpoint
+        timeout = timeout if timeout is not None else self.timeout
+        request = self.build_request(user_id, agent_id, session_id, message, api_key, **kwargs)
+        request["headers"]["Accept"] = "text/event-stream"
+
+        def attempt() -> AgentStream:
+            self._acquire_rate_limit(api_key, agent_id)
+            attempt_timeout = clamp_timeout(timeout)
+
+            def open_stream() -> AgentStream:
+                return within_deadline(
+                    lambda: self._open_stream(endpoint, request, agent_id, attempt_timeout), timeout, attempt_timeout
+                )
+
+            if self.circuit_breakers is not None:
+                return self.circuit_breakers.get(endpoint, agent_id).call(open_stream)
+            return open_stream()
+
+        if self.retry_policy is None:
+            return attempt()
+        return self.retry_policy.call(attempt)
+
+    def _open_stream(
+        self,
+        endpoint: str,
+        request: Dict[str, Any],
+        agent_id: str,
+        timeout: float
+    ) -> AgentStream:
+        """
+        Open a streamed response and map failures to APIError.
+        """
+        logger.debug("Opening stream to %s for agent %s", endpoint, agent_id)
+
+        try:
+            response = self.session.post(
+                endpoint,
+                headers=request["headers"],
+                json=request["payload"],
+                timeout=timeout,
+                stream=True
+            )
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                response.close()
+                raise
+            return AgentStream(response, agent_id=agent_id)
+
+        except requests.exceptions.HTTPError as e:
+            logger.error("API request failed: %s", e)
+            response = e.response
+            raise APIError(
+                f"Failed to communicate with Lyzr API: {str(e)}",
+                status_code=response.status_code if response is not None else None,
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                if response is not None else None
+            ) from e
+
+        except requests.exceptions.RequestException as e:
+            logger.error("API request failed: %s", e)
+            raise _map_request_exception(e) from e
+
+    def get_response(
+        self,
+        user_id: str,
+        agent_id: str,
+        session_id: Optional[str] = None,
+        message: str = "",
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Send a request and return just the agent's text response.
+
+        Args:
+            user_id: Unique identifier for the user
+            agent_id: ID of the Lyzr agent to query
+            session_id: Session identifier (defaults to agent_id if None)
+            message: The message to send to the agent
+            api_key: API key for this call (defaults to the client's key)
+            **kwargs: Additional parameters passed to send()
+
+        Returns:
+            String containing the agent's text response
+
+        Raises:
+            APIError: If the API request fails
+        """
+        if session_id is None:
+            session_id = agent_id
+
+        response_data = self.send(
+            user_id=user_id,
+            agent_id=agent_id,
+            session_id=session_id,
+            message=message,
+            api_key=api_key,
+            **kwargs
+        )
+        return extract_response_text(response_data)
+
+    def close(self) -> None:
+        """
+        Close the underlying session and all pooled connections.
+        """
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self.session.close()
+
+    def __enter__(self) -> "AgentClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _map_request_exception(error: requests.exceptions.RequestException) -> APIError:
+    """
+    Convert a transport-level requests exception into the matching APIError.
+    """
+    message = f"Failed to communicate with Lyzr API: {str(error)}"
+
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return APIConnectionError(message)
+    if isinstance(error, requests.exceptions.Timeout):
+        return APITimeoutError(message)
+    if isinstance(error, requests.exceptions.ConnectionError):
+        # Only failures to open the connection are known not to have reached the server
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        if isinstance(reason, NewConnectionError):
+            return APIConnectionError(message)
+    return APIError(message)
+
+
+def extract_response_text(response_data: Dict[str, Any]) -> str:
+    """
+    Extract the agent's text response from a raw API response.
+
+    Args:
+        response_data: Parsed JSON response from the inference API
+
+    Returns:
+        String containing the agent's text response
+
+    Raises:
+        APIError: If the response does not have the expected format
+    """
+    # Note: This assumes a specific response format and may need adjustment
+    try:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracting response from data: %s", truncate_payload(response_data))
+        return response_data.get("data", {}).get("response", "")
+    except (AttributeError, KeyError) as e:
+        logger.error("Failed to extract response text: %s", e)
+        raise APIError(f"Unexpected response format: {str(e)}")
+
+
+_default_client: Optional[AgentClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> AgentClient:
+    """
+    Get the process-wide client used by the module-level helpers.
+
+    Returns:
+        The shared AgentClient (created on first use)
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = AgentClient()
+    return _default_client
+
+
+def set_default_client(client: Optional[AgentClient]) -> None:
+    """
+    Replace the process-wide client used by the module-level helpers.
+
+    Args:
+        client: The client to use, or None to recreate a default one on next use
+    """
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
@@ -0,0 +1,298 @@
+"""
+Compiles workflow configurations (YAML/JSON) into executable workflows.
+"""
+
+import logging
+import os
+import string
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .client import AgentClient, extract_response_text, get_default_client
+from .checkpoint import CheckpointStore
+from .memo import StepMemo, make_fingerprint
+from .workflow import Workflow, WorkflowStep
+from ..utils.config import ConfigError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Variable holding the workflow input in prompt templates
+INPUT_VARIABLE = "input"
+
+# Keys understood in a step definition
+STEP_KEYS = {
+    "name", "description", "agent_id", "prompt_template", "output_key",
+    "timeout", "min_time", "user_id", "session_id", "inputs", "memoize", "hedge",
+}
+
+_formatter = string.Formatter()
+
+
+class WorkflowConfigError(ConfigError, ValueError):
+    """Exception raised when a workflow configuration is invalid."""
+    pass
+
+
+class PromptTemplate:
+    """
+    A ``str.format``-style prompt template parsed once up front.
+
+    The template is split into literal text and replacement fields when it
+    is created, so rendering only looks up and formats the fields.
+    """
+
+    def __init__(self, template: str):
+        """
+        Parse a template.
+
+        Args:
+            template: Template text with ``{name}`` fields
+
+        Raises:
+            WorkflowConfigError: If the template is malformed or uses positional fields
+        """
+        self.template = template
+        # (literal text, field name, conversion, format spec)
+        self._parts: List[Tuple[str, Optional[str], Optional[str], str]] = []
+        self.variables: Set[str] = set()
+
+        try:
+            parsed = list(_formatter.parse(template))
+        except ValueError as e:
+            raise WorkflowConfigError(f"Malformed prompt template: {str(e)}")
+
+        for literal, field, spec, conversion in parsed:
+            if field is not None:
+                root = field.split(".", 1)[0].split("[", 1)[0]
+                if not root or root.isdigit():
+                    raise WorkflowConfigError(
+                        f"Prompt template fields must be named, got '{{{field}}}'"
+                    )
+                if spec and "{" in spec:
+                    raise WorkflowConfigError(
+                        f"Nested fields in format specs are not supported: '{{{field}:{spec}}}'"
+                    )
+                self.variables.add(root)
+            self._parts.append((literal, field, conversion, spec or ""))
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """
+        Fill in the template.
+
+        Args:
+            values: Values for the template variables
+
+        Returns:
+            The rendered prompt
+        """
+        pieces = []
+        for literal, field, conversion, spec in self._parts:
+            pieces.append(literal)
+            if field is not None:
+                value, _ = _formatter.get_field(field, (), values)
+                if conversion:
+                    value = _formatter.convert_field(value, conversion)
+                pieces.append(format(value, spec))
+        return "".join(pieces)
+
+
+class AgentCall:
+    """
+    Step function calling an agent with a rendered prompt.
+
+    The step's input is the workflow data dict (a non-dict input becomes
+    ``{"input": value}``); the output is a copy of it with the agent's
+    response stored under ``output_key``.
+    """
+
+    def __init__(
+        self,
+        client: AgentClient,
+        agent_id: str,
+        user_id: str,
+        prompt: PromptTemplate,
+        output_key: str,
+        session_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        hedge: Optional[bool] = None
+    ):
+        self.client = client
+        self.agent_id = agent_id
+        self.user_id = user_id
+        self.prompt = prompt
+        self.output_key = output_key
+        self.session_id = session_id
+        self.timeout = timeout
+        self.hedge = hedge
+
+    def __call__(self, input_data: Any) -> Dict[str, Any]:
+        data = dict(input_data) if isinstance(input_data, dict) else {INPUT_VARIABLE: input_data}
+        message = self.prompt.render(data)
+        logger.debug("Calling agent %s for '%s'", self.agent_id, self.output_key)
+
+        response = self.client.send(
+            self.user_id,
+            self.agent_id,
+            self.session_id or self.agent_id,
+            message,
+            timeout=self.timeout,
+            hedge=self.hedge
+        )
+        data[self.output_key] = extract_response_text(response)
+        return data
+
+
+def _require_str(step_name: str, step_config: Dict[str, Any], key: str) -> str:
+    value = step_config.get(key)
+    if not isinstance(value, str) or not value:
+        raise WorkflowConfigError(f"Step '{step_name}' must define '{key}' as a non-empty string")
+    return value
+
+
+def _names(owner: str, value: Any) -> List[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(name, str) and name for name in value):
+        raise WorkflowConfigError(f"{owner} must define 'inputs' as a list of names")
+    return value
+
+
+def compile_workflow(
+    config: Dict[str, Any],
+    client: Optional[AgentClient] = None,
+    user_id: Optional[str] = None,
+    memo: Optional[StepMemo] = None,
+    checkpoint_store: Optional[CheckpointStore] = None
+) -> Workflow:
+    """
+    Compile a workflow configuration into a Workflow of agent steps.
+
+    All validation happens here, before any agent is called: every prompt
+    template is parsed once, and each variable it uses must be the workflow
+    input, a variable declared under ``inputs`` or the ``output_key`` of an
+    earlier step. A step's own ``inputs`` must name values available to it
+    in the same way. The declared top-level inputs are checked again when a
+    run starts, so a missing value fails before the first agent call. Every
+    step calls its agent through the same pooled client.
+    A top-level ``deadline`` bounds the whole run; a step's ``timeout`` and
+    ``min_time`` become its time budget and minimum required time, and
+    ``hedge`` overrides the client's hedge policy for that step.
+
+    Args:
+        config: Workflow configuration (see workflow_config.yaml)
+        client: Client shared by all steps (defaults to the process-wide client)
+        user_id: User ID for agent calls, overriding the config's ``user_id``
+                 (falls back to the LYZR_USER_ID environment variable)
+        memo: Optional memo reusing outputs of unchanged steps
+        checkpoint_store: Optional store for checkpointing runs
+
+    Returns:
+        An executable Workflow
+
+    Raises:
+        WorkflowConfigError: If the configuration is invalid
+    """
+    if not isinstance(config, dict):
+        raise WorkflowConfigError("Workflow configuration must be a mapping")
+    steps_config = config.get("steps")
+    if not isinstance(steps_config, list) or not steps_config:
+        raise WorkflowConfigError("Workflow configuration must contain a non-empty 'steps' list")
+
+    name = config.get("name", "workflow")
+    default_user = user_id or config.get("user_id") or os.environ.get("LYZR_USER_ID")
+    client = client if client is not None else get_default_client()
+
+    declared_inputs = _names("Workflow configuration", config.get("inputs"))
+    available = {INPUT_VARIABLE} | set(declared_inputs)
+    step_names = set()
+    steps = []
+
+    for index, step_config in enumerate(steps_config):
+        if not isinstance(step_config, dict):
+            raise WorkflowConfigError(f"Step {index + 1} must be a mapping")
+        step_name = step_config.get("name", f"Step{index + 1}")
+        if step_name in step_names:
+            raise WorkflowConfigError(f"Duplicate step name '{step_name}'")
+        step_names.add(step_name)
+
+        unknown = set(step_config) - STEP_KEYS
+        if unknown:
+            raise WorkflowConfigError(f"Step '{step_name}' has unknown keys: {', '.join(sorted(unknown))}")
+
+        agent_id = _require_str(step_name, step_config, "agent_id")
+        prompt = PromptTemplate(_require_str(step_name, step_config, "prompt_template"))
+        output_key = step_config.get("output_key", "response")
+
+        step_user = step_config.get("user_id", default_user)
+        if not step_user:
+            raise WorkflowConfigError(
+                f"Step '{step_name}' has no user_id (set it in the config, "
+                f"pass user_id or set LYZR_USER_ID)"
+            )
+
+        undefined = set(_names(f"Step '{step_name}'", step_config.get("inputs"))) - available
+        if undefined:
+            raise WorkflowConfigError(
+                f"Step '{step_name}' declares input(s) {', '.join(sorted(undefined))} that are "
+                f"not available at that step; available: {', '.join(sorted(available))}"
+            )
+
+        missing = prompt.variables - available
+        if missing:
+            raise WorkflowConfigError(
+                f"Prompt template of step '{step_name}' uses undefined variable(s) "
+                f"{', '.join(sorted(missing))}; available: {', '.join(sorted(available))}"
+            )
+
+        call = AgentCall(
+            client,
+            agent_id,
+            step_user,
+            prompt,
+            output_key,
+            session_id=step_config.get("session_id"),
+            timeout=step_config.get("timeout"),
+            hedge=step_config.get("hedge")
+        )
+        steps.append(WorkflowStep(
+            call,
+            name=step_name,
+            description=step_config.get("description"),
+            fingerprint=make_fingerprint(step_config, step_user),
+            memoize=step_config.get("memoize", True),
+            timeout=step_config.get("timeout"),
+            min_time=step_config.get("min_time")
+        ))
+        available.add(output_key)
+
+    final_output_key = config.get("final_output_key")
+    if final_output_key is not None and final_output_key not in available:
+        raise WorkflowConfigError(f"final_output_key '{final_output_key}' is not produced by any step")
+
+    logger.info("Compiled workflow '%s' with %d steps", name, len(steps))
+    return Workflow(
+        steps,
+        name=name,
+        description=config.get("description"),
+        checkpoint_store=checkpoint_store,
+        memo=memo,
+        deadline=config.get("deadline"),
+        inputs=declared_inputs
+    )
+
+
+def select_output(config: Dict[str, Any], result: Any) -> Any:
+    """
+    Pick the output of a compiled workflow run according to its configuration.
+
+    Args:
+        config: Workflow configuration
+        result: Data returned by the workflow run
+
+    Returns:
+        The value of ``final_output_key`` when ``output_format`` is
+        'final_only', otherwise the whole result
+    """
+    if config.get("output_format") == "final_only" and isinstance(result, dict):
+        return result.get(config.get("final_output_key", "response"))
+    return result
@@ -0,0 +1,319 @@
+"""
+Workflows whose steps form a dependency graph and run concurrently.
+"""
+
+import contextvars
+import logging
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Union
+
+from .streaming import AgentStream
+from .workflow import WorkflowStep
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Key under which the workflow's initial input is available to steps
+INPUT_KEY = "input"
+
+# Maximum number of steps run at once when max_workers is not given
+DEFAULT_MAX_WORKERS = 32
+
+# Cancellation flag of the DAG run the current step belongs to
+_cancel_event: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "lyzrboost_dag_cancel", default=None
+)
+
+
+def is_cancelled() -> bool:
+    """
+    Check whether the DAG run executing the current step has been cancelled.
+
+    Long-running step functions can poll this to stop early once a sibling
+    branch has failed. Outside of a DAG run it always returns False.
+
+    Returns:
+        True if the surrounding run was cancelled
+    """
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+
+class DAGStep(WorkflowStep):
+    """
+    A workflow step that declares which values it reads and which it produces.
+
+    The step reads the values named in ``inputs`` (``"input"`` is the
+    workflow's initial input, any other name is the ``output_key`` of another
+    step) and stores its result under ``output_key``. A step with a single
+    input receives that value directly; a step with several inputs receives a
+    dict mapping each input name to its value.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        name: Optional[str] = None,
+        inputs: Optional[Sequence[str]] = None,
+        output_key: Optional[str] = None,
+        description: Optional[str] = None,
+        condition: Optional[Callable[[Any], bool]] = None,
+        on_chunk: Optional[Callable[[str], Any]] = None
+    ):
+        """
+        Initialize a DAG step.
+
+        Args:
+            func: The function to execute in this step
+            name: Optional name for the step (defaults to function name)
+            inputs: Names of the values the step reads (defaults to ["input"])
+            output_key: Name the result is stored under (defaults to the step name)
+            description: Optional description of the step
+            condition: Optional function that determines if this step should execute;
+                       a skipped step produces no output and its dependents are skipped too
+            on_chunk: Optional callback receiving each text chunk when the step
+                      function returns a streamed agent response
+        """
+        super().__init__(func, name=name, description=description, condition=condition, on_chunk=on_chunk)
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        self.inputs = list(inputs) if inputs else [INPUT_KEY]
+        self.output_key = output_key or self.name
+
+    def gather_inputs(self, values: Dict[str, Any]) -> Any:
+        """
+        Build the step's input from the values produced so far.
+
+        Args:
+            values: Values keyed by output key (including "input")
+
+        Returns:
+            The single input value, or a dict of input values
+        """
+        if len(self.inputs) == 1:
+            return values[self.inputs[0]]
+        return {key: values[key] for key in self.inputs}
+
+    def execute(self, input_data: Any) -> Any:
+        """
+        Execute this step.
+
+        Streamed agent responses are consumed like in WorkflowStep.execute,
+        but are closed as soon as the surrounding DAG run is cancelled.
+
+        Args:
+            input_data: The input data for this step
+
+        Returns:
+            The result of executing the step function
+        """
+        logger.debug("Executing DAG step: %s", self.name)
+        result = self.func(input_data)
+        if not isinstance(result, AgentStream):
+            return result
+
+        def on_chunk(chunk: str) -> None:
+            if is_cancelled():
+                result.cancel()
+            elif self.on_chunk is not None:
+                self.on_chunk(chunk)
+
+        return result.collect(on_chunk)
+
+
+class DAGWorkflow:
+    """
+    Runs steps as soon as the values they depend on are available.
+
+    Independent steps run concurrently on a thread pool, so the wall-clock
+    time of a run is that of the longest dependency chain rather than the
+    sum of all steps. If a step raises, no further steps are started,
+    queued steps are cancelled, running streamed responses are closed and
+    the exception is re-raised from ``run``.
+    """
+
+    def __init__(
+        self,
+        steps: List[Union[Callable, DAGStep]],
+        name: str = "workflow",
+        description: Optional[str] = None,
+        final_output_key: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize a DAG workflow.
+
+        Args:
+            steps: List of functions or DAGStep objects (plain functions read "input")
+            name: Name of the workflow
+            description: Optional description of the workflow
+            final_output_key: Output returned by run (defaults to a dict of all outputs)
+            max_workers: Maximum number of steps running at once
+
+        Raises:
+            ValueError: If names or output keys clash, an input is never produced,
+                        or the steps contain a dependency cycle
+        """
+        self.name = name
+        self.description = description
+        self.final_output_key = final_output_key
+
+        self.steps: List[DAGStep] = []
+        for step in steps:
+            if isinstance(step, DAGStep):
+                self.steps.append(step)
+            elif callable(step):
+                self.steps.append(DAGStep(step))
+            else:
+                raise TypeError(f"Step must be callable or DAGStep, got {type(step)}")
+
+        if max_workers is None:
+            max_workers = max(1, min(DEFAULT_MAX_WORKERS, len(self.steps)))
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+
+        self._producers: Dict[str, DAGStep] = {}
+        self._dependents: Dict[str, List[DAGStep]] = {step.name: [] for step in self.steps}
+        self._validate()
+
+        logger.debug("Initialized DAG workflow '%s' with %d steps", name, len(self.steps))
+
+    def _validate(self) -> None:
+        names = set()
+        for step in self.steps:
+            if step.name in names:
+                raise ValueError(f"Duplicate step name '{step.name}'")
+            names.add(step.name)
+            if step.output_key == INPUT_KEY:
+                raise ValueError(f"Step '{step.name}' cannot use the reserved output key '{INPUT_KEY}'")
+            if step.output_key in self._producers:
+                raise ValueError(
+                    f"Output key '{step.output_key}' is produced by both "
+                    f"'{self._producers[step.output_key].name}' and '{step.name}'"
+                )
+            self._producers[step.output_key] = step
+
+        for step in self.steps:
+            for key in step.inputs:
+                if key == INPUT_KEY:
+                    continue
+                if key not in self._producers:
+                    raise ValueError(f"Step '{step.name}' reads '{key}', which no step produces")
+                self._dependents[self._producers[key].name].append(step)
+
+        if self.final_output_key is not None and self.final_output_key not in self._producers:
+            raise ValueError(f"final_output_key '{self.final_output_key}' is not produced by any step")
+
+        # Kahn's algorithm: every step must become ready exactly once
+        remaining = self._dependency_counts()
+        ready = [step for step in self.steps if remaining[step.name] == 0]
+        visited = 0
+        while ready:
+            step = ready.pop()
+            visited += 1
+            for dependent in self._dependents[step.name]:
+                remaining[dependent.name] -= 1
+                if remaining[dependent.name] == 0:
+                    ready.append(dependent)
+        if visited != len(self.steps):
+            cyclic = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Workflow steps contain a dependency cycle: {', '.join(cyclic)}")
+
+    def _dependency_counts(self) -> Dict[str, int]:
+        return {
+            step.name: sum(1 for key in step.inputs if key != INPUT_KEY)
+            for step in self.steps
+        }
+
+    def _release(self, step: DAGStep, remaining: Dict[str, int]) -> List[DAGStep]:
+        # Steps whose last dependency was ``step``
+        ready = []
+        for dependent in self._dependents[step.name]:
+            remaining[dependent.name] -= 1
+            if remaining[dependent.name] == 0:
+                ready.append(dependent)
+        return ready
+
+    def run(self, initial_input: Any) -> Any:
+        """
+        Run the workflow.
+
+        Args:
+            initial_input: Value available to steps as "input"
+
+        Returns:
+            The value of ``final_output_key``, or a dict of every step output
+            when no final key is set (skipped steps are absent)
+
+        Raises:
+            Exception: The first exception raised by a step
+        """
+        logger.info("Starting DAG workflow: %s", self.name)
+
+        values: Dict[str, Any] = {INPUT_KEY: initial_input}
+        remaining = self._dependency_counts()
+        ready: Deque[DAGStep] = deque(step for step in self.steps if remaining[step.name] == 0)
+        running = {}
+
+        cancelled = threading.Event()
+        token = _cancel_event.set(cancelled)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"dag-{self.name}")
+        try:
+            while ready or running:
+                while ready:
+                    step = ready.popleft()
+                    if any(key not in values for key in step.inputs):
+                        logger.debug("Skipping step '%s' (an input was skipped)", step.name)
+                        ready.extend(self._release(step, remaining))
+                        continue
+
+                    input_data = step.gather_inputs(values)
+                    try:
+                        execute = step.should_execute(input_data)
+                    except Exception as e:
+                        logger.error("Error evaluating condition of step '%s': %s", step.name, e)
+                        raise
+                    if not execute:
+                        logger.debug("Skipping step '%s' (condition not met)", step.name)
+                        ready.extend(self._release(step, remaining))
+                        continue
+
+                    context = contextvars.copy_context()
+                    running[pool.submit(context.run, step.execute, input_data)] = step
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        values[step.output_key] = future.result()
+                    except Exception as e:
+                        logger.error("Error in workflow step '%s': %s", step.name, e)
+                        raise
+                    logger.debug("Step '%s' completed successfully", step.name)
+                    ready.extend(self._release(step, remaining))
+        except BaseException:
+            cancelled.set()
+            if running:
+                logger.info(
+                    "Cancelling %d sibling step(s) of workflow '%s'", len(running), self.name
+                )
+            raise
+        finally:
+            _cancel_event.reset(token)
+            # Steps already running finish in the background; queued ones never
+            # start (cancelled one by one, as cancel_futures needs Python 3.9)
+            for future in running:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+        logger.info("DAG workflow '%s' completed", self.name)
+        values.pop(INPUT_KEY)
+        if self.final_output_key is not None:
+            return values.get(self.final_output_key)
+        return values
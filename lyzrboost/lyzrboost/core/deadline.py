@@ -0,0 +1,224 @@
+"""
+Deadlines that propagate through workflow steps into agent calls.
+"""
+
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar, Union
+
+from .errors import APITimeoutError, DeadlineExceeded
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """
+    A point in time by which work must be finished.
+
+    Deadlines use the monotonic clock, so they are unaffected by changes to
+    the system time.
+    """
+
+    def __init__(self, timeout: float):
+        """
+        Initialize a deadline.
+
+        Args:
+            timeout: Seconds from now until the deadline
+        """
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline (0 once it has passed)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """True once the deadline has passed."""
+        return time.monotonic() >= self.expires_at
+
+    def __repr__(self) -> str:
+        return f"Deadline(timeout={self.timeout}, remaining={self.remaining():.3f})"
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "lyzrboost_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    Get the deadline of the current context.
+
+    Returns:
+        The innermost active deadline, or None
+    """
+    return _current_deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Get the seconds left until the current deadline.
+
+    Returns:
+        Remaining seconds, or None if no deadline is active
+    """
+    deadline = _current_deadline.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+def resolve_deadline(timeout: Union[float, Deadline, None]) -> Optional[Deadline]:
+    """
+    Get the deadline a scope with ``timeout`` would run under, without entering it.
+
+    Args:
+        timeout: Seconds from now, a Deadline, or None to keep the current deadline
+
+    Returns:
+        The earlier of the new and the current deadline (None if there is neither)
+    """
+    outer = _current_deadline.get()
+    if timeout is None:
+        return outer
+    deadline = timeout if isinstance(timeout, Deadline) else Deadline(timeout)
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        return outer
+    return deadline
+
+
+def context_with_deadline(deadline: Optional[Deadline]) -> contextvars.Context:
+    """
+    Copy the current context with a deadline set in the copy only.
+
+    Create tasks with ``context.run`` to give them the deadline without
+    setting it in the caller's context, e.g. from an async generator whose
+    frames run in its consumer's context.
+
+    Args:
+        deadline: Deadline to set (None leaves the copied context unchanged)
+
+    Returns:
+        The new context
+    """
+    context = contextvars.copy_context()
+    if deadline is not None:
+        context.run(_current_deadline.set, deadline)
+    return context
+
+
+@contextmanager
+def deadline_scope(timeout: Union[float, Deadline, None]) -> Iterator[Optional[Deadline]]:
+    """
+    Run a block under a deadline.
+
+    The deadline applies to everything called in the block, including agent
+    calls in threads or tasks started with a copy of the context. A nested
+    scope can only shorten the deadline, never extend it.
+
+    Args:
+        timeout: Seconds from now, a Deadline, or None to keep the current deadline
+
+    Yields:
+        The deadline in effect inside the block (None if there is none)
+    """
+    if timeout is None:
+        yield _current_deadline.get()
+        return
+
+    deadline = resolve_deadline(timeout)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def clamp_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    Limit a request timeout to the time left until the current deadline.
+
+    Args:
+        timeout: The timeout the call would use without a deadline
+
+    Returns:
+        ``min(timeout, remaining)``, or ``timeout`` if no deadline is active
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline expired before the request was sent")
+    if timeout is None or remaining < timeout:
+        logger.debug("Clamping request timeout to %.3fs remaining", remaining)
+        return remaining
+    return timeout
+
+
+def timeout_error(error: Exception, timeout: Optional[float], clamped: Optional[float]) -> Exception:
+    """
+    Get the error to raise for a request that timed out.
+
+    When the request's timeout had been shortened to meet a deadline, the
+    timeout means the deadline was reached, so DeadlineExceeded is returned
+    (chained to the original error); otherwise the error itself.
+
+    Args:
+        error: The timeout error raised by the request
+        timeout: The timeout the call would have used without a deadline
+        clamped: The timeout actually used (see clamp_timeout)
+
+    Returns:
+        The exception to raise
+    """
+    if isinstance(error, DeadlineExceeded) or clamped is None or clamped == timeout:
+        return error
+    exceeded = DeadlineExceeded(f"Deadline reached after {clamped:.2f}s: {error}")
+    exceeded.__cause__ = error
+    return exceeded
+
+
+def within_deadline(func: Callable[[], T], timeout: Optional[float], clamped: Optional[float]) -> T:
+    """
+    Call a request function, reporting a deadline-shortened timeout as DeadlineExceeded.
+
+    Wrap the function a circuit breaker calls with this, so a timeout caused
+    by one caller's deadline is not counted against the endpoint.
+
+    Args:
+        func: Function sending the request with the ``clamped`` timeout
+        timeout: The timeout the call would have used without a deadline
+        clamped: The timeout actually used (see clamp_timeout)
+
+    Returns:
+        The function's result
+
+    Raises:
+        DeadlineExceeded: If the request timed out because of the deadline
+    """
+    try:
+        return func()
+    except APITimeoutError as e:
+        raise timeout_error(e, timeout, clamped)
+
+
+async def within_deadline_async(
+    func: Callable[[], Awaitable[T]],
+    timeout: Optional[float],
+    clamped: Optional[float]
+) -> T:
+    """
+    Async version of within_deadline.
+    """
+    try:
+        return await func()
+    except APITimeoutError as e:
+        raise timeout_error(e, timeout, clamped)
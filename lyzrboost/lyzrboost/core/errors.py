@@ -0,0 +1,61 @@
+"""
+Exception types shared across the LyzrBoost core modules.
+"""
+
+from typing import Optional
+
+
+class APIError(Exception):
+    """
+    Exception raised for API errors.
+
+    Attributes:
+        status_code: HTTP status code returned by the API, if any
+        retry_after: Seconds the server asked us to wait (from Retry-After), if any
+    """
+
+    def __init__(
+        self,
+        message: str = "",
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class APIConnectionError(APIError):
+    """
+    Raised when a connection to the API could not be established.
+
+    The request never reached the server, so it is always safe to retry.
+    """
+    pass
+
+
+class APITimeoutError(APIError):
+    """
+    Raised when the API did not answer within the request timeout.
+
+    The server may still have processed the request.
+    """
+    pass
+
+
+class CircuitOpenError(APIError):
+    """
+    Raised without contacting the API while a circuit breaker is open.
+
+    ``retry_after`` holds the seconds until the breaker lets a probe through.
+    """
+    pass
+
+
+class DeadlineExceeded(APITimeoutError):
+    """
+    Raised when the caller's deadline leaves no time for the work requested.
+
+    It is never retried, since a retry could not finish in time either.
+    """
+    pass
@@ -0,0 +1,265 @@
+"""
+Hedged agent calls: a duplicate request is sent when the first one is slow.
+"""
+
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class HedgePolicy:
+    """
+    Decides when a slow agent call gets a duplicate ("hedge") request.
+
+    A call that has not returned after the chosen percentile of recent
+    latencies (e.g. p95) gets a second request, optionally sent to an
+    alternate endpoint or agent. The first successful response wins and the
+    other request is cancelled (asyncio) or abandoned (threads, where an
+    in-flight request cannot be interrupted; its result is discarded).
+
+    Hedges are paid for with a budget that grows by ``max_hedge_rate`` per
+    call, so in the long run at most that fraction of calls is duplicated.
+    Until ``min_samples`` latencies have been seen, calls are not hedged.
+
+    Like the response cache, hedging only applies to calls not bound to a
+    conversation by default, since a duplicate message would end up twice
+    in the session history.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_rate: float = 0.05,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.0,
+        alternate_endpoint: Optional[str] = None,
+        alternate_agent_id: Optional[str] = None,
+        hedge_sessions: bool = False
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Latency percentile after which a call is hedged (0-100)
+            max_hedge_rate: Maximum long-run fraction of calls that are hedged
+            window: Number of recent latencies the percentile is computed over
+            min_samples: Latencies needed before any call is hedged
+            min_delay: Lower bound in seconds for the hedge delay
+            alternate_endpoint: Endpoint for the hedge request (defaults to the call's)
+            alternate_agent_id: Agent for the hedge request (defaults to the call's)
+            hedge_sessions: Also hedge calls bound to a conversation session
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not 0 <= max_hedge_rate <= 1:
+            raise ValueError("max_hedge_rate must be between 0 and 1")
+
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.alternate_endpoint = alternate_endpoint
+        self.alternate_agent_id = alternate_agent_id
+        self.hedge_sessions = hedge_sessions
+
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        # Hedge budget: earns max_hedge_rate per call, a hedge spends 1; a
+        # quiet stretch can save up a window's worth for a burst of slow calls
+        self._budget_cap = max(1.0, max_hedge_rate * window)
+        self._budget = 0.0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def applies_to(self, agent_id: str, session_id: Optional[str], hedge: Optional[bool] = None) -> bool:
+        """
+        Check whether a call may be hedged.
+
+        Args:
+            agent_id: ID of the agent queried
+            session_id: Session the call belongs to
+            hedge: Per-call override (False never hedges, True hedges session calls too)
+
+        Returns:
+            True if the call may be hedged
+        """
+        if hedge is not None:
+            return hedge
+        return self.hedge_sessions or session_id is None or session_id == agent_id
+
+    def record_latency(self, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Get how long to wait for a call before hedging it.
+
+        Returns:
+            Seconds, or None while there are fewer than ``min_samples`` latencies
+        """
+        with self._lock:
+            if len(self._latencies) < max(1, self.min_samples):
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1))
+        return max(self.min_delay, ordered[index])
+
+    def _start_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self._budget = min(self._budget_cap, self._budget + self.max_hedge_rate)
+
+    def _can_hedge(self) -> bool:
+        with self._lock:
+            return self._budget >= 1.0
+
+    def _take_hedge(self) -> bool:
+        with self._lock:
+            if self._budget < 1.0:
+                return False
+            self._budget -= 1.0
+            self.hedged += 1
+            return True
+
+    def _hedge_won(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def _timed(self, func: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = func()
+        self.record_latency(time.perf_counter() - start)
+        return result
+
+    async def _timed_async(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.perf_counter()
+        result = await func()
+        self.record_latency(time.perf_counter() - start)
+        return result
+
+    def call(self, primary: Callable[[], Any], hedge: Callable[[], Any], executor: Executor) -> Any:
+        """
+        Call ``primary`` and hedge it with ``hedge`` if it is slow.
+
+        Args:
+            primary: Zero-argument callable performing the call
+            hedge: Zero-argument callable performing the duplicate call
+            executor: Thread pool the requests run on while a hedge is possible
+
+        Returns:
+            The result of the first request that succeeds
+
+        Raises:
+            Exception: The primary request's error if both requests failed
+        """
+        self._start_call()
+        delay = self.hedge_delay()
+        if delay is None or not self._can_hedge():
+            # No hedge possible: skip the hand-off to the thread pool
+            return self._timed(primary)
+
+        def submit(func: Callable[[], Any]) -> Future:
+            # Copy the context so deadlines apply inside the worker
+            return executor.submit(contextvars.copy_context().run, self._timed, func)
+
+        primary_future = submit(primary)
+        done, _ = wait([primary_future], timeout=delay)
+        if done or not self._take_hedge():
+            return primary_future.result()
+
+        logger.debug("Call still running after %.3fs; sending hedge request", delay)
+        hedge_future = submit(hedge)
+        pending = {primary_future, hedge_future}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        # Only takes effect if it has not started; a running request is abandoned
+                        other.cancel()
+                    if future is hedge_future:
+                        self._hedge_won()
+                    return future.result()
+        return primary_future.result()
+
+    async def call_async(
+        self,
+        primary: Callable[[], Awaitable[Any]],
+        hedge: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Await ``primary()`` and hedge it with ``hedge()`` if it is slow.
+
+        The losing request is cancelled.
+
+        Args:
+            primary: Zero-argument callable returning an awaitable for the call
+            hedge: Zero-argument callable returning an awaitable for the duplicate call
+
+        Returns:
+            The result of the first request that succeeds
+
+        Raises:
+            Exception: The primary request's error if both requests failed
+        """
+        self._start_call()
+        delay = self.hedge_delay()
+        if delay is None or not self._can_hedge():
+            return await self._timed_async(primary)
+
+        primary_task = asyncio.ensure_future(self._timed_async(primary))
+        tasks = [primary_task]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._take_hedge():
+                return await primary_task
+
+            logger.debug("Call still running after %.3fs; sending hedge request", delay)
+            hedge_task = asyncio.ensure_future(self._timed_async(hedge))
+            tasks.append(hedge_task)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            self._hedge_won()
+                        return task.result()
+            return primary_task.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Mark a losing request's error as retrieved
+                    task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hedging statistics.
+
+        Returns:
+            Dict with calls, hedged, hedge_wins, hedge_rate and the current hedge_delay
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedged / self.calls if self.calls else 0.0,
+                "hedge_delay": delay,
+            }
@@ -0,0 +1,240 @@
+"""
+Bounded conversation history for agent sessions.
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rough number of characters per token for English text
+CHARS_PER_TOKEN = 4
+
+# summarizer(previous_summary, dropped_turns) -> new summary
+Summarizer = Callable[[Optional[str], List[Dict[str, Any]]], str]
+
+
+def interaction_chars(interaction: Dict[str, Any]) -> int:
+    """Number of message characters in one interaction record."""
+    return len(interaction.get("user_message") or "") + len(interaction.get("agent_response") or "")
+
+
+class SessionHistory:
+    """
+    The interaction history of one session, bounded by a policy.
+
+    - ``max_turns`` keeps the last N turns, like a ring buffer.
+    - ``max_chars`` / ``max_tokens`` cap the message text kept (tokens are
+      estimated at about four characters each).
+
+    Turns that fall out of the window are dropped oldest first. With a
+    ``summarizer``, they are first passed to it together with the current
+    summary, and its result becomes the new rolling summary. Old turns are
+    then compacted in batches down to ``compact_ratio`` of the limits, so
+    the summarizer (typically an agent call) runs once every few turns
+    rather than on every turn.
+
+    The history is a sequence of interaction dicts (oldest first) and keeps
+    a running character count, so reading a window for a prompt costs time
+    proportional to the window, not to the conversation.
+
+    A history is safe to use from multiple threads. Each has its own lock,
+    so threads working on different sessions never wait for each other;
+    iterating yields a snapshot taken under the lock.
+    """
+
+    def __init__(
+        self,
+        max_turns: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        summarizer: Optional[Summarizer] = None,
+        compact_ratio: float = 0.5,
+        lock: Optional[threading.RLock] = None
+    ):
+        """
+        Initialize the history.
+
+        Args:
+            max_turns: Maximum number of turns kept (None for no limit)
+            max_chars: Maximum number of message characters kept (None for no limit)
+            max_tokens: Maximum number of estimated message tokens kept (None for no limit)
+            summarizer: Optional function ``(previous_summary, dropped_turns) -> summary``
+                        folding dropped turns into a rolling summary
+            compact_ratio: With a summarizer, the fraction of the limits the
+                           history is cut back to when it overflows
+            lock: Lock guarding the history (a new one by default); histories
+                  of the same session may share one
+        """
+        if max_turns is not None and max_turns < 1:
+            raise ValueError("max_turns must be at least 1")
+        if not 0 < compact_ratio <= 1:
+            raise ValueError("compact_ratio must be in (0, 1]")
+
+        self.max_turns = max_turns
+        char_limits = [limit for limit in (max_chars, max_tokens and max_tokens * CHARS_PER_TOKEN) if limit]
+        self.max_chars: Optional[int] = min(char_limits) if char_limits else None
+        self.summarizer = summarizer
+        self.compact_ratio = compact_ratio if summarizer is not None else 1.0
+
+        self._lock = lock if lock is not None else threading.RLock()
+        self._turns: Deque[Dict[str, Any]] = deque()
+        self.chars = 0
+        self.summary: Optional[str] = None
+        self.total_turns = 0
+        self.dropped_turns = 0
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_list())
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        with self._lock:
+            return self._turns[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._turns)
+
+    @property
+    def lock(self) -> threading.RLock:
+        """The lock held while the history changes; hold it to act atomically with a change."""
+        return self._lock
+
+    @property
+    def tokens(self) -> int:
+        """Estimated number of tokens in the kept messages."""
+        return math.ceil(self.chars / CHARS_PER_TOKEN)
+
+    def _over(self, turns_limit: Optional[float], chars_limit: Optional[float]) -> bool:
+        if turns_limit is not None and len(self._turns) > turns_limit:
+            return True
+        return chars_limit is not None and self.chars > chars_limit
+
+    def append(self, interaction: Dict[str, Any]) -> None:
+        """
+        Add a turn, dropping (and summarizing) old turns that no longer fit.
+
+        The newest turn is always kept, even if it alone exceeds max_chars.
+        The summarizer runs under this history's lock, so it only delays
+        other calls on the same session.
+
+        Args:
+            interaction: Interaction record with user_message and agent_response
+        """
+        with self._lock:
+            self._turns.append(interaction)
+            self.chars += interaction_chars(interaction)
+            self.total_turns += 1
+
+            if not self._over(self.max_turns, self.max_chars):
+                return
+
+            # Cut back to the low watermark so compaction happens in batches
+            turns_target = self.max_turns * self.compact_ratio if self.max_turns is not None else None
+            chars_target = self.max_chars * self.compact_ratio if self.max_chars is not None else None
+            dropped = []
+            while len(self._turns) > 1 and self._over(turns_target, chars_target):
+                turn = self._turns.popleft()
+                self.chars -= interaction_chars(turn)
+                dropped.append(turn)
+            self.dropped_turns += len(dropped)
+
+            if dropped and self.summarizer is not None:
+                try:
+                    self.summary = self.summarizer(self.summary, dropped)
+                except Exception as e:
+                    # The turns are dropped regardless, so memory stays bounded
+                    logger.warning("History summarizer failed; %d turns dropped unsummarized: %s", len(dropped), e)
+
+    def window(self, max_turns: Optional[int] = None, max_chars: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent turns that fit in a window.
+
+        Args:
+            max_turns: Maximum number of turns to return
+            max_chars: Maximum number of message characters to return
+
+        Returns:
+            Turns, oldest first
+        """
+        selected = []
+        chars = 0
+        with self._lock:
+            for turn in reversed(self._turns):
+                if max_turns is not None and len(selected) >= max_turns:
+                    break
+                size = interaction_chars(turn)
+                if max_chars is not None and chars + size > max_chars and selected:
+                    break
+                selected.append(turn)
+                chars += size
+        selected.reverse()
+        return selected
+
+    def render(
+        self,
+        max_turns: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        user_label: str = "User",
+        agent_label: str = "Assistant"
+    ) -> str:
+        """
+        Render the summary and a window of recent turns as prompt text.
+
+        Args:
+            max_turns: Maximum number of turns to include
+            max_chars: Maximum number of message characters to include
+            user_label: Label of user messages
+            agent_label: Label of agent responses
+
+        Returns:
+            Conversation text ('' if there is nothing to include)
+        """
+        lines = []
+        with self._lock:
+            summary = self.summary
+            turns = self.window(max_turns, max_chars)
+        if summary:
+            lines.append(f"Summary of earlier conversation: {summary}")
+        for turn in turns:
+            lines.append(f"{user_label}: {turn.get('user_message', '')}")
+            lines.append(f"{agent_label}: {turn.get('agent_response', '')}")
+        return "\n".join(lines)
+
+    def restore(self, turns: List[Dict[str, Any]], summary: Optional[str] = None, total_turns: int = 0) -> None:
+        """
+        Replace the contents with previously stored turns and summary.
+
+        The limits are applied by dropping the oldest turns; the summarizer
+        is not called.
+
+        Args:
+            turns: Stored turns, oldest first
+            summary: Stored rolling summary
+            total_turns: Number of turns the history had received
+        """
+        with self._lock:
+            self._turns = deque(turns)
+            self.chars = sum(interaction_chars(turn) for turn in self._turns)
+            self.summary = summary
+            self.total_turns = max(total_turns, len(self._turns))
+            while len(self._turns) > 1 and self._over(self.max_turns, self.max_chars):
+                self.chars -= interaction_chars(self._turns.popleft())
+
+    def clear(self) -> None:
+        """Remove every turn and the summary."""
+        with self._lock:
+            self._turns.clear()
+            self.chars = 0
+            self.summary = None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Get the kept turns as a list, oldest first."""
+        with self._lock:
+            return list(self._turns)
@@ -0,0 +1,250 @@
+"""
+Content-addressed memoization of workflow step outputs.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .cache import CacheBackend, MemoryCacheBackend
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How deep nested functions and closures are followed when fingerprinting
+_MAX_DEPTH = 6
+
+
+def _encode(value: Any, strict: bool = False) -> str:
+    # Canonical JSON: keys sorted and set members sorted, since set iteration
+    # order (and so repr) changes between processes with PYTHONHASHSEED
+    def default(obj: Any) -> Any:
+        if isinstance(obj, (set, frozenset)):
+            return {"<set>": sorted(_encode(member, strict) for member in obj)}
+        if strict:
+            raise TypeError(f"Object of type {type(obj).__qualname__} is not JSON serializable")
+        return repr(obj)
+
+    return json.dumps(value, sort_keys=True, default=default)
+
+
+def _digest(material: Any) -> str:
+    return hashlib.sha256(_encode(material).encode("utf-8")).hexdigest()
+
+
+def make_fingerprint(*parts: Any) -> str:
+    """
+    Build a step fingerprint from explicit parts, e.g. a step's configuration.
+
+    Args:
+        *parts: JSON-serializable values identifying what the step does
+
+    Returns:
+        Hex digest of the parts
+    """
+    return _digest(list(parts))
+
+
+def hash_input(data: Any) -> str:
+    """
+    Hash the input data of a step.
+
+    Sets are hashed by their sorted members. Other values that are not
+    JSON-serializable are hashed by their repr, so objects without a stable
+    repr simply never match a stored output.
+
+    Args:
+        data: Input data of the step
+
+    Returns:
+        Hex digest of the data
+    """
+    return _digest(data)
+
+
+def _describe_const(const: Any) -> Any:
+    if inspect.iscode(const):
+        return _describe_code(const)
+    if isinstance(const, tuple):
+        return ["tuple", [_describe_const(item) for item in const]]
+    if isinstance(const, frozenset):
+        # e.g. `x in {"a", "b"}`; its repr follows the per-process string hash order
+        return ["frozenset", sorted(_encode(_describe_const(item)) for item in const)]
+    return repr(const)
+
+
+def _describe_code(code) -> Any:
+    return [
+        code.co_code.hex(),
+        [_describe_const(const) for const in code.co_consts],
+        list(code.co_names),
+    ]
+
+
+def _describe_value(value: Any, depth: int) -> Any:
+    if callable(value):
+        return _describe_callable(value, depth + 1)
+    try:
+        _encode(value, strict=True)
+        return value
+    except (TypeError, ValueError):
+        # Clients, sessions and similar objects: their identity is not part of what the step computes
+        return f"<{type(value).__module__}.{type(value).__qualname__}>"
+
+
+def _describe_callable(func: Any, depth: int = 0) -> Any:
+    if depth > _MAX_DEPTH:
+        return getattr(func, "__qualname__", type(func).__qualname__)
+
+    if isinstance(func, functools.partial):
+        return [
+            "partial",
+            _describe_callable(func.func, depth + 1),
+            [_describe_value(arg, depth) for arg in func.args],
+            {key: _describe_value(arg, depth) for key, arg in (func.keywords or {}).items()},
+        ]
+    if inspect.ismethod(func):
+        return ["method", _describe_callable(func.__func__, depth + 1), _describe_value(func.__self__, depth)]
+
+    code = getattr(func, "__code__", None)
+    if code is not None:
+        closure = []
+        for cell in func.__closure__ or ():
+            try:
+                closure.append(_describe_value(cell.cell_contents, depth))
+            except ValueError:
+                # Empty cell
+                closure.append(None)
+        defaults = [_describe_value(value, depth) for value in func.__defaults__ or ()]
+        return ["function", func.__module__, func.__qualname__, _describe_code(code), closure, defaults]
+
+    if inspect.isbuiltin(func) or inspect.isclass(func):
+        return ["builtin", getattr(func, "__module__", None), func.__qualname__]
+
+    # Callable object: its class's __call__ and its attributes
+    call = type(func).__call__
+    attributes = {key: _describe_value(value, depth) for key, value in sorted(getattr(func, "__dict__", {}).items())}
+    return ["object", type(func).__module__, type(func).__qualname__, _describe_callable(call, depth + 1), attributes]
+
+
+def callable_fingerprint(func: Any) -> str:
+    """
+    Fingerprint a step function by what it does.
+
+    The fingerprint covers the function's bytecode and constants (so editing
+    the function or a literal prompt in it changes it), plus the JSON values
+    it closes over or is partially applied to (such as an agent ID or prompt
+    template). Changes inside other functions it calls are not detected;
+    give the step an explicit fingerprint (e.g. a version string) for that.
+
+    Args:
+        func: Step function, partial, method or callable object
+
+    Returns:
+        Hex digest identifying the function
+    """
+    return _digest(_describe_callable(func))
+
+
+class StepMemo:
+    """
+    Stores step outputs keyed by the step's fingerprint and a hash of its input.
+
+    A step whose fingerprint and input are unchanged since a previous run
+    reuses that run's output instead of executing again. Because each step's
+    input is the previous step's output, changing one step re-runs it and
+    every step after it whose input changes as a result.
+
+    Any CacheBackend can hold the outputs; use SQLiteCacheBackend to keep them
+    across runs of the program (outputs must then be JSON-serializable).
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: Optional[float] = None):
+        """
+        Initialize the memo.
+
+        Args:
+            backend: Storage backend (defaults to an in-memory LRU)
+            ttl: Seconds an output stays valid (None keeps it until evicted)
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, fingerprint: str, input_data: Any) -> str:
+        """
+        Build the memo key of a step execution.
+
+        Args:
+            fingerprint: Fingerprint of the step
+            input_data: Input data of the step
+
+        Returns:
+            Hex digest key
+        """
+        return _digest([fingerprint, hash_input(input_data)])
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a stored output and update the hit/miss counters.
+
+        Args:
+            key: Memo key
+
+        Returns:
+            Tuple of (found, output)
+        """
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if entry is None:
+            return False, None
+        # Stored wrapped so that None is a valid output
+        return True, entry["output"]
+
+    def store(self, key: str, output: Any) -> None:
+        """
+        Store a step output.
+
+        Args:
+            key: Memo key
+            output: Output of the step
+        """
+        expires_at = float("inf") if self.ttl is None else time.time() + self.ttl
+        try:
+            self.backend.set(key, {"output": output}, expires_at)
+        except (TypeError, ValueError) as e:
+            # e.g. an output the SQLite backend cannot encode as JSON
+            logger.warning("Step output not memoized: %s", e)
+
+    def clear(self) -> None:
+        """Remove every stored output."""
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get memo statistics.
+
+        Returns:
+            Dict with hits, misses, hit_rate and size
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(self.backend),
+        }
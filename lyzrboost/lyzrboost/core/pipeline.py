@@ -0,0 +1,669 @@
+"""
+Streaming pipelines: workflow steps that pass partial output downstream as it is produced.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import re
+import time
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from .compiler import INPUT_VARIABLE, PromptTemplate
+from .deadline import context_with_deadline, resolve_deadline
+from .errors import DeadlineExceeded
+from .workflow import Workflow, WorkflowStep
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default number of chunks buffered between two stages; generous so a fast
+# upstream agent is rarely held back by a slower consumer
+DEFAULT_QUEUE_SIZE = 1024
+
+_HEADING = re.compile(r"^(#{1,6})[ \t]")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+# Marks the end of a stage's output in the queue to the next stage
+_END = object()
+
+
+class _StageFailed:
+    """Queue item carrying a stage's error to the consumer of the pipeline."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _is_async_gen_callable(func: Any) -> bool:
+    """Check whether calling ``func`` returns an async generator."""
+    while isinstance(func, functools.partial):
+        func = func.func
+    return inspect.isasyncgenfunction(func) or inspect.isasyncgenfunction(getattr(func, "__call__", None))
+
+
+class _SectionBuffer:
+    """Splits text fed in arbitrary pieces into markdown sections."""
+
+    def __init__(self, level: int, min_chars: int):
+        self.level = level
+        self.min_chars = min_chars
+        self._partial = ""
+        self._section: List[str] = []
+        self._size = 0
+        self._in_fence = False
+
+    def _starts_section(self, line: str) -> bool:
+        if _FENCE.match(line):
+            self._in_fence = not self._in_fence
+            return False
+        if self._in_fence:
+            return False
+        match = _HEADING.match(line)
+        return match is not None and len(match.group(1)) <= self.level
+
+    def feed(self, text: str) -> List[str]:
+        sections = []
+        lines = (self._partial + text).split("\n")
+        # The last piece has no newline yet and may still grow
+        self._partial = lines.pop()
+        for line in lines:
+            if self._starts_section(line) and self._size >= self.min_chars and "".join(self._section).strip():
+                sections.append("".join(self._section))
+                self._section, self._size = [], 0
+            self._section.append(line + "\n")
+            self._size += len(line) + 1
+        return sections
+
+    def flush(self) -> Optional[str]:
+        text = "".join(self._section) + self._partial
+        self._section, self._size, self._partial = [], 0, ""
+        return text if text.strip() else None
+
+
+class MarkdownSectionChunker:
+    """
+    Regroups a stream of text chunks into whole markdown sections.
+
+    A section ends where the next heading of at most ``level`` begins (a
+    line such as ``## Results``), so a downstream stage can start on the
+    first section of a draft while the rest is still being written.
+    Headings inside fenced code blocks are ignored.
+    """
+
+    def __init__(self, level: int = 2, min_chars: int = 0):
+        """
+        Initialize the chunker.
+
+        Args:
+            level: Deepest heading level that starts a new section (1-6)
+            min_chars: Minimum size of a section; smaller ones are merged
+                       with the next one
+        """
+        if not 1 <= level <= 6:
+            raise ValueError("level must be between 1 and 6")
+        self.level = level
+        self.min_chars = min_chars
+
+    def split(self, text: str) -> List[str]:
+        """
+        Split a complete text into sections.
+
+        Args:
+            text: Markdown text
+
+        Returns:
+            List of sections
+        """
+        buffer = _SectionBuffer(self.level, self.min_chars)
+        sections = buffer.feed(text)
+        last = buffer.flush()
+        if last is not None:
+            sections.append(last)
+        return sections
+
+    async def __call__(self, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        buffer = _SectionBuffer(self.level, self.min_chars)
+        async for chunk in chunks:
+            for section in buffer.feed(chunk):
+                yield section
+        last = buffer.flush()
+        if last is not None:
+            yield last
+
+
+class StreamingAgentCall:
+    """
+    Stream step function calling an agent once per incoming chunk.
+
+    Each chunk (typically a section from a chunker) is rendered into the
+    prompt as ``{input}`` and the agent's streamed response is passed on
+    as it arrives. Chunks are handled one after another, in order.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        agent_id: str,
+        user_id: str,
+        prompt: Union[str, PromptTemplate] = "{input}",
+        session_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        separator: str = "\n\n"
+    ):
+        """
+        Initialize the call.
+
+        Args:
+            client: AsyncAgentClient used to stream the responses
+            agent_id: ID of the agent to call
+            user_id: User ID for the agent calls
+            prompt: Prompt template; ``{input}`` is replaced by the chunk
+            session_id: Session for the calls (defaults to agent_id)
+            timeout: Seconds to wait for the connection and between chunks
+            separator: Text emitted between the responses for two chunks
+        """
+        self.client = client
+        self.agent_id = agent_id
+        self.user_id = user_id
+        self.prompt = prompt if isinstance(prompt, PromptTemplate) else PromptTemplate(prompt)
+        self.session_id = session_id
+        self.timeout = timeout
+        self.separator = separator
+
+    async def __call__(self, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        first = True
+        async for chunk in chunks:
+            message = self.prompt.render({INPUT_VARIABLE: chunk})
+            logger.debug("Streaming agent %s for a %d character chunk", self.agent_id, len(chunk))
+            stream = await self.client.stream(
+                self.user_id,
+                self.agent_id,
+                self.session_id,
+                message,
+                timeout=self.timeout
+            )
+            async with stream:
+                if not first and self.separator:
+                    yield self.separator
+                first = False
+                async for piece in stream:
+                    yield piece
+
+
+class StreamStep(WorkflowStep):
+    """
+    A workflow step that consumes and produces a stream of text chunks.
+
+    The step function is either an async generator function taking an
+    async iterator of chunks and yielding chunks, which lets it start as
+    soon as the first input arrives, or an ordinary step function, which
+    is called with the complete upstream text once it has all arrived.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        chunker: Optional[Callable[[AsyncIterator[str]], AsyncIterator[str]]] = None,
+        on_chunk: Optional[Callable[[str], Any]] = None
+    ):
+        """
+        Initialize a stream step.
+
+        Args:
+            func: Async generator function over chunks, or a plain step function
+            name: Optional name for the step (defaults to function name)
+            description: Optional description of the step
+            chunker: Optional function regrouping the incoming chunks before
+                     the step sees them (e.g. a MarkdownSectionChunker)
+            on_chunk: Optional callback receiving each chunk the step yields
+        """
+        name = name or getattr(func, "__name__", type(func).__name__)
+        super().__init__(func, name=name, description=description, on_chunk=on_chunk, memoize=False)
+        self.chunker = chunker
+
+    async def stream(self, chunks: AsyncIterator[str], executor: Optional[Executor] = None) -> AsyncIterator[str]:
+        """
+        Run the step over a stream of chunks.
+
+        Args:
+            chunks: Upstream chunks
+            executor: Executor for sync step functions
+
+        Yields:
+            The chunks produced by the step
+        """
+        if self.chunker is not None:
+            chunks = self.chunker(chunks)
+
+        if _is_async_gen_callable(self.func):
+            output = self.func(chunks)
+        else:
+            # Barrier step: needs the whole upstream text
+            parts = []
+            async for chunk in chunks:
+                parts.append(chunk)
+            output = await self.aexecute("".join(parts), executor)
+
+        if isinstance(output, str):
+            if output:
+                yield output
+        elif hasattr(output, "__aiter__"):
+            async for chunk in output:
+                yield chunk
+        elif output is not None:
+            yield str(output)
+
+
+class StageTiming:
+    """
+    When one stage of a streaming pipeline run produced its output.
+
+    Attributes:
+        name: Name of the stage
+        status: 'running', 'completed', 'failed' or 'cancelled'
+        first_input: Seconds from the start of the run to the first chunk received
+        first_output: Seconds from the start of the run to the first chunk produced
+        finished: Seconds from the start of the run to the end of the stage
+        chunks: Number of chunks produced
+        chars: Number of characters produced
+    """
+
+    __slots__ = ("name", "status", "first_input", "first_output", "finished", "chunks", "chars")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "running"
+        self.first_input: Optional[float] = None
+        self.first_output: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.chunks = 0
+        self.chars = 0
+
+    def __repr__(self) -> str:
+        return f"StageTiming(name={self.name!r}, status={self.status!r}, first_output={self.first_output!r})"
+
+
+class PipelineReport:
+    """
+    Timing report of one streaming pipeline run.
+
+    ``time_to_first_output`` is how long the run took to produce its first
+    chunk of final output, which is what a streaming pipeline shortens;
+    each stage's entry shows when it first received and produced output.
+    """
+
+    def __init__(self, workflow: str, stages: List[StreamStep], deadline: Optional[float] = None):
+        self.workflow = workflow
+        self.deadline = deadline
+        self.stages = [StageTiming(stage.name) for stage in stages]
+        self.error: Optional[BaseException] = None
+        self.elapsed = 0.0
+        self._started = time.perf_counter()
+
+    def now(self) -> float:
+        """Seconds since the start of the run."""
+        return time.perf_counter() - self._started
+
+    @property
+    def time_to_first_output(self) -> Optional[float]:
+        """Seconds until the last stage produced its first chunk."""
+        return self.stages[-1].first_output if self.stages else None
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Mark the run as finished (with the error that stopped it, if any)."""
+        self.error = error
+        self.elapsed = self.now()
+        for stage in self.stages:
+            if stage.status == "running":
+                stage.status = "cancelled"
+
+    @property
+    def succeeded(self) -> bool:
+        """True if the run completed without error."""
+        return self.error is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the report as plain data.
+
+        Returns:
+            Dict with the workflow name, deadline, elapsed, time_to_first_output,
+            error and stages
+        """
+        return {
+            "workflow": self.workflow,
+            "deadline": self.deadline,
+            "elapsed": self.elapsed,
+            "time_to_first_output": self.time_to_first_output,
+            "error": str(self.error) if self.error is not None else None,
+            "stages": [
+                {name: getattr(stage, name) for name in StageTiming.__slots__}
+                for stage in self.stages
+            ],
+        }
+
+    def format(self) -> str:
+        """
+        Render the report as a table.
+
+        Returns:
+            Multi-line text report
+        """
+        def seconds(value: Optional[float]) -> str:
+            return f"{value:7.2f}s" if value is not None else f"{'-':>8}"
+
+        outcome = "completed" if self.succeeded else "failed"
+        first = self.time_to_first_output
+        first_output = f"first output after {first:.2f}s" if first is not None else "no output"
+        lines = [f"Pipeline '{self.workflow}' {outcome} in {self.elapsed:.2f}s, {first_output}"]
+        width = max([len(stage.name) for stage in self.stages] + [len("stage")])
+        lines.append(f"  {'stage':<{width}}  {'status':<9}  {'1st in':>8}  {'1st out':>8}  {'done':>8}  chunks")
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.name:<{width}}  {stage.status:<9}  {seconds(stage.first_input)}  "
+                f"{seconds(stage.first_output)}  {seconds(stage.finished)}  {stage.chunks}"
+            )
+        if self.error is not None:
+            lines.append(f"  error: {self.error}")
+        return "\n".join(lines)
+
+
+class StreamingWorkflow(Workflow):
+    """
+    A workflow whose steps run at the same time, streaming into each other.
+
+    Every step is a StreamStep running as its own task; a bounded queue
+    between two steps carries text chunks as soon as they are produced, so
+    in a research -> write -> edit chain the writer starts on the first
+    section of the research while the rest is still being generated.
+    Plain callables are wrapped as barrier steps that wait for all of
+    their input. Checkpointing and memoization do not apply to streams.
+    run_many() runs each input on its own event loop in a worker thread.
+    """
+
+    def __init__(
+        self,
+        steps: List[Union[Callable, StreamStep]],
+        name: str = "pipeline",
+        description: Optional[str] = None,
+        deadline: Optional[float] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        """
+        Initialize a streaming workflow.
+
+        Args:
+            steps: List of StreamStep objects or functions
+            name: Name of the workflow
+            description: Optional description of the workflow
+            deadline: Optional default number of seconds a run may take
+            queue_size: Maximum number of chunks buffered between two steps
+        """
+        stream_steps = []
+        for step in steps:
+            if isinstance(step, StreamStep):
+                stream_steps.append(step)
+            elif isinstance(step, WorkflowStep):
+                stream_steps.append(StreamStep(step.func, name=step.name, description=step.description))
+            elif callable(step):
+                stream_steps.append(StreamStep(step))
+            else:
+                raise TypeError(f"Step must be callable or StreamStep, got {type(step)}")
+        if not stream_steps:
+            raise ValueError("A streaming workflow needs at least one step")
+
+        super().__init__(stream_steps, name=name, description=description, deadline=deadline)
+        self.queue_size = queue_size
+        self.last_report: Optional[PipelineReport] = None
+
+    @staticmethod
+    async def _source(initial_input: Any, executor: Optional[Executor]) -> AsyncIterator[str]:
+        if isinstance(initial_input, str):
+            if initial_input:
+                yield initial_input
+        elif hasattr(initial_input, "__aiter__"):
+            async for chunk in initial_input:
+                yield chunk
+        elif isinstance(initial_input, (list, tuple)):
+            for chunk in initial_input:
+                yield chunk
+        else:
+            # Any other iterable (such as an AgentStream) may block between chunks,
+            # so it is read on the executor rather than on the event loop
+            loop = asyncio.get_running_loop()
+            chunks = iter(initial_input)
+            while True:
+                chunk = await loop.run_in_executor(executor, next, chunks, _END)
+                if chunk is _END:
+                    return
+                yield chunk
+
+    @staticmethod
+    async def _drain(queue: asyncio.Queue, timing: StageTiming, report: PipelineReport) -> AsyncIterator[str]:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                return
+            if timing.first_input is None:
+                timing.first_input = report.now()
+            yield item
+
+    async def _run_stage(
+        self,
+        step: StreamStep,
+        chunks: AsyncIterator[str],
+        output: asyncio.Queue,
+        failures: asyncio.Queue,
+        timing: StageTiming,
+        report: PipelineReport,
+        executor: Optional[Executor]
+    ) -> None:
+        try:
+            async for chunk in step.stream(chunks, executor):
+                if not chunk:
+                    continue
+                if timing.first_output is None:
+                    timing.first_output = report.now()
+                    logger.debug("Stage '%s' produced its first output after %.3fs", step.name, timing.first_output)
+                timing.chunks += 1
+                timing.chars += len(chunk)
+                if step.on_chunk is not None:
+                    step.on_chunk(chunk)
+                await output.put(chunk)
+            timing.status = "completed"
+            timing.finished = report.now()
+            await output.put(_END)
+        except Exception as e:
+            timing.status = "failed"
+            timing.finished = report.now()
+            logger.error("Error in pipeline stage '%s': %s", step.name, e)
+            # Straight to the consumer, which stops every other stage
+            await failures.put(_StageFailed(e))
+
+    async def astream(
+        self,
+        initial_input: Any,
+        executor: Optional[Executor] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Run the pipeline and yield the final step's output as it is produced.
+
+        Args:
+            initial_input: Text, or an iterable / async iterable of text chunks
+                           (such as an AgentStream or AsyncAgentStream)
+            executor: Executor for sync step functions and for reading a
+                      sync iterable input, which may block between chunks
+            deadline: Seconds the whole run may take (defaults to the workflow's deadline)
+
+        Yields:
+            Chunks of the final step's output
+
+        Raises:
+            DeadlineExceeded: If the run does not finish before its deadline
+        """
+        deadline = self._deadline(deadline)
+        self.last_report = PipelineReport(self.name, self.steps, deadline)
+        stream = self._stream(initial_input, executor, deadline, self.last_report)
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def _stream(
+        self,
+        initial_input: Any,
+        executor: Optional[Executor],
+        deadline: Optional[float],
+        report: PipelineReport
+    ) -> AsyncIterator[str]:
+        logger.info("Starting streaming workflow: %s", self.name)
+
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.steps]
+        final = queues[-1]
+        tasks = []
+        try:
+            # The deadline is set only in the stage tasks' context: this generator's
+            # frames run in the consumer's context, which must not see it between chunks
+            scope = resolve_deadline(deadline)
+            context = context_with_deadline(scope)
+            chunks = self._source(initial_input, executor)
+            for index, (step, timing) in enumerate(zip(self.steps, report.stages)):
+                if index > 0:
+                    chunks = self._drain(queues[index - 1], timing, report)
+                stage = self._run_stage(step, chunks, queues[index], final, timing, report, executor)
+                # Tasks copy the context they are created in
+                tasks.append(context.run(asyncio.ensure_future, stage))
+
+            while True:
+                if scope is None:
+                    item = await final.get()
+                else:
+                    try:
+                        item = await asyncio.wait_for(final.get(), scope.remaining())
+                    except asyncio.TimeoutError as e:
+                        raise DeadlineExceeded(
+                            f"Streaming workflow '{self.name}' did not finish before its deadline"
+                        ) from e
+                if item is _END:
+                    break
+                if isinstance(item, _StageFailed):
+                    raise item.error
+                yield item
+        except GeneratorExit:
+            # The caller stopped reading early
+            report.finish()
+            raise
+        except BaseException as e:
+            report.finish(e)
+            raise
+        else:
+            report.finish()
+            first = report.time_to_first_output
+            logger.info(
+                "Streaming workflow '%s' completed in %.3fs (first output after %s)",
+                self.name, report.elapsed, f"{first:.3f}s" if first is not None else "-"
+            )
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def arun(
+        self,
+        initial_input: Any,
+        executor: Optional[Executor] = None,
+        run_id: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> str:
+        """
+        Run the pipeline on the running event loop and return the full output.
+
+        Args:
+            initial_input: Text, or an iterable / async iterable of text chunks
+            executor: Executor for sync step functions
+            run_id: Not supported; streaming runs are not checkpointed
+            deadline: Seconds the whole run may take (defaults to the workflow's deadline)
+
+        Returns:
+            The final step's complete output text
+        """
+        if run_id is not None:
+            raise ValueError("Streaming workflows do not support checkpointed runs")
+        deadline = self._deadline(deadline)
+        self.last_report = PipelineReport(self.name, self.steps, deadline)
+        return await self._collect(initial_input, executor, deadline, self.last_report)
+
+    async def _collect(
+        self,
+        initial_input: Any,
+        executor: Optional[Executor],
+        deadline: Optional[float],
+        report: PipelineReport
+    ) -> str:
+        parts = []
+        stream = self._stream(initial_input, executor, deadline, report)
+        try:
+            async for chunk in stream:
+                parts.append(chunk)
+        finally:
+            await stream.aclose()
+        return "".join(parts)
+
+    def run(self, initial_input: Any, run_id: Optional[str] = None, deadline: Optional[float] = None) -> str:
+        """
+        Run the pipeline to completion on a new event loop.
+
+        Args:
+            initial_input: Text, or an iterable / async iterable of text chunks
+            run_id: Not supported; streaming runs are not checkpointed
+            deadline: Seconds the whole run may take (defaults to the workflow's deadline)
+
+        Returns:
+            The final step's complete output text
+        """
+        return asyncio.run(self.arun(initial_input, run_id=run_id, deadline=deadline))
+
+    def _run_detached(
+        self,
+        initial_input: Any,
+        deadline: Optional[float],
+        register: Optional[Callable[[Any, Optional[str]], None]] = None
+    ) -> Any:
+        # A run on this thread's own event loop with its own report (run_many, MapStep)
+        return asyncio.run(self._arun_detached(initial_input, None, deadline, register))
+
+    async def _arun_detached(
+        self,
+        initial_input: Any,
+        executor: Optional[Executor],
+        deadline: Optional[float],
+        register: Optional[Callable[[Any, Optional[str]], None]] = None
+    ) -> Any:
+        report = PipelineReport(self.name, self.steps, deadline)
+        if register is not None:
+            register(report, None)
+        return await self._collect(initial_input, executor, deadline, report)
+
+    def _run_steps(self, *args: Any) -> Any:
+        # StreamSteps only work as concurrent stages of astream()
+        raise NotImplementedError("Streaming workflows run through astream(), arun() or run()")
+
+    async def _arun_steps(self, *args: Any) -> Any:
+        raise NotImplementedError("Streaming workflows run through astream(), arun() or run()")
+
+    def resume(self, run_id: str, deadline: Optional[float] = None) -> Any:
+        raise ValueError("Streaming workflows do not support checkpointed runs")
+
+    async def aresume(self, run_id: str, executor: Optional[Executor] = None, deadline: Optional[float] = None) -> Any:
+        raise ValueError("Streaming workflows do not support checkpointed runs")
@@ -0,0 +1,249 @@
+"""
+Client-side token-bucket rate limiting for agent requests.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Valid values for the limiter scope
+SCOPES = ("api_key", "agent", "api_key+agent")
+
+
+class RateLimiter:
+    """
+    Base class for token-bucket rate limiters.
+
+    Limiters work by reservation: ``reserve`` takes the tokens immediately and
+    returns how long the caller must wait before using them. This keeps
+    callers in first-come order and lets the same limiter serve both threads
+    (which sleep) and asyncio tasks (which await).
+
+    Subclasses implement ``reserve``; buckets are keyed by API key, agent ID
+    or both, depending on ``scope``. Subclasses whose ``reserve`` waits on
+    I/O set ``blocking``, so that ``acquire_async`` runs it on an executor.
+    """
+
+    blocking = False
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, scope: str = "api_key"):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second (i.e. sustained requests per second)
+            capacity: Maximum burst size (defaults to ``max(1, rate)``)
+            scope: What each bucket is keyed by: 'api_key', 'agent' or 'api_key+agent'
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of {', '.join(SCOPES)}")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.scope = scope
+
+    def make_key(self, api_key: Optional[str], agent_id: Optional[str]) -> str:
+        """
+        Build the bucket key for a request.
+
+        API keys are hashed so they never end up in shared storage.
+
+        Args:
+            api_key: API key used for the request
+            agent_id: Agent the request is sent to
+
+        Returns:
+            Bucket key string
+        """
+        parts = []
+        if self.scope in ("api_key", "api_key+agent"):
+            digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+            parts.append(f"key:{digest}")
+        if self.scope in ("agent", "api_key+agent"):
+            parts.append(f"agent:{agent_id or ''}")
+        return "|".join(parts)
+
+    def _refill(self, tokens: float, elapsed: float) -> float:
+        return min(self.capacity, tokens + max(0.0, elapsed) * self.rate)
+
+    def _take(self, tokens: float, requested: float, max_wait: Optional[float]) -> Tuple[float, Optional[float]]:
+        """
+        Apply a reservation to a bucket level.
+
+        Returns:
+            Tuple of (new token level, wait in seconds or None if refused)
+        """
+        if tokens >= requested:
+            return tokens - requested, 0.0
+
+        wait = (requested - tokens) / self.rate
+        if max_wait is not None and wait > max_wait:
+            return tokens, None
+        return tokens - requested, wait
+
+    def reserve(self, key: str, tokens: float = 1, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve tokens from a bucket.
+
+        Args:
+            key: Bucket key (see make_key)
+            tokens: Number of tokens to take
+            max_wait: Refuse the reservation if it would require waiting longer
+
+        Returns:
+            Seconds the caller must wait before proceeding, or None if the
+            reservation was refused because of ``max_wait``
+        """
+        raise NotImplementedError
+
+    def acquire(self, key: str, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block the calling thread until tokens are available.
+
+        Args:
+            key: Bucket key (see make_key)
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            True if the tokens were acquired, False if the wait would exceed timeout
+        """
+        wait = self.reserve(key, tokens, max_wait=timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            logger.debug("Rate limit reached for %s; waiting %.3fs", key, wait)
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, key: str, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Await until tokens are available without blocking the event loop.
+
+        Args:
+            key: Bucket key (see make_key)
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            True if the tokens were acquired, False if the wait would exceed timeout
+        """
+        if self.blocking:
+            loop = asyncio.get_running_loop()
+            wait = await loop.run_in_executor(None, self.reserve, key, tokens, timeout)
+        else:
+            wait = self.reserve(key, tokens, max_wait=timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            logger.debug("Rate limit reached for %s; waiting %.3fs", key, wait)
+            await asyncio.sleep(wait)
+        return True
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    In-process token-bucket limiter shared by all threads and tasks.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, scope: str = "api_key"):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second (i.e. sustained requests per second)
+            capacity: Maximum burst size (defaults to ``max(1, rate)``)
+            scope: What each bucket is keyed by: 'api_key', 'agent' or 'api_key+agent'
+        """
+        super().__init__(rate, capacity, scope)
+        self._lock = threading.Lock()
+        # key -> (tokens, last refill time)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def reserve(self, key: str, tokens: float = 1, max_wait: Optional[float] = None) -> Optional[float]:
+        with self._lock:
+            now = time.monotonic()
+            level, updated = self._buckets.get(key, (self.capacity, now))
+            level = self._refill(level, now - updated)
+            level, wait = self._take(level, tokens, max_wait)
+            self._buckets[key] = (level, now)
+            return wait
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Token-bucket limiter whose buckets live in a SQLite file.
+
+    Every process pointing at the same file shares the same buckets, so a
+    multi-process deployment stays under one combined limit. Updates run in
+    ``BEGIN IMMEDIATE`` transactions, which serialize writers across processes.
+    """
+
+    # Waiting for the database lock must not stall an event loop
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        capacity: Optional[float] = None,
+        scope: str = "api_key"
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            path: Path to the SQLite database file (created if missing)
+            rate: Tokens added per second (i.e. sustained requests per second)
+            capacity: Maximum burst size (defaults to ``max(1, rate)``)
+            scope: What each bucket is keyed by: 'api_key', 'agent' or 'api_key+agent'
+        """
+        super().__init__(rate, capacity, scope)
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def reserve(self, key: str, tokens: float = 1, max_wait: Optional[float] = None) -> Optional[float]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Wall-clock time, since monotonic clocks are not shared between processes
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            level, updated = row if row is not None else (self.capacity, now)
+            level = self._refill(level, now - updated)
+            level, wait = self._take(level, tokens, max_wait)
+            connection.execute(
+                "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, level, now)
+            )
+            connection.execute("COMMIT")
+            return wait
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
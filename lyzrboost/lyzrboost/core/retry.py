@@ -0,0 +1,260 @@
+"""
+Retry policy with exponential backoff, full jitter and Retry-After support.
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from .deadline import remaining_time
+from .errors import APIError, APIConnectionError, APITimeoutError, DeadlineExceeded
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Statuses where the server rejected or never handled the request
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP-date
+
+    Returns:
+        Seconds to wait, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryStats:
+    """
+    Thread-safe counters describing retry activity.
+
+    Attributes:
+        calls: Number of logical calls made through the policy
+        attempts: Number of attempts, including the first one of each call
+        retries: Number of attempts that were retries
+        backoff_seconds: Total time spent sleeping between attempts
+        exhausted: Calls that failed after using every attempt
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters to zero."""
+        with self._lock:
+            self.calls = 0
+            self.attempts = 0
+            self.retries = 0
+            self.backoff_seconds = 0.0
+            self.exhausted = 0
+
+    def record(self, **increments: float) -> None:
+        """Add the given increments to the matching counters."""
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return the current counters as a dict."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "backoff_seconds": self.backoff_seconds,
+                "exhausted": self.exhausted,
+            }
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed agent call is retried.
+
+    Only errors where repeating the request cannot duplicate work are
+    retried by default: failed connections and the statuses in
+    ``retry_on_status``. Read timeouts are not retried unless enabled, because
+    the agent may already have processed the message.
+
+    Delays use exponential backoff with full jitter, i.e. a random value
+    between 0 and ``min(backoff_max, backoff_base * 2 ** (attempt - 1))``.
+    A Retry-After value from the server is used as a lower bound.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_on_status: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        retry_on_timeout: bool = False,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Total attempts per call, including the first one
+            backoff_base: Base delay in seconds for the exponential backoff
+            backoff_max: Upper bound in seconds for a single backoff delay
+            retry_on_status: HTTP status codes that are retried
+            retry_on_timeout: Whether to retry read timeouts
+            respect_retry_after: Whether to wait at least the server's Retry-After
+            max_retry_after: Give up instead of retrying if the server asks
+                             us to wait longer than this many seconds
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_on_status = frozenset(retry_on_status)
+        self.retry_on_timeout = retry_on_timeout
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.stats = RetryStats()
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Check whether an error may be retried safely.
+
+        Args:
+            error: The exception raised by the failed attempt
+
+        Returns:
+            True if the call can be repeated
+        """
+        if isinstance(error, DeadlineExceeded):
+            return False
+        if isinstance(error, APIConnectionError):
+            return True
+        if isinstance(error, APITimeoutError):
+            return self.retry_on_timeout
+        if isinstance(error, APIError):
+            return error.status_code in self.retry_on_status
+        return False
+
+    def compute_delay(self, attempt: int, error: Optional[Exception] = None) -> Optional[float]:
+        """
+        Compute how long to wait before the next attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+            error: The exception raised by that attempt
+
+        Returns:
+            Delay in seconds, or None if the server asked for a longer wait
+            than ``max_retry_after``
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+
+        retry_after = getattr(error, "retry_after", None)
+        if self.respect_retry_after and retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+
+        return delay
+
+    def _next_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        delay = self.compute_delay(attempt, error)
+        remaining = remaining_time()
+        if delay is not None and remaining is not None and delay >= remaining:
+            # The retry could not start before the caller's deadline
+            return None
+        return delay
+
+    def call(self, func: Callable[[], Any]) -> Any:
+        """
+        Call ``func`` and retry it according to this policy.
+
+        Args:
+            func: Zero-argument callable performing one attempt
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            Exception: The error from the last attempt if every attempt failed
+                       or the error is not retryable
+        """
+        self.stats.record(calls=1)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.stats.record(attempts=1)
+            try:
+                return func()
+            except Exception as e:
+                delay = self._next_delay(attempt, e)
+                if delay is None:
+                    if attempt >= self.max_attempts:
+                        self.stats.record(exhausted=1)
+                    raise
+
+                logger.warning("Attempt %d failed (%s); retrying in %.2fs", attempt, e, delay)
+                self.stats.record(retries=1, backoff_seconds=delay)
+                time.sleep(delay)
+
+    async def call_async(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``func()`` and retry it according to this policy.
+
+        Args:
+            func: Zero-argument callable returning an awaitable for one attempt
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            Exception: The error from the last attempt if every attempt failed
+                       or the error is not retryable
+        """
+        self.stats.record(calls=1)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.stats.record(attempts=1)
+            try:
+                return await func()
+            except Exception as e:
+                delay = self._next_delay(attempt, e)
+                if delay is None:
+                    if attempt >= self.max_attempts:
+                        self.stats.record(exhausted=1)
+                    raise
+
+                logger.warning("Attempt %d failed (%s); retrying in %.2fs", attempt, e, delay)
+                self.stats.record(retries=1, backoff_seconds=delay)
+                await asyncio.sleep(delay)
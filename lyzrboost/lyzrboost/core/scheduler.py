@@ -0,0 +1,523 @@
+"""
+Priority-aware scheduling of workflow runs and agent calls across tenants.
+"""
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ..utils.concurrency import BatchResult, BatchRun, timed_call
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Priority classes from highest to lowest
+DEFAULT_PRIORITY_CLASSES = ("interactive", "batch")
+DEFAULT_TENANT = "default"
+
+# Scheduler whose slot the current context holds; nested requests reuse it
+_held_scheduler: contextvars.ContextVar[Optional["WorkflowScheduler"]] = contextvars.ContextVar(
+    "lyzrboost_held_scheduler", default=None
+)
+
+
+def _percentile(ordered: List[float], p: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+class _Ticket:
+    """A request for one unit of concurrency, queued until it is granted."""
+
+    __slots__ = ("tenant", "priority", "start", "finish", "enqueued", "event", "task", "granted", "abandoned")
+
+    def __init__(self, tenant: str, priority: str):
+        self.tenant = tenant
+        self.priority = priority
+        self.start = 0.0
+        self.finish = 0.0
+        self.enqueued = time.perf_counter()
+        # Set when a caller waiting in slot() is granted
+        self.event: Optional[threading.Event] = None
+        # (context, func, args, kwargs, future) of a submitted task
+        self.task: Optional[tuple] = None
+        self.granted = False
+        self.abandoned = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self.abandoned or (self.task is not None and self.task[4].cancelled())
+
+
+class _ClassQueue:
+    """Weighted fair queue of the tickets of one priority class."""
+
+    def __init__(self, name: str, wait_window: int):
+        self.name = name
+        self.heap: List[tuple] = []
+        self.virtual_time = 0.0
+        self.tenant_finish: Dict[str, float] = {}
+        self.tenant_depth: Dict[str, int] = {}
+        self.waits: Deque[float] = deque(maxlen=wait_window)
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+
+
+class WorkflowScheduler:
+    """
+    Runs workflows and agent calls under a global concurrency cap.
+
+    Work is queued per priority class. Whenever a slot frees up, the
+    highest class with queued work is served first, so interactive
+    requests never wait behind batch jobs, while batch work uses whatever
+    capacity interactive traffic leaves idle.
+
+    Within a class, tenants share capacity by weighted fair queuing: each
+    request gets a virtual finish time that advances by ``cost / weight``
+    per request of its tenant. A tenant with a 5,000-item backlog
+    therefore takes turns with a tenant submitting a single request
+    instead of blocking it.
+
+    Work is either submitted (``submit``, ``run_workflow``, ``map``) and run
+    on the scheduler's threads, or run in the caller's thread once a slot
+    is granted (``call``, ``slot``). Only work passed to these methods is
+    scheduled: agent clients do not consult the scheduler, so the calls a
+    scheduled workflow makes run within its slot rather than queuing on
+    their own. A ``call`` or ``slot`` made while already holding a slot of
+    this scheduler reuses it instead of waiting for a second one.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        priority_classes: Sequence[str] = DEFAULT_PRIORITY_CLASSES,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        default_priority: Optional[str] = None,
+        wait_window: int = 1000
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum number of workflows/agent calls running at once
+            priority_classes: Class names from highest to lowest priority
+            tenant_weights: Relative share of capacity per tenant (default 1.0)
+            default_priority: Class used when none is given (defaults to the lowest)
+            wait_window: Number of recent queue waits kept per class for statistics
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if not priority_classes:
+            raise ValueError("At least one priority class is required")
+
+        self.max_concurrency = max_concurrency
+        self.priority_classes = tuple(priority_classes)
+        self.default_priority = default_priority or self.priority_classes[-1]
+        if self.default_priority not in self.priority_classes:
+            raise ValueError(f"Unknown priority class '{self.default_priority}'")
+        self.tenant_weights: Dict[str, float] = dict(tenant_weights or {})
+
+        self._lock = threading.Lock()
+        self._classes = {name: _ClassQueue(name, wait_window) for name in self.priority_classes}
+        self._sequence = itertools.count()
+        self._running = 0
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="lyzr-scheduler")
+
+        logger.debug(
+            "WorkflowScheduler initialized (max_concurrency=%d, classes=%s)",
+            max_concurrency, ", ".join(self.priority_classes)
+        )
+
+    def set_weight(self, tenant: str, weight: float) -> None:
+        """
+        Set a tenant's relative share of capacity.
+
+        Args:
+            tenant: Tenant name
+            weight: Positive weight (a tenant with weight 2 gets twice the share of one with 1)
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        with self._lock:
+            self.tenant_weights[tenant] = weight
+
+    def _enqueue(self, ticket: _Ticket, cost: float) -> List[_Ticket]:
+        if ticket.priority not in self._classes:
+            raise ValueError(f"Unknown priority class '{ticket.priority}'")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Scheduler has been shut down")
+            queue = self._classes[ticket.priority]
+            weight = self.tenant_weights.get(ticket.tenant, 1.0)
+            ticket.start = max(queue.virtual_time, queue.tenant_finish.get(ticket.tenant, 0.0))
+            ticket.finish = ticket.start + cost / weight
+            queue.tenant_finish[ticket.tenant] = ticket.finish
+            queue.tenant_depth[ticket.tenant] = queue.tenant_depth.get(ticket.tenant, 0) + 1
+            queue.submitted += 1
+            heapq.heappush(queue.heap, (ticket.finish, next(self._sequence), ticket))
+            return self._grant_locked()
+
+    def _pop_locked(self) -> Optional[_Ticket]:
+        for name in self.priority_classes:
+            queue = self._classes[name]
+            while queue.heap:
+                _, _, ticket = heapq.heappop(queue.heap)
+                depth = queue.tenant_depth[ticket.tenant] - 1
+                if depth:
+                    queue.tenant_depth[ticket.tenant] = depth
+                else:
+                    # An idle tenant starts again from the current virtual time
+                    del queue.tenant_depth[ticket.tenant]
+                    del queue.tenant_finish[ticket.tenant]
+                if ticket.cancelled:
+                    continue
+                queue.virtual_time = ticket.start
+                return ticket
+        return None
+
+    def _grant_locked(self) -> List[_Ticket]:
+        granted = []
+        while self._running < self.max_concurrency:
+            ticket = self._pop_locked()
+            if ticket is None:
+                break
+            queue = self._classes[ticket.priority]
+            ticket.granted = True
+            self._running += 1
+            queue.running += 1
+            queue.waits.append(time.perf_counter() - ticket.enqueued)
+            granted.append(ticket)
+        return granted
+
+    def _start(self, granted: List[_Ticket]) -> None:
+        for ticket in granted:
+            if ticket.task is not None:
+                self._executor.submit(self._run_task, ticket)
+            else:
+                ticket.event.set()
+
+    def _release(self, ticket: _Ticket) -> None:
+        with self._lock:
+            queue = self._classes[ticket.priority]
+            self._running -= 1
+            queue.running -= 1
+            queue.completed += 1
+            granted = self._grant_locked()
+            if not self._running:
+                self._idle.notify_all()
+        self._start(granted)
+
+    def _run_task(self, ticket: _Ticket) -> None:
+        context, func, args, kwargs, future = ticket.task
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = context.run(self._invoke, func, args, kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        finally:
+            self._release(ticket)
+
+    def _invoke(self, func: Callable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        # Runs inside the task's copied context, so the marker stays local to it
+        _held_scheduler.set(self)
+        return func(*args, **kwargs)
+
+    def submit(
+        self,
+        func: Callable,
+        *args: Any,
+        tenant: str = DEFAULT_TENANT,
+        priority: Optional[str] = None,
+        cost: float = 1.0,
+        **kwargs: Any
+    ) -> Future:
+        """
+        Queue ``func(*args, **kwargs)`` to run on the scheduler's threads.
+
+        The call runs in a copy of the caller's context, so deadlines apply.
+
+        Args:
+            func: Function to run
+            *args: Positional arguments for func
+            tenant: Tenant the work is accounted to
+            priority: Priority class (defaults to default_priority)
+            cost: Relative size of the work for fair queuing
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Future of the result; cancelling it before it starts removes it from the queue
+        """
+        ticket = _Ticket(tenant, priority or self.default_priority)
+        future: Future = Future()
+        ticket.task = (contextvars.copy_context(), func, args, kwargs, future)
+        self._start(self._enqueue(ticket, cost))
+        return future
+
+    def run_workflow(
+        self,
+        workflow: Any,
+        initial_input: Any,
+        tenant: str = DEFAULT_TENANT,
+        priority: Optional[str] = None,
+        **run_kwargs: Any
+    ) -> Future:
+        """
+        Queue a workflow run.
+
+        Args:
+            workflow: Workflow to run
+            initial_input: The initial input of the run
+            tenant: Tenant the run is accounted to
+            priority: Priority class (defaults to default_priority)
+            **run_kwargs: Further arguments for workflow.run (e.g. deadline)
+
+        Returns:
+            Future of the workflow's output
+        """
+        return self.submit(workflow.run, initial_input, tenant=tenant, priority=priority, **run_kwargs)
+
+    @contextlib.contextmanager
+    def slot(
+        self,
+        tenant: str = DEFAULT_TENANT,
+        priority: Optional[str] = None,
+        cost: float = 1.0,
+        timeout: Optional[float] = None
+    ) -> Iterator[None]:
+        """
+        Hold one unit of concurrency in the calling thread.
+
+        Waits in the queues like submitted work. If the current context
+        already holds a slot of this scheduler, the block runs at once.
+
+        Args:
+            tenant: Tenant the work is accounted to
+            priority: Priority class (defaults to default_priority)
+            cost: Relative size of the work for fair queuing
+            timeout: Maximum seconds to wait for the slot (None waits indefinitely)
+
+        Raises:
+            TimeoutError: If no slot was granted within timeout
+        """
+        if _held_scheduler.get() is self:
+            yield
+            return
+
+        ticket = _Ticket(tenant, priority or self.default_priority)
+        ticket.event = threading.Event()
+        self._start(self._enqueue(ticket, cost))
+
+        if not ticket.event.wait(timeout):
+            with self._lock:
+                # Granted but not yet signalled counts as granted
+                ticket.abandoned = not ticket.granted
+            if ticket.abandoned:
+                raise TimeoutError(f"No scheduler slot within {timeout}s for tenant '{tenant}'")
+
+        token = _held_scheduler.set(self)
+        try:
+            yield
+        finally:
+            _held_scheduler.reset(token)
+            self._release(ticket)
+
+    def call(
+        self,
+        func: Callable,
+        *args: Any,
+        tenant: str = DEFAULT_TENANT,
+        priority: Optional[str] = None,
+        cost: float = 1.0,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run ``func(*args, **kwargs)`` in the calling thread once a slot is granted.
+
+        Meant for agent calls made outside a workflow, e.g.
+        ``scheduler.call(client.send, user_id, agent_id, session_id, message,
+        tenant="acme", priority="interactive")``.
+
+        Args:
+            func: Function to run
+            *args: Positional arguments for func
+            tenant: Tenant the call is accounted to
+            priority: Priority class (defaults to default_priority)
+            cost: Relative size of the work for fair queuing
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The result of func
+        """
+        with self.slot(tenant, priority, cost):
+            return func(*args, **kwargs)
+
+    def map(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        tenant: str = DEFAULT_TENANT,
+        priority: Optional[str] = None,
+        ordered: bool = True,
+        window: Optional[int] = None
+    ) -> BatchRun:
+        """
+        Run ``func`` over many items through the scheduler.
+
+        Items are queued lazily, at most ``window`` at a time, so a very large
+        batch neither floods the queues nor holds every input in memory.
+
+        Args:
+            func: Function called with each item (e.g. workflow.run)
+            items: Iterable of inputs
+            tenant: Tenant the batch is accounted to
+            priority: Priority class (defaults to default_priority)
+            ordered: Yield results in input order (True) or as they complete (False)
+            window: Maximum items queued or running at once (defaults to 2 x max_concurrency)
+
+        Returns:
+            A BatchRun yielding a BatchResult per item
+        """
+        return BatchRun(self._map(func, items, tenant, priority, ordered, window or self.max_concurrency * 2))
+
+    def _map(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable[Any],
+        tenant: str,
+        priority: Optional[str],
+        ordered: bool,
+        window: int
+    ) -> Iterator[BatchResult]:
+        source = enumerate(items)
+        pending: Dict[int, tuple] = {}
+        finished: Dict[int, BatchResult] = {}
+        done: Deque[int] = deque()
+        ready = threading.Condition()
+        next_index = 0
+
+        def on_done(index: int) -> Callable[[Future], None]:
+            def notify(_: Future) -> None:
+                with ready:
+                    done.append(index)
+                    ready.notify()
+            return notify
+
+        def submit_next() -> bool:
+            try:
+                index, item = next(source)
+            except StopIteration:
+                return False
+            future = self.submit(timed_call, func, item, tenant=tenant, priority=priority)
+            pending[index] = (item, future)
+            future.add_done_callback(on_done(index))
+            return True
+
+        try:
+            while len(pending) < window and submit_next():
+                pass
+
+            while pending:
+                with ready:
+                    while not done:
+                        ready.wait()
+                    index = done.popleft()
+                item, future = pending.pop(index)
+                if future.cancelled():
+                    # e.g. by shutdown(cancel_pending=True)
+                    result, error, elapsed = None, CancelledError(), 0.0
+                else:
+                    result, error, elapsed = future.result()
+                outcome = BatchResult(index, item, result, error, elapsed)
+                submit_next()
+
+                if not ordered:
+                    yield outcome
+                    continue
+
+                finished[index] = outcome
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+        finally:
+            # Consumer stopped early: drop work that has not started
+            for _, future in pending.values():
+                future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and wait statistics.
+
+        Returns:
+            Dict with max_concurrency, running and, under ``classes``, per
+            priority class: queued, running, submitted, completed, wait_p50,
+            wait_p95 and wait_max (seconds, over recent requests) and the
+            queued requests per tenant (cancelled and timed-out requests
+            still in the queue are not counted)
+        """
+        with self._lock:
+            classes = {}
+            for name in self.priority_classes:
+                queue = self._classes[name]
+                waits = sorted(queue.waits)
+                tenants: Dict[str, int] = {}
+                for _, _, ticket in queue.heap:
+                    if not ticket.cancelled:
+                        tenants[ticket.tenant] = tenants.get(ticket.tenant, 0) + 1
+                classes[name] = {
+                    "queued": sum(tenants.values()),
+                    "running": queue.running,
+                    "submitted": queue.submitted,
+                    "completed": queue.completed,
+                    "wait_p50": _percentile(waits, 50),
+                    "wait_p95": _percentile(waits, 95),
+                    "wait_max": waits[-1] if waits else 0.0,
+                    "tenants": tenants,
+                }
+            return {
+                "max_concurrency": self.max_concurrency,
+                "running": self._running,
+                "classes": classes,
+            }
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        """
+        Stop accepting work.
+
+        Args:
+            wait: Wait for running and queued work to finish
+            cancel_pending: Cancel submitted work that has not started
+        """
+        with self._lock:
+            self._closed = True
+            if cancel_pending:
+                for queue in self._classes.values():
+                    for _, _, ticket in queue.heap:
+                        if ticket.task is not None:
+                            ticket.task[4].cancel()
+        if wait:
+            with self._lock:
+                # Queued work is granted as running work finishes, so idle means drained
+                while self._running:
+                    self._idle.wait()
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "WorkflowScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown()
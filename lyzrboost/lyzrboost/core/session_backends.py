@@ -0,0 +1,710 @@
+"""
+Persistent storage backends for agent sessions.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import deque
+from typing import Any, Collection, Deque, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_FLUSH_INTERVAL = 0.05
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_COMPACT_MIN_BYTES = 1024 * 1024
+DEFAULT_COMPACT_RATIO = 2.0
+
+
+class SessionBackend:
+    """
+    Storage interface for AgentManager sessions.
+
+    A backend keeps each session's metadata (agent ID, creation and last
+    access time), the turns currently in its history and the rolling
+    summary of dropped turns. Turns are numbered by ``seq``; appending a
+    turn also records how many of the newest turns the history keeps, so
+    the backend drops the same turns the in-memory history dropped and
+    never needs to call a summarizer itself.
+
+    ``load`` returns a dict with agent_id, created_at, last_access, summary,
+    turns (oldest first) and total_turns.
+
+    Backends may buffer writes; ``flush`` makes them durable and reads
+    always see every earlier write.
+    """
+
+    def save_session(self, session_id: str, agent_id: Optional[str], created_at: float, last_access: float) -> None:
+        """Create a session or replace its metadata."""
+        raise NotImplementedError
+
+    def append_turn(
+        self,
+        session_id: str,
+        seq: int,
+        interaction: Dict[str, Any],
+        keep: int,
+        summary: Optional[str]
+    ) -> None:
+        """Add turn ``seq``, keep only the newest ``keep`` turns and set the summary."""
+        raise NotImplementedError
+
+    def clear_history(self, session_id: str) -> None:
+        """Remove every turn and the summary of a session."""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session; return whether it existed."""
+        raise NotImplementedError
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored session, or None if there is none."""
+        raise NotImplementedError
+
+    def find_by_agent(self, agent_id: str) -> List[str]:
+        """Return the IDs of the sessions of an agent."""
+        raise NotImplementedError
+
+    def purge(
+        self,
+        idle_before: Optional[float] = None,
+        created_before: Optional[float] = None,
+        exclude: Collection[str] = ()
+    ) -> int:
+        """Remove sessions last used before ``idle_before`` or created before ``created_before``."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Write out buffered changes."""
+
+    def close(self) -> None:
+        """Flush and release the backend's resources."""
+        self.flush()
+
+
+class _Flusher:
+    """Background thread calling a function every ``interval`` seconds or when woken."""
+
+    def __init__(self, func: Any, interval: float, name: str):
+        self._func = func
+        self._interval = interval
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            try:
+                self._func()
+            except Exception as e:
+                logger.error("Session backend background flush failed: %s", e)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    In-process session backend.
+
+    Nothing survives a restart, but sessions evicted from AgentManager's
+    hot cache are kept, in compact form, until they are deleted or purged.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._by_agent: Dict[Optional[str], set] = {}
+
+    def save_session(self, session_id: str, agent_id: Optional[str], created_at: float, last_access: float) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = {"turns": deque(), "summary": None, "total_turns": 0}
+                self._sessions[session_id] = session
+            else:
+                self._by_agent.get(session["agent_id"], set()).discard(session_id)
+            session.update(agent_id=agent_id, created_at=created_at, last_access=last_access)
+            self._by_agent.setdefault(agent_id, set()).add(session_id)
+
+    def append_turn(
+        self,
+        session_id: str,
+        seq: int,
+        interaction: Dict[str, Any],
+        keep: int,
+        summary: Optional[str]
+    ) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            turns = session["turns"]
+            turns.append(interaction)
+            while len(turns) > keep:
+                turns.popleft()
+            session["summary"] = summary
+            session["total_turns"] = seq
+            session["last_access"] = interaction.get("timestamp", session["last_access"])
+
+    def clear_history(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session["turns"].clear()
+                session["summary"] = None
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            self._by_agent.get(session["agent_id"], set()).discard(session_id)
+            return True
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            return dict(session, turns=list(session["turns"]))
+
+    def find_by_agent(self, agent_id: str) -> List[str]:
+        with self._lock:
+            return sorted(self._by_agent.get(agent_id, ()))
+
+    def purge(
+        self,
+        idle_before: Optional[float] = None,
+        created_before: Optional[float] = None,
+        exclude: Collection[str] = ()
+    ) -> int:
+        with self._lock:
+            expired = [
+                session_id for session_id, session in self._sessions.items()
+                if session_id not in exclude and (
+                    (idle_before is not None and session["last_access"] < idle_before)
+                    or (created_before is not None and session["created_at"] < created_before)
+                )
+            ]
+        return sum(self.delete(session_id) for session_id in expired)
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Stores sessions in a SQLite database in WAL mode.
+
+    Writes are queued in memory and committed in batches by a background
+    thread every ``flush_interval`` seconds, or sooner once ``batch_size``
+    writes are waiting, so storing a turn costs a list append rather than a
+    transaction. Writes still queued when the process crashes are lost;
+    call ``flush`` where that matters. Sessions are indexed by session ID
+    and agent ID.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            path: Path to the SQLite database file (created if missing)
+            flush_interval: Maximum seconds a write waits before it is committed
+            batch_size: Number of queued writes that triggers an early commit
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: List[Tuple[str, tuple]] = []
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS agent_sessions ("
+            "session_id TEXT PRIMARY KEY, agent_id TEXT, created_at REAL NOT NULL, "
+            "last_access REAL NOT NULL, summary TEXT, total_turns INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS agent_sessions_agent ON agent_sessions (agent_id)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS agent_session_turns ("
+            "session_id TEXT NOT NULL, seq INTEGER NOT NULL, interaction TEXT NOT NULL, "
+            "PRIMARY KEY (session_id, seq)) WITHOUT ROWID"
+        )
+        self._flusher = _Flusher(self.flush, flush_interval, "lyzrboost-session-sqlite")
+
+    def _queue(self, *statements: Tuple[str, tuple]) -> None:
+        with self._pending_lock:
+            self._pending.extend(statements)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._flusher.wake()
+
+    def _transaction(self, statements: List[Tuple[str, tuple]]) -> sqlite3.Cursor:
+        # Callers hold self._lock; returns the cursor of the last statement
+        self._connection.execute("BEGIN")
+        try:
+            for sql, params in statements:
+                cursor = self._connection.execute(sql, params)
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        return cursor
+
+    def flush(self) -> None:
+        # Holding the connection lock while taking the batch keeps batches in order
+        with self._lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            if batch:
+                self._transaction(batch)
+
+    def save_session(self, session_id: str, agent_id: Optional[str], created_at: float, last_access: float) -> None:
+        self._queue((
+            "INSERT INTO agent_sessions (session_id, agent_id, created_at, last_access) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (session_id) DO UPDATE SET agent_id = excluded.agent_id, "
+            "created_at = excluded.created_at, last_access = excluded.last_access",
+            (session_id, agent_id, created_at, last_access)
+        ))
+
+    def append_turn(
+        self,
+        session_id: str,
+        seq: int,
+        interaction: Dict[str, Any],
+        keep: int,
+        summary: Optional[str]
+    ) -> None:
+        encoded = json.dumps(interaction, default=str)
+        self._queue(
+            (
+                "INSERT OR REPLACE INTO agent_session_turns (session_id, seq, interaction) "
+                "SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM agent_sessions WHERE session_id = ?)",
+                (session_id, seq, encoded, session_id)
+            ),
+            (
+                "DELETE FROM agent_session_turns WHERE session_id = ? AND seq <= ?",
+                (session_id, seq - keep)
+            ),
+            (
+                "UPDATE agent_sessions SET summary = ?, total_turns = ?, last_access = ? WHERE session_id = ?",
+                (summary, seq, interaction.get("timestamp", 0.0), session_id)
+            ),
+        )
+
+    def clear_history(self, session_id: str) -> None:
+        self._queue(
+            ("DELETE FROM agent_session_turns WHERE session_id = ?", (session_id,)),
+            ("UPDATE agent_sessions SET summary = NULL WHERE session_id = ?", (session_id,)),
+        )
+
+    def delete(self, session_id: str) -> bool:
+        self.flush()
+        with self._lock:
+            cursor = self._transaction([
+                ("DELETE FROM agent_session_turns WHERE session_id = ?", (session_id,)),
+                ("DELETE FROM agent_sessions WHERE session_id = ?", (session_id,)),
+            ])
+        return cursor.rowcount > 0
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        self.flush()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT agent_id, created_at, last_access, summary, total_turns "
+                "FROM agent_sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            turns = self._connection.execute(
+                "SELECT interaction FROM agent_session_turns WHERE session_id = ? ORDER BY seq",
+                (session_id,)
+            ).fetchall()
+        agent_id, created_at, last_access, summary, total_turns = row
+        return {
+            "agent_id": agent_id,
+            "created_at": created_at,
+            "last_access": last_access,
+            "summary": summary,
+            "turns": [json.loads(turn[0]) for turn in turns],
+            "total_turns": total_turns,
+        }
+
+    def find_by_agent(self, agent_id: str) -> List[str]:
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT session_id FROM agent_sessions WHERE agent_id = ? ORDER BY session_id", (agent_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def purge(
+        self,
+        idle_before: Optional[float] = None,
+        created_before: Optional[float] = None,
+        exclude: Collection[str] = ()
+    ) -> int:
+        if idle_before is None and created_before is None:
+            return 0
+        params = (
+            idle_before if idle_before is not None else float("-inf"),
+            created_before if created_before is not None else float("-inf"),
+        )
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT session_id FROM agent_sessions WHERE last_access < ? OR created_at < ?", params
+            ).fetchall()
+            expired = [row[0] for row in rows if row[0] not in exclude]
+            if expired:
+                self._transaction([
+                    (sql, (session_id,))
+                    for session_id in expired
+                    for sql in (
+                        "DELETE FROM agent_session_turns WHERE session_id = ?",
+                        "DELETE FROM agent_sessions WHERE session_id = ?",
+                    )
+                ])
+        return len(expired)
+
+    def close(self) -> None:
+        """Commit queued writes, stop the flusher and close the database connection."""
+        self._flusher.stop()
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+
+class _LogEntry:
+    """Index entry of one session: metadata plus where its live records are in the log."""
+
+    __slots__ = ("agent_id", "created_at", "last_access", "total_turns", "summary", "session", "summary_record", "turns")
+
+    def __init__(self, agent_id: Optional[str], created_at: float, last_access: float, session: Tuple[int, int]):
+        self.agent_id = agent_id
+        self.created_at = created_at
+        self.last_access = last_access
+        self.total_turns = 0
+        self.summary: Optional[str] = None
+        # (offset, length) of the latest session record
+        self.session = session
+        # (offset, length) of the latest summary record, if any
+        self.summary_record: Optional[Tuple[int, int]] = None
+        # (seq, offset, length) of each kept turn record, oldest first
+        self.turns: Deque[Tuple[int, int, int]] = deque()
+
+    def records(self) -> List[Tuple[int, int]]:
+        """(offset, length) of every live record, in replay order."""
+        records = [self.session]
+        if self.summary_record is not None:
+            records.append(self.summary_record)
+        records.extend((offset, length) for _, offset, length in self.turns)
+        return records
+
+    def live_bytes(self) -> int:
+        return sum(length for _, length in self.records())
+
+
+class LogFileSessionBackend(SessionBackend):
+    """
+    Stores sessions in an append-only log of JSON lines.
+
+    Every change is appended to the log through a write buffer; the rolling
+    summary of a session is written as a record of its own whenever it
+    changes. An in-memory index maps each session ID to the offsets of its
+    live records (and each agent ID to its sessions), so loading a session
+    reads only its own turn records. A background thread flushes the buffer every
+    ``flush_interval`` seconds and compacts the log once it is larger than
+    ``compact_min_bytes`` and ``compact_ratio`` times its live records,
+    rewriting just the live records into a new file that atomically
+    replaces the old one.
+
+    The log must only be written by one process at a time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        fsync: bool = False,
+        compact_min_bytes: int = DEFAULT_COMPACT_MIN_BYTES,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO
+    ):
+        """
+        Initialize the backend, replaying the log to rebuild the index.
+
+        Args:
+            path: Path to the log file (created if missing)
+            flush_interval: Maximum seconds a change waits in the write buffer
+            fsync: Also fsync the log on every flush
+            compact_min_bytes: Log size below which the log is never compacted
+            compact_ratio: Compact once the log is this many times larger than its live records
+        """
+        if compact_ratio <= 1:
+            raise ValueError("compact_ratio must be greater than 1")
+
+        self.path = path
+        self.fsync = fsync
+        self.compact_min_bytes = compact_min_bytes
+        self.compact_ratio = compact_ratio
+        self.compactions = 0
+        self._lock = threading.RLock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+        self._flusher = _Flusher(self._background_flush, flush_interval, "lyzrboost-session-log")
+
+    def _open(self) -> None:
+        self._index: Dict[str, _LogEntry] = {}
+        self._by_agent: Dict[Optional[str], set] = {}
+        self._live_bytes = 0
+        self._size = 0
+        if os.path.exists(self.path):
+            self._replay()
+        self._writer = open(self.path, "ab", buffering=64 * 1024)
+        self._reader = open(self.path, "rb")
+
+    def _replay(self) -> None:
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated record")
+                    record = json.loads(line)
+                except ValueError:
+                    # A record cut short by a crash; later appends start after the last good one
+                    logger.warning("Discarding incomplete record at offset %d of %s", offset, self.path)
+                    break
+                self._apply(record, offset, len(line))
+                offset += len(line)
+        if offset != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        self._size = offset
+
+    def _index_agent(self, session_id: str, agent_id: Optional[str], previous: Optional[_LogEntry]) -> None:
+        if previous is not None:
+            self._by_agent.get(previous.agent_id, set()).discard(session_id)
+        self._by_agent.setdefault(agent_id, set()).add(session_id)
+
+    def _drop(self, session_id: str) -> Optional[_LogEntry]:
+        entry = self._index.pop(session_id, None)
+        if entry is not None:
+            self._live_bytes -= entry.live_bytes()
+            self._by_agent.get(entry.agent_id, set()).discard(session_id)
+        return entry
+
+    def _apply(self, record: Dict[str, Any], offset: int, length: int) -> None:
+        op = record["op"]
+        session_id = record["session_id"]
+        entry = self._index.get(session_id)
+        if op == "session":
+            if entry is None:
+                entry = _LogEntry(record["agent_id"], record["created_at"], record["last_access"], (offset, length))
+                self._index[session_id] = entry
+                self._index_agent(session_id, entry.agent_id, None)
+            else:
+                self._live_bytes -= entry.session[1]
+                self._index_agent(session_id, record["agent_id"], entry)
+                entry.agent_id = record["agent_id"]
+                entry.created_at = record["created_at"]
+                entry.last_access = record["last_access"]
+                entry.session = (offset, length)
+            self._live_bytes += length
+        elif entry is None:
+            return
+        elif op == "turn":
+            seq = record["seq"]
+            entry.turns.append((seq, offset, length))
+            self._live_bytes += length
+            while entry.turns and entry.turns[0][0] <= seq - record["keep"]:
+                self._live_bytes -= entry.turns.popleft()[2]
+            entry.total_turns = seq
+            entry.last_access = record["interaction"].get("timestamp", entry.last_access)
+        elif op == "summary":
+            if entry.summary_record is not None:
+                self._live_bytes -= entry.summary_record[1]
+            entry.summary = record["summary"]
+            entry.summary_record = (offset, length)
+            self._live_bytes += length
+        elif op == "clear":
+            self._live_bytes -= sum(length for _, _, length in entry.turns)
+            entry.turns.clear()
+            if entry.summary_record is not None:
+                self._live_bytes -= entry.summary_record[1]
+            entry.summary = None
+            entry.summary_record = None
+        elif op == "delete":
+            self._drop(session_id)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str).encode("utf-8") + b"\n"
+        with self._lock:
+            offset = self._size
+            self._writer.write(line)
+            self._size += len(line)
+            self._apply(record, offset, len(line))
+
+    def _read(self, offset: int, length: int) -> Dict[str, Any]:
+        self._reader.seek(offset)
+        return json.loads(self._reader.read(length))
+
+    def save_session(self, session_id: str, agent_id: Optional[str], created_at: float, last_access: float) -> None:
+        self._append({
+            "op": "session",
+            "session_id": session_id,
+            "agent_id": agent_id,
+            "created_at": created_at,
+            "last_access": last_access,
+        })
+
+    def append_turn(
+        self,
+        session_id: str,
+        seq: int,
+        interaction: Dict[str, Any],
+        keep: int,
+        summary: Optional[str]
+    ) -> None:
+        with self._lock:
+            entry = self._index.get(session_id)
+            if entry is not None and summary != entry.summary:
+                self._append({"op": "summary", "session_id": session_id, "summary": summary})
+            self._append({
+                "op": "turn",
+                "session_id": session_id,
+                "seq": seq,
+                "interaction": interaction,
+                "keep": keep,
+            })
+
+    def clear_history(self, session_id: str) -> None:
+        self._append({"op": "clear", "session_id": session_id})
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            existed = session_id in self._index
+            if existed:
+                self._append({"op": "delete", "session_id": session_id})
+        return existed
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._index.get(session_id)
+            if entry is None:
+                return None
+            self._writer.flush()
+            turns = [self._read(offset, length) for _, offset, length in entry.turns]
+            return {
+                "agent_id": entry.agent_id,
+                "created_at": entry.created_at,
+                "last_access": entry.last_access,
+                "summary": entry.summary,
+                "turns": [turn["interaction"] for turn in turns],
+                "total_turns": entry.total_turns,
+            }
+
+    def find_by_agent(self, agent_id: str) -> List[str]:
+        with self._lock:
+            return sorted(self._by_agent.get(agent_id, ()))
+
+    def purge(
+        self,
+        idle_before: Optional[float] = None,
+        created_before: Optional[float] = None,
+        exclude: Collection[str] = ()
+    ) -> int:
+        with self._lock:
+            expired = [
+                session_id for session_id, entry in self._index.items()
+                if session_id not in exclude and (
+                    (idle_before is not None and entry.last_access < idle_before)
+                    or (created_before is not None and entry.created_at < created_before)
+                )
+            ]
+            for session_id in expired:
+                self._append({"op": "delete", "session_id": session_id})
+        return len(expired)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._writer.flush()
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+
+    def _background_flush(self) -> None:
+        self.flush()
+        if self._size >= self.compact_min_bytes and self._size > self.compact_ratio * self._live_bytes:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrite the log with only the live records of each session.
+
+        Writers wait while the log is rewritten.
+        """
+        with self._lock:
+            self._writer.flush()
+            before = self._size
+            tmp_path = f"{self.path}.compact"
+            with open(tmp_path, "wb") as out:
+                for entry in self._index.values():
+                    for offset, length in entry.records():
+                        self._reader.seek(offset)
+                        out.write(self._reader.read(length))
+                out.flush()
+                os.fsync(out.fileno())
+            self._writer.close()
+            self._reader.close()
+            os.replace(tmp_path, self.path)
+            self._open()
+            self.compactions += 1
+        logger.info("Compacted session log %s from %d to %d bytes", self.path, before, self._size)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get log statistics.
+
+        Returns:
+            Dict with sessions, log_bytes, live_bytes and compactions
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._index),
+                "log_bytes": self._size,
+                "live_bytes": self._live_bytes,
+                "compactions": self.compactions,
+            }
+
+    def close(self) -> None:
+        """Flush the log, stop the background thread and close the file."""
+        self._flusher.stop()
+        with self._lock:
+            self.flush()
+            self._writer.close()
+            self._reader.close()
@@ -0,0 +1,538 @@
+"""
+Bounded in-memory storage for agent conversation sessions.
+"""
+
+import heapq
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .history import SessionHistory
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_SESSION_SHARDS = 16
+
+# Eviction reasons passed to eviction callbacks
+EVICT_CAPACITY = "capacity"
+EVICT_IDLE = "idle"
+EVICT_EXPIRED = "expired"
+EVICT_DELETED = "deleted"
+
+EvictionCallback = Callable[[str, Dict[str, Any], str], Any]
+
+# Size of an interaction record and its two message strings, without the text
+_INTERACTION_OVERHEAD = (
+    sys.getsizeof({"user_message": "", "agent_response": "", "timestamp": 0.0, "metadata": {}})
+    + 2 * sys.getsizeof("")
+)
+
+
+def estimate_session_size(record: Dict[str, Any]) -> int:
+    """
+    Estimate the memory held by one session record.
+
+    Counts the record and its history plus the text of every stored
+    message; metadata is counted shallowly. A SessionHistory is measured
+    from its running character count without walking its turns.
+
+    Args:
+        record: Session record
+
+    Returns:
+        Approximate size in bytes
+    """
+    history = record.get("history") or []
+    size = sys.getsizeof(record) + sys.getsizeof(history)
+    if isinstance(history, SessionHistory):
+        # One byte per (mostly ASCII) character
+        size += len(history) * _INTERACTION_OVERHEAD + history.chars
+        if history.summary:
+            size += sys.getsizeof(history.summary)
+        return size
+    for interaction in history:
+        size += sys.getsizeof(interaction)
+        for key in ("user_message", "agent_response"):
+            value = interaction.get(key)
+            if isinstance(value, str):
+                size += sys.getsizeof(value)
+    return size
+
+
+class SessionStore:
+    """
+    Session records with a size limit, idle and absolute TTLs and LRU eviction.
+
+    Records are kept in least-recently-used order: reading a session moves
+    it to the back and updates its ``last_access``. When the store is full,
+    the least recently used session is evicted to make room. A session is
+    also evicted once it has not been used for ``idle_ttl`` seconds or is
+    older than ``ttl`` seconds. Expired sessions are removed when they are
+    looked up and, a few at a time, whenever a session is created, so
+    eviction costs no more than the sessions it removes.
+
+    Eviction callbacks receive the session ID, its record and the reason
+    ('capacity', 'idle', 'expired' or 'deleted').
+
+    The store is safe to use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = DEFAULT_MAX_SESSIONS,
+        idle_ttl: Optional[float] = None,
+        ttl: Optional[float] = None,
+        on_evict: Optional[EvictionCallback] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions: Maximum number of sessions kept (None for no limit)
+            idle_ttl: Seconds a session may go unused before it is evicted (None to keep)
+            ttl: Seconds after creation a session is evicted regardless of use (None to keep)
+            on_evict: Optional callback invoked for every evicted session
+            clock: Time source returning seconds since the epoch
+        """
+        if max_sessions is not None and max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.ttl = ttl
+        self.clock = clock
+
+        self._lock = threading.RLock()
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # (expires_at, session_id) for the absolute TTL; stale entries are skipped
+        self._expiry: List[Tuple[float, str]] = []
+        self._callbacks: List[EvictionCallback] = []
+        if on_evict is not None:
+            self._callbacks.append(on_evict)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions: Dict[str, int] = {
+            EVICT_CAPACITY: 0,
+            EVICT_IDLE: 0,
+            EVICT_EXPIRED: 0,
+            EVICT_DELETED: 0,
+        }
+
+    def add_eviction_listener(self, callback: EvictionCallback) -> None:
+        """
+        Register a callback invoked as ``callback(session_id, record, reason)``.
+
+        Args:
+            callback: Function called for every evicted session
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def _expiry_reason(self, record: Dict[str, Any], now: float) -> Optional[str]:
+        if self.ttl is not None and now - record["created_at"] >= self.ttl:
+            return EVICT_EXPIRED
+        if self.idle_ttl is not None and now - record["last_access"] >= self.idle_ttl:
+            return EVICT_IDLE
+        return None
+
+    def _remove_locked(self, session_id: str, reason: str, evicted: List[tuple]) -> Dict[str, Any]:
+        record = self._records.pop(session_id)
+        self.evictions[reason] += 1
+        evicted.append((session_id, record, reason))
+        return record
+
+    def _sweep_locked(self, now: float, evicted: List[tuple]) -> None:
+        # Least recently used first, so idle sessions are at the front
+        if self.idle_ttl is not None:
+            while self._records:
+                session_id, record = next(iter(self._records.items()))
+                reason = self._expiry_reason(record, now)
+                if reason is None:
+                    break
+                self._remove_locked(session_id, reason, evicted)
+        if self.ttl is not None:
+            while self._expiry and self._expiry[0][0] <= now:
+                _, session_id = heapq.heappop(self._expiry)
+                record = self._records.get(session_id)
+                if record is not None and self._expiry_reason(record, now) is not None:
+                    self._remove_locked(session_id, EVICT_EXPIRED, evicted)
+
+    def _notify(self, evicted: List[tuple]) -> None:
+        if not evicted:
+            return
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for session_id, record, reason in evicted:
+            logger.debug("Evicted session %s (%s)", session_id, reason)
+            for callback in callbacks:
+                try:
+                    callback(session_id, record, reason)
+                except Exception as e:
+                    logger.warning("Session eviction callback failed: %s", e)
+
+    def create(self, session_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add a session, evicting expired and least recently used ones as needed.
+
+        ``created_at`` and ``last_access`` of the record are set to now.
+
+        Args:
+            session_id: ID of the new session
+            record: Session record (a dict)
+
+        Returns:
+            The stored record
+        """
+        evicted: List[tuple] = []
+        with self._lock:
+            now = self.clock()
+            record["created_at"] = now
+            record["last_access"] = now
+
+            self._sweep_locked(now, evicted)
+            if session_id in self._records:
+                self._records.pop(session_id)
+            elif self.max_sessions is not None:
+                while len(self._records) >= self.max_sessions:
+                    oldest = next(iter(self._records))
+                    self._remove_locked(oldest, EVICT_CAPACITY, evicted)
+
+            self._records[session_id] = record
+            if self.ttl is not None:
+                heapq.heappush(self._expiry, (now + self.ttl, session_id))
+        self._notify(evicted)
+        return record
+
+    def restore(self, session_id: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add a session loaded from persistent storage, keeping its timestamps.
+
+        If the session is already present, the stored record is kept and
+        returned instead, so concurrent loads of one session agree.
+
+        Args:
+            session_id: ID of the session
+            record: Session record with created_at and last_access
+
+        Returns:
+            The stored record, or None if the loaded session has already expired
+        """
+        evicted: List[tuple] = []
+        with self._lock:
+            now = self.clock()
+            existing = self._records.get(session_id)
+            if existing is not None:
+                existing["last_access"] = now
+                self._records.move_to_end(session_id)
+                return existing
+            if self._expiry_reason(record, now) is not None:
+                return None
+            record["last_access"] = now
+
+            self._sweep_locked(now, evicted)
+            if self.max_sessions is not None:
+                while len(self._records) >= self.max_sessions:
+                    oldest = next(iter(self._records))
+                    self._remove_locked(oldest, EVICT_CAPACITY, evicted)
+            self._records[session_id] = record
+            if self.ttl is not None:
+                heapq.heappush(self._expiry, (record["created_at"] + self.ttl, session_id))
+        self._notify(evicted)
+        return record
+
+    def get(self, session_id: str, touch: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get a session record.
+
+        Args:
+            session_id: ID of the session
+            touch: Mark the session as used (updates last_access and LRU order)
+
+        Returns:
+            The record, or None if the session does not exist or has expired
+        """
+        evicted: List[tuple] = []
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is not None:
+                now = self.clock()
+                reason = self._expiry_reason(record, now)
+                if reason is not None:
+                    self._remove_locked(session_id, reason, evicted)
+                    record = None
+                elif touch:
+                    record["last_access"] = now
+                    self._records.move_to_end(session_id)
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self._notify(evicted)
+        return record
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id, touch=False) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get a snapshot of (session_id, record) pairs, least recently used first."""
+        with self._lock:
+            return list(self._records.items())
+
+    def least_recently_used(self) -> Optional[Tuple[str, float]]:
+        """Get ``(session_id, last_access)`` of the least recently used session, or None if empty."""
+        with self._lock:
+            if not self._records:
+                return None
+            session_id, record = next(iter(self._records.items()))
+            return session_id, record["last_access"]
+
+    def evict(self, session_id: str, reason: str = EVICT_CAPACITY) -> bool:
+        """
+        Evict a session, invoking the eviction callbacks.
+
+        Args:
+            session_id: ID of the session
+            reason: Eviction reason passed to the callbacks
+
+        Returns:
+            Whether the session was present
+        """
+        evicted: List[tuple] = []
+        with self._lock:
+            if session_id in self._records:
+                self._remove_locked(session_id, reason, evicted)
+        self._notify(evicted)
+        return bool(evicted)
+
+    def delete(self, session_id: str) -> Dict[str, Any]:
+        """
+        Remove a session.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The removed record
+
+        Raises:
+            KeyError: If the session does not exist
+        """
+        evicted: List[tuple] = []
+        with self._lock:
+            if session_id not in self._records:
+                raise KeyError(f"Session {session_id} not found")
+            record = self._remove_locked(session_id, EVICT_DELETED, evicted)
+        self._notify(evicted)
+        return record
+
+    def purge_expired(self) -> int:
+        """
+        Evict every expired session now.
+
+        Returns:
+            Number of sessions evicted
+        """
+        evicted: List[tuple] = []
+        with self._lock:
+            self._sweep_locked(self.clock(), evicted)
+        self._notify(evicted)
+        return len(evicted)
+
+    def clear(self) -> None:
+        """Remove every session without invoking eviction callbacks."""
+        with self._lock:
+            self._records.clear()
+            self._expiry.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Computing ``approx_bytes`` visits every session.
+
+        Returns:
+            Dict with sessions, max_sessions, interactions, approx_bytes,
+            hits, misses and evictions per reason
+        """
+        with self._lock:
+            records = list(self._records.values())
+            stats = {
+                "sessions": len(records),
+                "max_sessions": self.max_sessions,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": dict(self.evictions),
+            }
+        stats["interactions"] = sum(len(record.get("history") or ()) for record in records)
+        stats["approx_bytes"] = sum(estimate_session_size(record) for record in records)
+        return stats
+
+
+class ShardedSessionStore:
+    """
+    A SessionStore split into independently locked shards.
+
+    Each session ID is hashed to one of ``shards`` stores, so threads
+    working on different sessions rarely contend for the same lock (lock
+    striping). The interface is that of SessionStore.
+
+    ``max_sessions`` caps the total across shards. When a new session goes
+    over it, the shard fronts are compared and the session with the oldest
+    ``last_access`` is evicted, so capacity eviction stays least recently
+    used overall at a cost of one look per shard.
+    """
+
+    def __init__(
+        self,
+        shards: int = DEFAULT_SESSION_SHARDS,
+        max_sessions: Optional[int] = DEFAULT_MAX_SESSIONS,
+        idle_ttl: Optional[float] = None,
+        ttl: Optional[float] = None,
+        on_evict: Optional[EvictionCallback] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            shards: Number of independently locked shards
+            max_sessions: Maximum number of sessions kept in total (None for no limit)
+            idle_ttl: Seconds a session may go unused before it is evicted (None to keep)
+            ttl: Seconds after creation a session is evicted regardless of use (None to keep)
+            on_evict: Optional callback invoked for every evicted session
+            clock: Time source returning seconds since the epoch
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        if max_sessions is not None and max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.ttl = ttl
+        # The shards are unbounded; the global limit is enforced here
+        self._shards = [
+            SessionStore(max_sessions=None, idle_ttl=idle_ttl, ttl=ttl, on_evict=on_evict, clock=clock)
+            for _ in range(shards)
+        ]
+        self._capacity_lock = threading.Lock()
+
+    def shard_for(self, session_id: str) -> SessionStore:
+        """
+        Get the shard holding a session.
+
+        Args:
+            session_id: ID of the session
+
+        Returns:
+            The SessionStore responsible for the session
+        """
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def add_eviction_listener(self, callback: EvictionCallback) -> None:
+        """
+        Register a callback invoked as ``callback(session_id, record, reason)``.
+
+        Args:
+            callback: Function called for every evicted session
+        """
+        for shard in self._shards:
+            shard.add_eviction_listener(callback)
+
+    def create(self, session_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a session to its shard (see SessionStore.create)."""
+        record = self.shard_for(session_id).create(session_id, record)
+        self._enforce_capacity(session_id)
+        return record
+
+    def restore(self, session_id: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Add a session loaded from persistent storage (see SessionStore.restore)."""
+        record = self.shard_for(session_id).restore(session_id, record)
+        if record is not None:
+            self._enforce_capacity(session_id)
+        return record
+
+    def _enforce_capacity(self, keep: str) -> None:
+        if self.max_sessions is None:
+            return
+        with self._capacity_lock:
+            while len(self) > self.max_sessions:
+                # last_access only grows, so each shard's front is its oldest session
+                oldest = None
+                for shard in self._shards:
+                    front = shard.least_recently_used()
+                    if front is not None and front[0] != keep and (oldest is None or front[1] < oldest[1]):
+                        oldest = (front[0], front[1], shard)
+                if oldest is None:
+                    return
+                oldest[2].evict(oldest[0], EVICT_CAPACITY)
+
+    def get(self, session_id: str, touch: bool = True) -> Optional[Dict[str, Any]]:
+        """Get a session record (see SessionStore.get)."""
+        return self.shard_for(session_id).get(session_id, touch)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.shard_for(session_id)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get a snapshot of (session_id, record) pairs of every shard."""
+        return [item for shard in self._shards for item in shard.items()]
+
+    def delete(self, session_id: str) -> Dict[str, Any]:
+        """Remove a session (see SessionStore.delete)."""
+        return self.shard_for(session_id).delete(session_id)
+
+    def purge_expired(self) -> int:
+        """
+        Evict every expired session now, one shard at a time.
+
+        Returns:
+            Number of sessions evicted
+        """
+        return sum(shard.purge_expired() for shard in self._shards)
+
+    def clear(self) -> None:
+        """Remove every session without invoking eviction callbacks."""
+        for shard in self._shards:
+            shard.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get statistics summed over all shards.
+
+        Returns:
+            Dict with sessions, max_sessions, shards, interactions,
+            approx_bytes, hits, misses and evictions per reason
+        """
+        stats: Dict[str, Any] = {
+            "sessions": 0,
+            "max_sessions": self.max_sessions,
+            "shards": len(self._shards),
+            "hits": 0,
+            "misses": 0,
+            "evictions": {},
+            "interactions": 0,
+            "approx_bytes": 0,
+        }
+        for shard in self._shards:
+            shard_stats = shard.stats()
+            for key in ("sessions", "hits", "misses", "interactions", "approx_bytes"):
+                stats[key] += shard_stats[key]
+            for reason, count in shard_stats["evictions"].items():
+                stats["evictions"][reason] = stats["evictions"].get(reason, 0) + count
+        return stats
@@ -0,0 +1,189 @@
+"""
+Single-flight de-duplication of concurrent identical agent requests.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def make_flight_key(
+    endpoint: str,
+    api_key: Optional[str],
+    payload: Dict[str, Any],
+    timeout: Optional[float] = None
+) -> str:
+    """
+    Build the key identifying identical requests.
+
+    Two requests are identical when they go to the same endpoint with the
+    same API key, exactly the same payload (user, session and message) and
+    the same timeout, so no caller waits on a call with another timeout.
+
+    Args:
+        endpoint: API endpoint URL
+        api_key: API key used for the request
+        payload: JSON payload of the request
+        timeout: Request timeout in seconds
+
+    Returns:
+        Hex digest identifying the request
+    """
+    material = json.dumps(
+        [endpoint, hashlib.sha256((api_key or "").encode("utf-8")).hexdigest(), payload, timeout],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class _FlightStats:
+    """Counters shared by the threaded and asyncio implementations."""
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def _count(self, coalesced: bool) -> None:
+        with self._stats_lock:
+            self.calls += 1
+            if coalesced:
+                self.coalesced += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dict with the number of calls, calls that joined an in-flight
+            request, and upstream requests actually made
+        """
+        with self._stats_lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "upstream": self.calls - self.coalesced,
+            }
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight(_FlightStats):
+    """
+    Coalesces concurrent identical calls made from threads.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive the same result (as a copy) or the
+    same exception. Nothing is cached once the call has finished.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Run ``func`` once for all concurrent callers using ``key``.
+
+        Args:
+            key: Key identifying identical calls
+            func: Zero-argument callable performing the call
+
+        Returns:
+            The result of the shared call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                flight.waiters += 1
+        self._count(coalesced=not leader)
+
+        if not leader:
+            logger.debug("Joining in-flight request %.12s", key)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        result = None
+        try:
+            result = func()
+            return result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                waiters = flight.waiters
+            if waiters and flight.error is None:
+                # Followers copy from a snapshot the leader's caller cannot mutate
+                flight.result = copy.deepcopy(result)
+            flight.done.set()
+
+
+class AsyncSingleFlight(_FlightStats):
+    """
+    Coalesces concurrent identical calls made from asyncio tasks.
+
+    The shared call runs as its own task, so cancelling one waiter does not
+    cancel the request for the others. Each waiter receives its own copy of
+    the result. Use one instance per event loop.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._flights: Dict[str, "asyncio.Future"] = {}
+
+    def _finish(self, key: str, task: "asyncio.Future") -> None:
+        self._flights.pop(key, None)
+        # Mark the exception as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``func()`` once for all concurrent callers using ``key``.
+
+        Args:
+            key: Key identifying identical calls
+            func: Zero-argument callable returning an awaitable for the call
+
+        Returns:
+            The result of the shared call
+        """
+        task = self._flights.get(key)
+        leader = task is None
+        self._count(coalesced=not leader)
+
+        if leader:
+            task = asyncio.ensure_future(func())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            logger.debug("Joining in-flight request %.12s", key)
+
+        result = await asyncio.shield(task)
+        # Every waiter gets its own copy; the order in which they resume is undefined
+        return copy.deepcopy(result)
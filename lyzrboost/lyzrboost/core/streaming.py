@@ -0,0 +1,261 @@
+"""
+Streaming responses from Lyzr agents as an iterator of text chunks.
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+import requests
+
+from .errors import APIError, APITimeoutError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_STREAM_ENDPOINT = "https://agent-prod.studio.lyzr.ai/v3/inference/stream/"
+SSE_DONE = "[DONE]"
+
+# Payload fields that carry the text of a JSON-encoded stream event
+_TEXT_FIELDS = ("content", "response", "text", "delta", "message")
+
+
+def event_text(data: str) -> str:
+    """
+    Extract the text carried by one stream event.
+
+    Events may hold plain text or a JSON object with the text in one of the
+    usual fields (``content``, ``response``, ``text``, ...).
+
+    Args:
+        data: The event's data field
+
+    Returns:
+        Text to append to the response ('' if the event carries none)
+    """
+    try:
+        decoded = json.loads(data)
+    except ValueError:
+        return data
+
+    if isinstance(decoded, str):
+        return decoded
+    if isinstance(decoded, dict):
+        for field in _TEXT_FIELDS:
+            value = decoded.get(field)
+            if isinstance(value, str):
+                return value
+            if isinstance(value, dict):
+                nested = value.get("content") or value.get("response") or value.get("text")
+                if isinstance(nested, str):
+                    return nested
+        return ""
+    # Numbers and other scalars are sent as literal text
+    return data
+
+
+class SSEDecoder:
+    """
+    Incremental Server-Sent Events parser.
+
+    Lines are fed one at a time, so the same parser serves the blocking
+    AgentStream and the asyncio stream of AsyncAgentClient.
+    """
+
+    def __init__(self):
+        self._data_lines: List[str] = []
+        self.done = False
+
+    def feed(self, line: Optional[str]) -> Optional[str]:
+        """
+        Feed one decoded line of the event stream.
+
+        Args:
+            line: The line, without its line terminator
+
+        Returns:
+            The data field of the event the line completes, or None
+        """
+        if line is None or self.done:
+            return None
+        line = line.rstrip("\r")
+
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            # Comment / keep-alive
+            return None
+        if line.startswith("data:"):
+            value = line[5:]
+            self._data_lines.append(value[1:] if value.startswith(" ") else value)
+        return None
+
+    def flush(self) -> Optional[str]:
+        """
+        Get the data of a final event not followed by a blank line.
+
+        Returns:
+            The event data, or None
+        """
+        if self.done:
+            return None
+        return self._dispatch()
+
+    def _dispatch(self) -> Optional[str]:
+        if not self._data_lines:
+            return None
+        data = "\n".join(self._data_lines)
+        self._data_lines = []
+        if data == SSE_DONE:
+            self.done = True
+            return None
+        return data
+
+
+def iter_sse_data(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Parse Server-Sent Events and yield the data of each event.
+
+    Args:
+        lines: Decoded lines of the event stream
+
+    Yields:
+        The (possibly multi-line) data field of each event, stopping at [DONE]
+    """
+    decoder = SSEDecoder()
+    for line in lines:
+        data = decoder.feed(line)
+        if data is not None:
+            yield data
+        if decoder.done:
+            return
+
+    data = decoder.flush()
+    if data is not None:
+        yield data
+
+
+class AgentStream:
+    """
+    Iterator over the text chunks of a streamed agent response.
+
+    Server-Sent Events responses are parsed event by event; any other
+    response is yielded as it arrives over chunked transfer. The received
+    text is accumulated in ``text``.
+
+    Iteration can be stopped from any thread with ``cancel()``, which
+    closes the connection; using the stream as a context manager (or
+    breaking out of a for-loop over it) closes it as well.
+    """
+
+    def __init__(self, response: requests.Response, agent_id: str = "", chunk_size: int = 1024):
+        """
+        Initialize the stream.
+
+        Args:
+            response: An open ``requests`` response created with ``stream=True``
+            agent_id: ID of the agent, used in log messages
+            chunk_size: Read size for non-SSE responses
+        """
+        self.response = response
+        self.agent_id = agent_id
+        self.chunk_size = chunk_size
+        self._parts: List[str] = []
+        self._cancelled = threading.Event()
+        self._iterator: Optional[Iterator[str]] = None
+
+    @property
+    def is_sse(self) -> bool:
+        """True if the server answered with an event stream."""
+        return "text/event-stream" in self.response.headers.get("Content-Type", "")
+
+    @property
+    def cancelled(self) -> bool:
+        """True if cancel() was called."""
+        return self._cancelled.is_set()
+
+    @property
+    def text(self) -> str:
+        """All text received so far."""
+        return "".join(self._parts)
+
+    def _chunks(self) -> Iterator[str]:
+        # requests falls back to ISO-8859-1 for text/* without a charset;
+        # event streams are always UTF-8, other bodies unless they say otherwise
+        content_type = self.response.headers.get("Content-Type", "")
+        if self.is_sse or "charset=" not in content_type.lower():
+            self.response.encoding = "utf-8"
+
+        if self.is_sse:
+            lines = self.response.iter_lines(decode_unicode=True)
+            for data in iter_sse_data(lines):
+                chunk = event_text(data)
+                if chunk:
+                    yield chunk
+        else:
+            for chunk in self.response.iter_content(chunk_size=self.chunk_size, decode_unicode=True):
+                if chunk:
+                    yield chunk
+
+    def _generate(self) -> Iterator[str]:
+        try:
+            for chunk in self._chunks():
+                if self.cancelled:
+                    break
+                self._parts.append(chunk)
+                yield chunk
+            logger.debug("Stream from agent %s finished", self.agent_id)
+        except (requests.exceptions.RequestException, AttributeError, ValueError) as e:
+            # Closing the response from another thread surfaces as a read error
+            if self.cancelled:
+                return
+            logger.error("Streaming from agent %s failed: %s", self.agent_id, e)
+            if isinstance(e, requests.exceptions.Timeout):
+                raise APITimeoutError(f"Stream from Lyzr API timed out: {str(e)}") from e
+            raise APIError(f"Failed to read stream from Lyzr API: {str(e)}") from e
+        finally:
+            self.response.close()
+
+    def __iter__(self) -> Iterator[str]:
+        if self._iterator is None:
+            self._iterator = self._generate()
+        return self._iterator
+
+    def __next__(self) -> str:
+        return next(iter(self))
+
+    def cancel(self) -> None:
+        """
+        Stop the stream and close the connection.
+        """
+        if not self.cancelled:
+            logger.debug("Cancelling stream from agent %s", self.agent_id)
+            self._cancelled.set()
+            self.response.close()
+
+    def close(self) -> None:
+        """Alias for cancel()."""
+        self.cancel()
+
+    def collect(self, on_chunk: Optional[Callable[[str], Any]] = None) -> str:
+        """
+        Consume the rest of the stream and return the full text.
+
+        Args:
+            on_chunk: Optional callback invoked with every chunk as it arrives
+
+        Returns:
+            The complete response text
+        """
+        for chunk in self:
+            if on_chunk is not None:
+                on_chunk(chunk)
+        return self.text
+
+    def __enter__(self) -> "AgentStream":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.cancel()
@@ -2,12 +2,146 @@
 Module for defining and executing workflows with Lyzr agents.
 """
 
+import asyncio
+import contextvars
+import functools
+import inspect
 import logging
-from typing import List, Callable, Dict, Any, Optional, Union
+import time
+import uuid
+from concurrent.futures import Executor
+from typing import List, Callable, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+
+from .checkpoint import CheckpointStore
+from .deadline import deadline_scope, remaining_time
+from .errors import DeadlineExceeded
+from .memo import StepMemo, callable_fingerprint, make_fingerprint
+from .streaming import AgentStream
+from ..utils.concurrency import BatchResult, BatchRun, bounded_map
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def _is_async_callable(func: Any) -> bool:
+    """Check whether calling ``func`` returns a coroutine."""
+    while isinstance(func, functools.partial):
+        func = func.func
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, "__call__", None))
+
+async def _run_in_executor(executor: Optional[Executor], func: Callable, *args: Any) -> Any:
+    """Run a sync callable on an executor, keeping the caller's context."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, functools.partial(context.run, func, *args))
+
+class StepTiming:
+    """
+    Where one step of a workflow run spent its time.
+    
+    Attributes:
+        name: Name of the step
+        status: 'completed', 'memoized', 'skipped', 'failed' or 'cancelled'
+        started: Seconds from the start of the run to the start of the step
+        elapsed: Seconds the step took
+        budget: The step's own timeout, if it has one
+    """
+    
+    __slots__ = ("name", "status", "started", "elapsed", "budget")
+    
+    def __init__(self, name: str, status: str, started: float, elapsed: float, budget: Optional[float] = None):
+        self.name = name
+        self.status = status
+        self.started = started
+        self.elapsed = elapsed
+        self.budget = budget
+        
+    def __repr__(self) -> str:
+        return f"StepTiming(name={self.name!r}, status={self.status!r}, elapsed={self.elapsed:.3f})"
+
+class RunReport:
+    """
+    Timing report of one workflow run.
+    
+    Lists every step that was reached with its status and duration. Time
+    not spent inside steps (checkpointing, memo lookups, conditions) is
+    reported as overhead, so the entries add up to the total.
+    """
+    
+    def __init__(self, workflow: str, deadline: Optional[float] = None):
+        self.workflow = workflow
+        self.deadline = deadline
+        self.steps: List[StepTiming] = []
+        self.error: Optional[BaseException] = None
+        self.elapsed = 0.0
+        self._started = time.perf_counter()
+        
+    def add(self, step: "WorkflowStep", status: str, started: float) -> None:
+        """Record a step that started at perf_counter() value ``started``."""
+        now = time.perf_counter()
+        self.steps.append(StepTiming(step.name, status, started - self._started, now - started, step.timeout))
+        
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Mark the run as finished (with the error that stopped it, if any)."""
+        self.error = error
+        self.elapsed = time.perf_counter() - self._started
+        
+    @property
+    def succeeded(self) -> bool:
+        """True if the run completed without error."""
+        return self.error is None
+        
+    @property
+    def overhead(self) -> float:
+        """Seconds of the run not spent inside steps."""
+        return max(0.0, self.elapsed - sum(timing.elapsed for timing in self.steps))
+        
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the report as plain data.
+        
+        Returns:
+            Dict with the workflow name, deadline, elapsed, overhead, error and steps
+        """
+        return {
+            "workflow": self.workflow,
+            "deadline": self.deadline,
+            "elapsed": self.elapsed,
+            "overhead": self.overhead,
+            "error": str(self.error) if self.error is not None else None,
+            "steps": [
+                {
+                    "name": timing.name,
+                    "status": timing.status,
+                    "started": timing.started,
+                    "elapsed": timing.elapsed,
+                    "budget": timing.budget,
+                }
+                for timing in self.steps
+            ],
+        }
+        
+    def format(self) -> str:
+        """
+        Render the report as a table.
+        
+        Returns:
+            Multi-line text report
+        """
+        outcome = "completed" if self.succeeded else "failed"
+        deadline = f" (deadline {self.deadline:.2f}s)" if self.deadline is not None else ""
+        lines = [f"Workflow '{self.workflow}' {outcome} in {self.elapsed:.2f}s{deadline}"]
+        width = max([len(timing.name) for timing in self.steps] + [len("overhead")])
+        for timing in self.steps:
+            budget = f"  (timeout {timing.budget:.2f}s)" if timing.budget is not None else ""
+            lines.append(
+                f"  {timing.name:<{width}}  {timing.status:<9}  "
+                f"+{timing.started:7.2f}s  {timing.elapsed:7.2f}s{budget}"
+            )
+        lines.append(f"  {'overhead':<{width}}  {'':<9}  {'':9}  {self.overhead:7.2f}s")
+        if self.error is not None:
+            lines.append(f"  error: {self.error}")
+        return "\n".join(lines)
+
 class WorkflowStep:
     """
     Represents a single step in a workflow.
@@ -21,7 +155,12 @@ class WorkflowStep:
         func: Callable,
         name: Optional[str] = None,
         description: Optional[str] = None,
-        condition: Optional[Callable[[Any], bool]] = None
+        condition: Optional[Callable[[Any], bool]] = None,
+        on_chunk: Optional[Callable[[str], Any]] = None,
+        fingerprint: Optional[str] = None,
+        memoize: bool = True,
+        timeout: Optional[float] = None,
+        min_time: Optional[float] = None
     ):
         """
         Initialize a workflow step.
@@ -31,11 +170,36 @@ class WorkflowStep:
             name: Optional name for the step (defaults to function name)
             description: Optional description of the step
             condition: Optional function that determines if this step should execute
+            on_chunk: Optional callback receiving each text chunk when the step
+                      function returns a streamed agent response
+            fingerprint: Optional identity of what the step computes, used by
+                         workflow memoization (derived from func if not given)
+            memoize: Whether a workflow memo may reuse this step's outputs
+            timeout: Optional time budget in seconds for the step; agent calls
+                     made by the step never wait longer than what is left of it
+            min_time: Optional minimum number of seconds the step needs; under a
+                      workflow deadline it is cancelled up front if less is left
         """
         self.func = func
         self.name = name or func.__name__
         self.description = description
         self.condition = condition
+        self.on_chunk = on_chunk
+        self.fingerprint = fingerprint
+        self.memoize = memoize
+        self.timeout = timeout
+        self.min_time = min_time
+        
+    def get_fingerprint(self) -> str:
+        """
+        Get the fingerprint identifying what this step computes.
+        
+        Returns:
+            The explicit fingerprint, or one derived from the step function
+        """
+        if self.fingerprint is None:
+            self.fingerprint = callable_fingerprint(self.func)
+        return self.fingerprint
         
     def should_execute(self, input_data: Any) -> bool:
         """
@@ -55,14 +219,75 @@ class WorkflowStep:
         """
         Execute this workflow step.
         
+        If the step function returns an AgentStream (see stream_agent_response),
+        the stream is consumed here, passing each chunk to ``on_chunk``, and
+        the full text becomes the step's output.
+        
+        Args:
+            input_data: The input data for this step
+            
+        Returns:
+            The result of executing the step function
+        """
+        logger.debug("Executing workflow step: %s", self.name)
+        result = self.func(input_data)
+        if isinstance(result, AgentStream):
+            return result.collect(self.on_chunk)
+        return result
+        
+    async def ashould_execute(self, input_data: Any) -> bool:
+        """
+        Async version of should_execute that also accepts coroutine conditions.
+        
+        Args:
+            input_data: The input data to check against the condition
+            
+        Returns:
+            True if the step should execute, False otherwise
+        """
+        if self.condition is None:
+            return True
+        result = self.condition(input_data)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+        
+    async def aexecute(self, input_data: Any, executor: Optional[Executor] = None) -> Any:
+        """
+        Execute this workflow step without blocking the event loop.
+        
+        Coroutine functions are awaited directly. Plain callables run through
+        execute() on the loop's default executor, so blocking agent calls and
+        streamed responses are handled there.
+        
         Args:
             input_data: The input data for this step
+            executor: Executor for sync callables (defaults to the loop's executor)
             
         Returns:
             The result of executing the step function
         """
-        logger.debug(f"Executing workflow step: {self.name}")
-        return self.func(input_data)
+        if not _is_async_callable(self.func):
+            result = await _run_in_executor(executor, self.execute, input_data)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        
+        logger.debug("Executing workflow step: %s", self.name)
+        result = await self.func(input_data)
+        if isinstance(result, AgentStream):
+            return await _run_in_executor(executor, result.collect, self.on_chunk)
+        return result
+
+class MissingInputError(ValueError):
+    """Exception raised when a run is started without an input the workflow declares."""
+    
+    def __init__(self, workflow: str, missing: List[str]):
+        super().__init__(
+            f"Workflow '{workflow}' is missing required input(s): {', '.join(missing)}"
+        )
+        self.workflow = workflow
+        self.missing = missing
 
 class Workflow:
     """
@@ -70,13 +295,24 @@ class Workflow:
     
     A workflow consists of multiple steps, where the output of one step becomes
     the input to the next step.
+    
+    With a checkpoint store, the data passed between steps is saved after
+    every step under a run ID, and a failed run can continue with resume()
+    from the step that failed instead of starting over.
+    
+    A run can be given a deadline that is passed down to every step, so the
+    whole run, not each step separately, stays within its time budget.
     """
     
     def __init__(
         self,
         steps: List[Union[Callable, WorkflowStep]],
         name: str = "workflow",
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        memo: Optional[StepMemo] = None,
+        deadline: Optional[float] = None,
+        inputs: Optional[List[str]] = None
     ):
         """
         Initialize a workflow.
@@ -85,9 +321,23 @@ class Workflow:
             steps: List of functions or WorkflowStep objects to execute
             name: Name of the workflow
             description: Optional description of the workflow
+            checkpoint_store: Optional store for checkpoints (data passed between
+                              steps must then be JSON-serializable)
+            memo: Optional memo reusing the outputs of steps whose fingerprint
+                  and input are unchanged since an earlier run
+            deadline: Optional default number of seconds a run may take
+            inputs: Names of values the initial input must provide; run() and
+                    arun() check them before the first step (a non-dict input
+                    only provides "input")
         """
         self.name = name
         self.description = description
+        self.checkpoint_store = checkpoint_store
+        self.memo = memo
+        self.deadline = deadline
+        self.inputs = list(inputs or [])
+        self.last_run_id: Optional[str] = None
+        self.last_report: Optional[RunReport] = None
         
         # Convert any function steps to WorkflowStep objects
         self.steps = []
@@ -99,45 +349,644 @@ class Workflow:
             else:
                 raise TypeError(f"Step must be callable or WorkflowStep, got {type(step)}")
                 
-        logger.debug(f"Initialized workflow '{name}' with {len(self.steps)} steps")
+        logger.debug("Initialized workflow '%s' with %d steps", name, len(self.steps))
+        
+    def _save_checkpoint(self, run_id: Optional[str], next_step: int, data: Any) -> None:
+        if run_id is None:
+            return
+        self.checkpoint_store.save(run_id, {
+            "workflow": self.name,
+            "steps": [step.name for step in self.steps],
+            "next_step": next_step,
+            "data": data,
+            "completed": next_step >= len(self.steps),
+        })
+        
+    def _check_inputs(self, initial_input: Any) -> None:
+        provided = initial_input if isinstance(initial_input, dict) else {"input": initial_input}
+        missing = [name for name in self.inputs if name not in provided]
+        if missing:
+            raise MissingInputError(self.name, missing)
+            
+    def _start_run(self, run_id: Optional[str]) -> Optional[str]:
+        # Returns the run ID under which checkpoints are saved (None without a store)
+        if self.checkpoint_store is None:
+            if run_id is not None:
+                raise ValueError("run_id requires a workflow with a checkpoint_store")
+            return None
+        run_id = run_id or uuid.uuid4().hex
+        logger.debug("Checkpointing workflow '%s' as run %s", self.name, run_id)
+        return run_id
+        
+    def _load_checkpoint(self, run_id: str) -> Dict[str, Any]:
+        if self.checkpoint_store is None:
+            raise ValueError("resume requires a workflow with a checkpoint_store")
+        checkpoint = self.checkpoint_store.load(run_id)
+        if checkpoint is None:
+            raise KeyError(f"No checkpoint found for run '{run_id}'")
+        steps = [step.name for step in self.steps]
+        if checkpoint.get("workflow") != self.name or checkpoint.get("steps") != steps:
+            raise ValueError(
+                f"Checkpoint of run '{run_id}' was saved by a different workflow "
+                f"('{checkpoint.get('workflow')}' with steps {checkpoint.get('steps')})"
+            )
+        self.last_run_id = run_id
+        logger.info(
+            "Resuming workflow '%s' run %s at step %d of %d",
+            self.name, run_id, checkpoint["next_step"] + 1, len(self.steps)
+        )
+        return checkpoint
+        
+    def _memo_key(self, step: WorkflowStep, input_data: Any) -> Optional[str]:
+        if self.memo is None or not step.memoize:
+            return None
+        return self.memo.key_for(step.get_fingerprint(), input_data)
+        
+    def _execute_step(self, step: WorkflowStep, input_data: Any) -> Tuple[Any, bool]:
+        # Returns the output and whether it came from the memo
+        key = self._memo_key(step, input_data)
+        if key is not None:
+            found, output = self.memo.lookup(key)
+            if found:
+                logger.debug("Step '%s' unchanged; reusing memoized output", step.name)
+                return output, True
+        output = step.execute(input_data)
+        if key is not None:
+            self.memo.store(key, output)
+        return output, False
+        
+    async def _aexecute_step(
+        self,
+        step: WorkflowStep,
+        input_data: Any,
+        executor: Optional[Executor]
+    ) -> Tuple[Any, bool]:
+        key = self._memo_key(step, input_data)
+        if key is not None:
+            found, output = await _run_in_executor(executor, self.memo.lookup, key)
+            if found:
+                logger.debug("Step '%s' unchanged; reusing memoized output", step.name)
+                return output, True
+        output = await step.aexecute(input_data, executor)
+        if key is not None:
+            await _run_in_executor(executor, self.memo.store, key, output)
+        return output, False
+        
+    def _check_budget(self, step: WorkflowStep) -> None:
+        # Cancel a step up front when the time left cannot cover it
+        remaining = remaining_time()
+        if remaining is None:
+            return
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Step '{step.name}' cancelled: the workflow deadline has passed")
+        if step.min_time is not None and remaining < step.min_time:
+            raise DeadlineExceeded(
+                f"Step '{step.name}' cancelled: it needs at least {step.min_time:.2f}s "
+                f"but only {remaining:.2f}s remain before the workflow deadline"
+            )
+            
+    def _run_steps(
+        self,
+        current_data: Any,
+        start: int,
+        run_id: Optional[str],
+        deadline: Optional[float],
+        report: RunReport
+    ) -> Any:
+        with deadline_scope(deadline):
+            for index in range(start, len(self.steps)):
+                step = self.steps[index]
+                started = time.perf_counter()
+                try:
+                    should_execute = step.should_execute(current_data)
+                except Exception as e:
+                    report.add(step, "failed", started)
+                    report.finish(e)
+                    logger.error("Error in condition of workflow step '%s': %s", step.name, e)
+                    raise
+                if should_execute:
+                    try:
+                        self._check_budget(step)
+                    except DeadlineExceeded as e:
+                        report.add(step, "cancelled", started)
+                        report.finish(e)
+                        logger.error("%s", e)
+                        raise
+                    try:
+                        with deadline_scope(step.timeout):
+                            current_data, memoized = self._execute_step(step, current_data)
+                        report.add(step, "memoized" if memoized else "completed", started)
+                        logger.debug("Step '%s' completed successfully", step.name)
+                    except Exception as e:
+                        report.add(step, "failed", started)
+                        report.finish(e)
+                        logger.error("Error in workflow step '%s': %s", step.name, e)
+                        raise
+                else:
+                    report.add(step, "skipped", started)
+                    logger.debug("Skipping step '%s' (condition not met)", step.name)
+                self._save_checkpoint(run_id, index + 1, current_data)
+                
+        report.finish()
+        logger.info("Workflow '%s' completed", self.name)
+        return current_data
     
-    def run(self, initial_input: Any) -> Any:
+    def run(
+        self,
+        initial_input: Any,
+        run_id: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> Any:
         """
         Run the entire workflow.
         
+        Under a deadline, every agent call made by a step uses at most the
+        time left (see lyzrboost.core.deadline), a step with ``timeout`` gets
+        at most that long, and a step with ``min_time`` is cancelled before
+        it starts if less time than that is left. The timings of the run are
+        available afterwards in ``last_report``.
+        
         Args:
             initial_input: The initial input to the first step of the workflow
+            run_id: ID to checkpoint the run under (generated if not given; only
+                    used with a checkpoint store, see ``last_run_id``)
+            deadline: Seconds the whole run may take (defaults to the workflow's deadline)
+            
+        Returns:
+            The output from the final step in the workflow
+            
+        Raises:
+            MissingInputError: If the input lacks a name listed in ``inputs``
+            DeadlineExceeded: If a step was cancelled or a call ran out of time
+        """
+        self._check_inputs(initial_input)
+        logger.info("Starting workflow: %s", self.name)
+        
+        run_id = self._start_run(run_id)
+        if run_id is not None:
+            self.last_run_id = run_id
+        self._save_checkpoint(run_id, 0, initial_input)
+        deadline = self._deadline(deadline)
+        self.last_report = RunReport(self.name, deadline)
+        return self._run_steps(initial_input, 0, run_id, deadline, self.last_report)
+        
+    def resume(self, run_id: str, deadline: Optional[float] = None) -> Any:
+        """
+        Continue a checkpointed run from the first step that did not complete.
+        
+        Steps that completed are not run again. Resuming a run that already
+        completed returns its final output.
+        
+        Args:
+            run_id: ID of the run to resume
+            deadline: Seconds the remaining steps may take (defaults to the workflow's deadline)
             
         Returns:
             The output from the final step in the workflow
+            
+        Raises:
+            KeyError: If there is no checkpoint for the run
+            ValueError: If the checkpoint was saved by a different workflow
         """
-        logger.info(f"Starting workflow: {self.name}")
+        checkpoint = self._load_checkpoint(run_id)
+        deadline = self._deadline(deadline)
+        self.last_report = RunReport(self.name, deadline)
+        return self._run_steps(checkpoint["data"], checkpoint["next_step"], run_id, deadline, self.last_report)
         
-        current_data = initial_input
+    def _deadline(self, deadline: Optional[float]) -> Optional[float]:
+        return deadline if deadline is not None else self.deadline
         
-        for step in self.steps:
-            if step.should_execute(current_data):
+    async def _arun_steps(
+        self,
+        current_data: Any,
+        start: int,
+        run_id: Optional[str],
+        executor: Optional[Executor],
+        deadline: Optional[float],
+        report: RunReport
+    ) -> Any:
+        with deadline_scope(deadline):
+            for index in range(start, len(self.steps)):
+                step = self.steps[index]
+                started = time.perf_counter()
                 try:
-                    current_data = step.execute(current_data)
-                    logger.debug(f"Step '{step.name}' completed successfully")
+                    should_execute = await step.ashould_execute(current_data)
                 except Exception as e:
-                    logger.error(f"Error in workflow step '{step.name}': {str(e)}")
+                    report.add(step, "failed", started)
+                    report.finish(e)
+                    logger.error("Error in condition of workflow step '%s': %s", step.name, e)
                     raise
+                if should_execute:
+                    try:
+                        self._check_budget(step)
+                    except DeadlineExceeded as e:
+                        report.add(step, "cancelled", started)
+                        report.finish(e)
+                        logger.error("%s", e)
+                        raise
+                    try:
+                        with deadline_scope(step.timeout) as step_deadline:
+                            execution = self._aexecute_step(step, current_data, executor)
+                            if step_deadline is None:
+                                current_data, memoized = await execution
+                            else:
+                                # Unlike a thread, a coroutine step can be stopped when time runs out
+                                try:
+                                    current_data, memoized = await asyncio.wait_for(
+                                        execution, step_deadline.remaining()
+                                    )
+                                except asyncio.TimeoutError as e:
+                                    raise DeadlineExceeded(
+                                        f"Step '{step.name}' did not finish before its deadline"
+                                    ) from e
+                        report.add(step, "memoized" if memoized else "completed", started)
+                        logger.debug("Step '%s' completed successfully", step.name)
+                    except Exception as e:
+                        report.add(step, "failed", started)
+                        report.finish(e)
+                        logger.error("Error in workflow step '%s': %s", step.name, e)
+                        raise
+                else:
+                    report.add(step, "skipped", started)
+                    logger.debug("Skipping step '%s' (condition not met)", step.name)
+                if run_id is not None:
+                    await _run_in_executor(executor, self._save_checkpoint, run_id, index + 1, current_data)
+                    
+        report.finish()
+        logger.info("Workflow '%s' completed", self.name)
+        return current_data
+        
+    async def arun(
+        self,
+        initial_input: Any,
+        executor: Optional[Executor] = None,
+        run_id: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> Any:
+        """
+        Run the entire workflow on the running event loop.
+        
+        Steps still run one after another, but coroutine steps are awaited and
+        sync steps run in an executor, so many workflows can run concurrently
+        on one loop. Conditions may be plain functions or coroutines. Deadlines
+        work as in run(); in addition, a step that overruns its time is cancelled.
+        
+        Args:
+            initial_input: The initial input to the first step of the workflow
+            executor: Executor for sync steps (defaults to the loop's executor,
+                      whose size caps how many sync steps run at once)
+            run_id: ID to checkpoint the run under (see run)
+            deadline: Seconds the whole run may take (defaults to the workflow's deadline)
+            
+        Returns:
+            The output from the final step in the workflow
+            
+        Raises:
+            MissingInputError: If the input lacks a name listed in ``inputs``
+        """
+        self._check_inputs(initial_input)
+        logger.info("Starting workflow: %s", self.name)
+        
+        run_id = self._start_run(run_id)
+        if run_id is not None:
+            self.last_run_id = run_id
+            await _run_in_executor(executor, self._save_checkpoint, run_id, 0, initial_input)
+        deadline = self._deadline(deadline)
+        self.last_report = RunReport(self.name, deadline)
+        return await self._arun_steps(initial_input, 0, run_id, executor, deadline, self.last_report)
+        
+    async def aresume(
+        self,
+        run_id: str,
+        executor: Optional[Executor] = None,
+        deadline: Optional[float] = None
+    ) -> Any:
+        """
+        Async version of resume.
+        
+        Args:
+            run_id: ID of the run to resume
+            executor: Executor for sync steps (defaults to the loop's executor)
+            deadline: Seconds the remaining steps may take (defaults to the workflow's deadline)
+            
+        Returns:
+            The output from the final step in the workflow
+        """
+        checkpoint = await _run_in_executor(executor, self._load_checkpoint, run_id)
+        deadline = self._deadline(deadline)
+        self.last_report = RunReport(self.name, deadline)
+        return await self._arun_steps(
+            checkpoint["data"], checkpoint["next_step"], run_id, executor, deadline, self.last_report
+        )
+        
+    def _run_detached(
+        self,
+        initial_input: Any,
+        deadline: Optional[float],
+        register: Optional[Callable[[Any, Optional[str]], None]] = None
+    ) -> Any:
+        # A run that leaves last_report and last_run_id alone, for runs that overlap;
+        # register receives its report and run ID before the run can fail
+        self._check_inputs(initial_input)
+        run_id = self._start_run(None)
+        self._save_checkpoint(run_id, 0, initial_input)
+        report = RunReport(self.name, deadline)
+        if register is not None:
+            register(report, run_id)
+        return self._run_steps(initial_input, 0, run_id, deadline, report)
+        
+    async def _arun_detached(
+        self,
+        initial_input: Any,
+        executor: Optional[Executor],
+        deadline: Optional[float],
+        register: Optional[Callable[[Any, Optional[str]], None]] = None
+    ) -> Any:
+        # Async version of _run_detached
+        self._check_inputs(initial_input)
+        run_id = self._start_run(None)
+        if run_id is not None:
+            await _run_in_executor(executor, self._save_checkpoint, run_id, 0, initial_input)
+        report = RunReport(self.name, deadline)
+        if register is not None:
+            register(report, run_id)
+        return await self._arun_steps(initial_input, 0, run_id, executor, deadline, report)
+        
+    def run_many(self, inputs: Iterable[Any], max_workers: int = 8, ordered: bool = True) -> BatchRun:
+        """
+        Run the workflow over many inputs on a bounded pool of worker threads.
+        
+        Each worker runs the whole workflow for one input, so different inputs
+        are at different steps at the same time (step 1 of one input overlaps
+        step 2 of the previous one). Inputs are pulled lazily and failures are
+        reported per input instead of stopping the batch.
+        
+        Each result carries the ``report`` and ``run_id`` of its own run;
+        ``last_report`` and ``last_run_id`` are not updated, since the runs
+        overlap.
+        
+        Args:
+            inputs: Iterable of initial inputs
+            max_workers: Maximum number of inputs in flight at once
+            ordered: Yield results in input order (True) or as they complete (False)
+            
+        Returns:
+            A BatchRun yielding a BatchResult per input, whose ``stats`` report
+            successes, failures and throughput
+        """
+        logger.info("Starting batch run of workflow '%s' with %d workers", self.name, max_workers)
+        deadline = self._deadline(None)
+        # Keyed by input index; a run registers its report before it can fail
+        runs: Dict[int, Tuple[RunReport, Optional[str]]] = {}
+        
+        def run_one(entry: Tuple[int, Any]) -> Any:
+            index, item = entry
+            
+            def register(report: Any, run_id: Optional[str]) -> None:
+                runs[index] = (report, run_id)
+                
+            return self._run_detached(item, deadline, register)
+            
+        def results(mapped: Iterator[BatchResult]) -> Iterator[BatchResult]:
+            try:
+                for outcome in mapped:
+                    outcome.item = outcome.item[1]
+                    outcome.report, outcome.run_id = runs.pop(outcome.index, (None, None))
+                    yield outcome
+            finally:
+                mapped.close()
+                
+        mapped = bounded_map(run_one, enumerate(inputs), max_workers=max_workers, ordered=ordered)
+        return BatchRun(results(mapped))
+
+# Partial-failure policies for MapStep
+MAP_ERROR_POLICIES = ("fail_fast", "skip", "collect")
+
+class MapItemError(Exception):
+    """
+    Failure of one item in a MapStep run with ``on_error="collect"``.
+    
+    It takes the place of the item's result in the gathered list.
+    
+    Attributes:
+        index: Position of the item in the mapped list
+        item: The input item
+        error: The exception raised while processing the item
+    """
+    
+    def __init__(self, index: int, item: Any, error: BaseException):
+        super().__init__(f"Item {index} failed: {error}")
+        self.index = index
+        self.item = item
+        self.error = error
+
+class MapStep(WorkflowStep):
+    """
+    Runs a sub-step or sub-workflow once per item of a list, concurrently.
+    
+    The list is taken from the step input (or extracted from it with
+    ``items``), each item is processed with at most ``max_concurrency``
+    running at once, and the results are gathered in input order before
+    being passed to ``reducer``. Items run a sub-workflow concurrently, so
+    they do not update its ``last_report`` or ``last_run_id``.
+    """
+    
+    def __init__(
+        self,
+        step: Union[Callable, WorkflowStep, Workflow],
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        condition: Optional[Callable[[Any], bool]] = None,
+        items: Optional[Callable[[Any], Iterable[Any]]] = None,
+        max_concurrency: int = 8,
+        reducer: Optional[Callable[[List[Any]], Any]] = None,
+        on_error: str = "fail_fast"
+    ):
+        """
+        Initialize a map step.
+        
+        Args:
+            step: Function, WorkflowStep or Workflow applied to each item
+            name: Optional name for the step (defaults to the sub-step's name)
+            description: Optional description of the step
+            condition: Optional function that determines if this step should execute
+            items: Optional function extracting the list of items from the step input
+                   (defaults to using the input itself)
+            max_concurrency: Maximum number of items processed at once
+            reducer: Optional function combining the gathered results into the
+                     step output (defaults to returning the list of results)
+            on_error: What to do when an item fails: 'fail_fast' raises the first
+                      error and cancels queued items, 'skip' drops failed items,
+                      'collect' puts a MapItemError in place of their result
+        """
+        if on_error not in MAP_ERROR_POLICIES:
+            raise ValueError(f"on_error must be one of {', '.join(MAP_ERROR_POLICIES)}")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+            
+        if isinstance(step, (Workflow, WorkflowStep)):
+            self.step = step
+        elif callable(step):
+            self.step = WorkflowStep(step)
+        else:
+            raise TypeError(f"Step must be callable, WorkflowStep or Workflow, got {type(step)}")
+            
+        super().__init__(
+            self.apply,
+            name=name or f"map_{self.step.name}",
+            description=description,
+            condition=condition
+        )
+        self.items = items
+        self.max_concurrency = max_concurrency
+        self.reducer = reducer
+        self.on_error = on_error
+        
+    def apply(self, item: Any) -> Any:
+        """
+        Process a single item with the sub-step or sub-workflow.
+        
+        Args:
+            item: The item to process
+            
+        Returns:
+            The result for the item (the item itself if the sub-step's condition is not met)
+        """
+        if isinstance(self.step, Workflow):
+            return self.step._run_detached(item, self.step._deadline(None))
+        if not self.step.should_execute(item):
+            return item
+        return self.step.execute(item)
+        
+    async def aapply(self, item: Any, executor: Optional[Executor] = None) -> Any:
+        """
+        Async version of apply.
+        
+        Args:
+            item: The item to process
+            executor: Executor for sync callables (defaults to the loop's executor)
+            
+        Returns:
+            The result for the item
+        """
+        if isinstance(self.step, Workflow):
+            return await self.step._arun_detached(item, executor, self.step._deadline(None))
+        if not await self.step.ashould_execute(item):
+            return item
+        return await self.step.aexecute(item, executor)
+        
+    def get_fingerprint(self) -> str:
+        """
+        Get the fingerprint of this step, covering the sub-step or sub-workflow.
+        
+        Returns:
+            The explicit fingerprint, or one derived from the mapped step(s) and hooks
+        """
+        if self.fingerprint is None:
+            if isinstance(self.step, Workflow):
+                mapped = [step.get_fingerprint() for step in self.step.steps]
+            else:
+                mapped = self.step.get_fingerprint()
+            hooks = [callable_fingerprint(hook) if hook is not None else None for hook in (self.items, self.reducer)]
+            self.fingerprint = make_fingerprint("map", mapped, hooks, self.on_error)
+        return self.fingerprint
+        
+    def _items(self, input_data: Any) -> List[Any]:
+        return list(self.items(input_data) if self.items is not None else input_data)
+        
+    def _gather(self, items: List[Any], outcomes: Dict[int, Any]) -> Any:
+        # outcomes maps each index to its result or exception
+        results = []
+        for index, item in enumerate(items):
+            outcome = outcomes[index]
+            if not isinstance(outcome, Exception):
+                results.append(outcome)
+            elif self.on_error == "collect":
+                results.append(MapItemError(index, item, outcome))
             else:
-                logger.debug(f"Skipping step '{step.name}' (condition not met)")
+                logger.warning("Step '%s' skipped item %d: %s", self.name, index, outcome)
+        if self.reducer is not None:
+            return self.reducer(results)
+        return results
+        
+    def execute(self, input_data: Any) -> Any:
+        """
+        Process every item on a thread pool and gather the results in order.
+        
+        Args:
+            input_data: The step input (or the value ``items`` extracts the list from)
+            
+        Returns:
+            The gathered results, or the reducer's output
+            
+        Raises:
+            Exception: The first item error when ``on_error`` is 'fail_fast'
+        """
+        items = self._items(input_data)
+        logger.debug("Mapping step '%s' over %d items", self.name, len(items))
+        
+        outcomes = {}
+        # Unordered so a failure is seen as soon as it happens; order is restored in _gather
+        results = bounded_map(self.apply, items, max_workers=self.max_concurrency, ordered=False)
+        try:
+            for outcome in results:
+                if not outcome.ok and self.on_error == "fail_fast":
+                    raise outcome.error
+                outcomes[outcome.index] = outcome.result if outcome.ok else outcome.error
+        finally:
+            # Cancels items that have not started yet
+            results.close()
+            
+        return self._gather(items, outcomes)
+        
+    async def aexecute(self, input_data: Any, executor: Optional[Executor] = None) -> Any:
+        """
+        Process every item concurrently on the event loop and gather the results in order.
+        
+        Args:
+            input_data: The step input (or the value ``items`` extracts the list from)
+            executor: Executor for sync callables (defaults to the loop's executor)
+            
+        Returns:
+            The gathered results, or the reducer's output
+            
+        Raises:
+            Exception: The first item error when ``on_error`` is 'fail_fast'
+        """
+        items = self._items(input_data)
+        logger.debug("Mapping step '%s' over %d items", self.name, len(items))
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_item(item: Any) -> Any:
+            async with semaphore:
+                return await self.aapply(item, executor)
                 
-        logger.info(f"Workflow '{self.name}' completed")
-        return current_data
+        tasks = [asyncio.ensure_future(run_item(item)) for item in items]
+        try:
+            gathered = await asyncio.gather(*tasks, return_exceptions=self.on_error != "fail_fast")
+        finally:
+            # After a fail-fast error the other items are still running
+            for task in tasks:
+                task.cancel()
+                
+        for outcome in gathered:
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+        return self._gather(items, dict(enumerate(gathered)))
 
-def create_workflow_from_config(config: Dict[str, Any]) -> Workflow:
+def create_workflow_from_config(config: Dict[str, Any], **kwargs) -> Workflow:
     """
     Create a workflow from a configuration dictionary.
     
-    This is a placeholder for a more sophisticated workflow builder
-    that would allow defining workflows from JSON/YAML configurations.
+    Each configured step becomes an agent call whose prompt template is
+    parsed and checked when the workflow is created (see
+    lyzrboost.core.compiler.compile_workflow).
     
     Args:
         config: A dictionary containing workflow configuration
+        **kwargs: Options passed to compile_workflow (client, user_id, memo,
+                  checkpoint_store)
         
     Returns:
         A Workflow object
@@ -145,16 +994,7 @@ def create_workflow_from_config(config: Dict[str, Any]) -> Workflow:
     Raises:
         ValueError: If the configuration is invalid
     """
-    # This is a basic implementation - would need to be expanded
-    # to support more complex workflow definitions
-    
-    if "steps" not in config:
-        raise ValueError("Workflow configuration must contain 'steps' key")
-        
-    # This is a placeholder - in a real implementation, we'd parse the
-    # step definitions and create actual callable steps
-    
-    name = config.get("name", "workflow")
-    description = config.get("description")
+    # Imported here because the compiler builds on this module
+    from .compiler import compile_workflow
     
-    return Workflow([], name=name, description=description) 
\ No newline at end of file
+    return compile_workflow(config, **kwargs)
@@ -0,0 +1,232 @@
+"""
+Concurrency helpers for running many independent tasks on a bounded pool.
+"""
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class BatchResult:
+    """
+    Outcome of one item in a batch run.
+
+    Attributes:
+        index: Position of the item in the input iterable
+        item: The input item
+        result: Return value of the task (None if it failed)
+        error: Exception raised by the task (None if it succeeded)
+        elapsed: Seconds spent running the task
+        report: RunReport of the item's workflow run (set by Workflow.run_many)
+        run_id: Checkpoint run ID of the item's workflow run (set by
+                Workflow.run_many with a checkpoint store)
+    """
+
+    __slots__ = ("index", "item", "result", "error", "elapsed", "report", "run_id")
+
+    def __init__(
+        self,
+        index: int,
+        item: Any,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+        elapsed: float = 0.0
+    ):
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+        self.report = None
+        self.run_id = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the task completed without raising."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"BatchResult(index={self.index}, {status}, elapsed={self.elapsed:.3f})"
+
+
+class BatchRun:
+    """
+    Iterator over the BatchResults of a run that keeps throughput statistics.
+
+    Statistics cover the results consumed so far and are available at any
+    time through ``stats``. Closing the run (or leaving its ``with`` block)
+    stops it and cancels queued work.
+    """
+
+    def __init__(self, results: Iterator[BatchResult]):
+        """
+        Initialize the run.
+
+        Args:
+            results: Iterator of outcomes, e.g. from bounded_map
+        """
+        self._results = results
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.succeeded = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_latency = 0.0
+
+    def __iter__(self) -> "BatchRun":
+        return self
+
+    def __next__(self) -> BatchResult:
+        if self.started is None:
+            self.started = time.perf_counter()
+        try:
+            outcome = next(self._results)
+        except StopIteration:
+            if self.finished is None:
+                self.finished = time.perf_counter()
+            raise
+
+        if outcome.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self.busy_seconds += outcome.elapsed
+        self.max_latency = max(self.max_latency, outcome.elapsed)
+        return outcome
+
+    def close(self) -> None:
+        """Stop the run; tasks that have not started are cancelled."""
+        close = getattr(self._results, "close", None)
+        if close is not None:
+            close()
+        if self.finished is None and self.started is not None:
+            self.finished = time.perf_counter()
+
+    def __enter__(self) -> "BatchRun":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Aggregate statistics of the results consumed so far.
+
+        Returns:
+            Dict with completed, succeeded, failed, elapsed (wall-clock seconds),
+            throughput (items per second), avg_latency and max_latency
+        """
+        completed = self.succeeded + self.failed
+        if self.started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            "completed": completed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed": elapsed,
+            "throughput": completed / elapsed if elapsed > 0 else 0.0,
+            "avg_latency": self.busy_seconds / completed if completed else 0.0,
+            "max_latency": self.max_latency,
+        }
+
+
+def timed_call(func: Callable[[Any], Any], item: Any) -> Tuple[Any, Optional[Exception], float]:
+    """
+    Call ``func(item)`` and time it, capturing any exception.
+
+    Args:
+        func: Function to call
+        item: Argument for func
+
+    Returns:
+        Tuple of (result, error, elapsed seconds); result is None if func raised
+    """
+    start = time.perf_counter()
+    try:
+        return func(item), None, time.perf_counter() - start
+    except Exception as e:
+        return None, e, time.perf_counter() - start
+
+
+def bounded_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 8,
+    ordered: bool = True
+) -> Iterator[BatchResult]:
+    """
+    Run ``func`` over ``items`` on a thread pool and yield the outcomes.
+
+    Items are pulled from the iterable lazily, so at most ``2 * max_workers``
+    items are queued, running or (when ordered) waiting for an earlier item
+    at any time, even for very large inputs. Exceptions raised by ``func``
+    are captured in the yielded results instead of aborting the run. Each task runs in a copy of the caller's context, so
+    context variables (e.g. deadlines) propagate into the workers.
+
+    Args:
+        func: Function called with each item
+        items: Iterable of inputs
+        max_workers: Maximum number of tasks running at once
+        ordered: Yield results in input order (True) or as they complete (False)
+
+    Yields:
+        BatchResult for each item
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    source = enumerate(items)
+    window = max_workers * 2
+    pending = {}
+    finished = {}
+    next_index = 0
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit_next() -> bool:
+        try:
+            index, item = next(source)
+        except StopIteration:
+            return False
+        context = contextvars.copy_context()
+        future = pool.submit(context.run, timed_call, func, item)
+        pending[future] = (index, item)
+        return True
+
+    def fill() -> None:
+        # Completed results waiting for an earlier item count against the
+        # window, so a slow head item cannot make the reorder buffer grow
+        while len(pending) + len(finished) < window and submit_next():
+            pass
+
+    try:
+        fill()
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                result, error, elapsed = future.result()
+                outcome = BatchResult(index, item, result, error, elapsed)
+
+                if not ordered:
+                    fill()
+                    yield outcome
+                    continue
+
+                finished[index] = outcome
+                while next_index in finished:
+                    head = finished.pop(next_index)
+                    next_index += 1
+                    fill()
+                    yield head
+    finally:
+        # Consumer stopped early or an error escaped: drop queued work
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
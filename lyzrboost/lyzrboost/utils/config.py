@@ -102,7 +102,7 @@ def save_config(
             else:
                 raise ConfigError(f"Unsupported format: {format}")
                 
-        logger.debug(f"Configuration saved to: {config_path}")
+        logger.debug("Configuration saved to: %s", config_path)
                 
     except Exception as e:
         raise ConfigError(f"Error saving configuration: {str(e)}")
@@ -10,6 +10,9 @@ from typing import Optional, Dict, Any, Union
 # Default log format
 DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+# Maximum number of characters of a request/response payload written to the logs
+PAYLOAD_LOG_LIMIT = 1000
+
 def setup_logger(
     name: str = "lyzrboost",
     level: Union[int, str] = logging.INFO,
@@ -80,6 +83,50 @@ def get_logger(name: str = "lyzrboost") -> logging.Logger:
         
     return logger
 
+class TruncatedPayload:
+    """
+    Log argument that renders a payload truncated to a maximum length.
+    
+    The payload is only converted to text when a handler actually formats
+    the record, so passing it to a disabled log level costs nothing beyond
+    creating this object.
+    """
+    
+    __slots__ = ("value", "limit")
+    
+    def __init__(self, value: Any, limit: int = PAYLOAD_LOG_LIMIT):
+        """
+        Initialize the payload wrapper.
+        
+        Args:
+            value: The payload (string or any object)
+            limit: Maximum number of characters to render
+        """
+        self.value = value
+        self.limit = limit
+        
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else repr(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+
+def truncate_payload(value: Any, limit: int = PAYLOAD_LOG_LIMIT) -> TruncatedPayload:
+    """
+    Wrap a payload for lazy, truncated logging.
+    
+    Usage:
+        logger.debug("Response: %s", truncate_payload(data))
+    
+    Args:
+        value: The payload to log
+        limit: Maximum number of characters to render
+        
+    Returns:
+        A TruncatedPayload to pass as a %-style logging argument
+    """
+    return TruncatedPayload(value, limit)
+
 class LogContext:
     """
     Context manager for adding temporary context to logs.
@@ -7,6 +7,10 @@ echo
 # Set the API key as an environment variable
 export LYZR_API_KEY="sk-default-9wdTatnu1figlN2UilBoBW0yz58wNokO"
 
+echo "Running unit tests..."
+python -m pytest -q
+echo
+
 echo "Running basic StudyBuddy test..."
 python test_studybuddy.py
 echo
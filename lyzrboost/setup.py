@@ -30,6 +30,9 @@ setuptools.setup(
         "requests>=2.25.1",
         "pyyaml>=5.4.1",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+    },
     entry_points={
         "console_scripts": [
             "lyzrboost=lyzrboost.cli.main:main",
@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the LyzrBoost test suite.
+
+Tests talk to the local stub of the agent endpoint in benchmarks/, never
+to the real API.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from stub_server import StubAgentServer  # noqa: E402
+
+from lyzrboost.core.client import AgentClient  # noqa: E402
+
+
+@pytest.fixture
+def stub_server():
+    with StubAgentServer() as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(stub_server):
+    """Build AgentClients pointed at the stub server; they are closed after the test."""
+    clients = []
+
+    def make(**options):
+        options.setdefault("api_key", "test-key")
+        options.setdefault("endpoint", stub_server.url)
+        options.setdefault("stream_endpoint", stub_server.stream_url)
+        client = AgentClient(**options)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
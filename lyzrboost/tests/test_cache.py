@@ -0,0 +1,117 @@
+"""Tests for the response cache and its backends."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from lyzrboost.core.cache import (
+    MemoryCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+    make_cache_key,
+    normalize_message,
+)
+
+
+def test_key_ignores_surrounding_whitespace_but_not_content():
+    assert normalize_message("  hello \r\nworld\n") == "hello\nworld"
+    assert make_cache_key("e", "a", " hello ") == make_cache_key("e", "a", "hello")
+    assert make_cache_key("e", "a", "hello") != make_cache_key("e", "a", "hullo")
+    assert make_cache_key("e", "a", "hello") != make_cache_key("e", "b", "hello")
+    assert make_cache_key("e", "a", "hi", {"x": 1}) != make_cache_key("e", "a", "hi", {"x": 2})
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend()
+    backend.set("k", {"v": 1}, time.time() + 60)
+    backend.set("old", {"v": 2}, time.time() - 1)
+    assert backend.get("k") == {"v": 1}
+    assert backend.get("old") is None
+    assert len(backend) == 1
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(maxsize=2)
+    expires = time.time() + 60
+    backend.set("a", 1, expires)
+    backend.set("b", 2, expires)
+    backend.get("a")
+    backend.set("c", 3, expires)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1 and backend.get("c") == 3
+    assert backend.evictions == 1
+
+
+def test_memory_backend_returns_copies():
+    backend = MemoryCacheBackend()
+    value = {"data": {"response": "x"}}
+    backend.set("k", value, time.time() + 60)
+    value["data"]["response"] = "changed"
+    backend.get("k")["data"]["response"] = "changed"
+    assert backend.get("k") == {"data": {"response": "x"}}
+
+
+def test_sqlite_backend_survives_reopening(tmp_path):
+    path = str(tmp_path / "cache.db")
+    backend = SQLiteCacheBackend(path, maxsize=2)
+    backend.set("a", {"v": 1}, time.time() + 60)
+    backend.set("gone", {"v": 2}, time.time() - 1)
+    backend.close()
+
+    backend = SQLiteCacheBackend(path, maxsize=2)
+    assert backend.get("a") == {"v": 1}
+    assert backend.get("gone") is None
+    backend.set("b", 2, time.time() + 60)
+    backend.set("c", 3, time.time() + 60)
+    assert len(backend) <= 2
+    backend.close()
+
+
+def test_only_one_off_calls_are_cached_by_default():
+    cache = ResponseCache()
+    assert cache.key_for("e", "agent", "agent", "hi") is not None
+    assert cache.key_for("e", "agent", "session-1", "hi") is None
+    assert cache.key_for("e", "agent", "session-1", "hi", use_cache=True) is not None
+    assert cache.key_for("e", "agent", "agent", "hi", use_cache=False) is None
+
+
+def test_client_serves_repeats_from_the_cache(stub_server, make_client):
+    cache = ResponseCache(ttl=60)
+    client = make_client(cache=cache)
+    first = client.send("user", "agent", "agent", "hello")
+    second = client.send("user", "agent", "agent", "  hello ")
+    assert first == second
+    assert stub_server.requests == 1
+    assert cache.stats()["hits"] == 1
+
+    client.send("user", "agent", "session-1", "hello")
+    assert stub_server.requests == 2
+
+
+def test_async_client_uses_a_sqlite_cache_off_the_loop(stub_server, tmp_path):
+    pytest.importorskip("aiohttp")
+    from lyzrboost.core.async_client import AsyncAgentClient
+
+    cache = ResponseCache(SQLiteCacheBackend(str(tmp_path / "cache.db")))
+    backend_threads = []
+    backend_get = cache.backend.get
+
+    def get(key):
+        backend_threads.append(threading.get_ident())
+        return backend_get(key)
+
+    cache.backend.get = get
+
+    async def main():
+        async with AsyncAgentClient(api_key="test-key", endpoint=stub_server.url, cache=cache) as client:
+            first = await client.send("user", "agent", "agent", "hello")
+            second = await client.send("user", "agent", "agent", "hello")
+            return first, second, threading.get_ident()
+
+    first, second, loop_thread = asyncio.run(main())
+    assert first == second
+    assert stub_server.requests == 1
+    assert backend_threads and loop_thread not in backend_threads
+    cache.backend.close()
@@ -0,0 +1,114 @@
+"""Tests for CircuitBreaker state transitions and the registry."""
+
+import time
+
+import pytest
+
+from lyzrboost.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    is_endpoint_failure,
+)
+from lyzrboost.core.errors import APIError, APITimeoutError, CircuitOpenError, DeadlineExceeded
+
+
+def fail(error):
+    def call():
+        raise error
+    return call
+
+
+def test_endpoint_failures():
+    assert is_endpoint_failure(APIError("down", status_code=503))
+    assert is_endpoint_failure(APITimeoutError("slow"))
+    assert not is_endpoint_failure(APIError("bad request", status_code=400))
+    assert not is_endpoint_failure(DeadlineExceeded("caller ran out of time"))
+
+
+def test_opens_at_failure_rate_and_fails_fast():
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window_size=4, minimum_calls=4, open_timeout=60)
+    transitions = []
+    breaker.add_listener(lambda name, old, new: transitions.append((old, new)))
+
+    breaker.call(lambda: "ok")
+    breaker.call(lambda: "ok")
+    for _ in range(2):
+        with pytest.raises(APIError):
+            breaker.call(fail(APIError("down", status_code=503)))
+
+    assert breaker.state == OPEN
+    assert transitions == [(CLOSED, OPEN)]
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.call(lambda: "ok")
+    assert 0 < info.value.retry_after <= 60
+
+
+def test_client_errors_do_not_open_the_circuit():
+    breaker = CircuitBreaker(window_size=2, minimum_calls=2)
+    for _ in range(4):
+        with pytest.raises(APIError):
+            breaker.call(fail(APIError("bad request", status_code=400)))
+    assert breaker.state == CLOSED
+
+
+def test_deadline_exceeded_is_not_recorded():
+    breaker = CircuitBreaker(window_size=2, minimum_calls=2)
+    for _ in range(4):
+        with pytest.raises(DeadlineExceeded):
+            breaker.call(fail(DeadlineExceeded("late")))
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker(window_size=1, minimum_calls=1, open_timeout=0.05)
+    with pytest.raises(APIError):
+        breaker.call(fail(APIError("down", status_code=500)))
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(APIError):
+        breaker.call(fail(APIError("down", status_code=500)))
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_half_open_admits_limited_probes():
+    breaker = CircuitBreaker(window_size=1, minimum_calls=1, open_timeout=0.0)
+    with pytest.raises(APIError):
+        breaker.call(fail(APIError("down", status_code=500)))
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_slow_calls_open_the_circuit():
+    breaker = CircuitBreaker(slow_call_duration=0.0, slow_call_rate_threshold=1.0, window_size=2, minimum_calls=2)
+    breaker.record(0.5)
+    breaker.record(0.5)
+    assert breaker.state == OPEN
+
+
+def test_registry_keeps_one_breaker_per_agent():
+    registry = CircuitBreakerRegistry(window_size=1, minimum_calls=1)
+    assert registry.get("http://a", "x") is registry.get("http://a", "x")
+    assert registry.get("http://a", "x") is not registry.get("http://a", "y")
+    shared = CircuitBreakerRegistry(per_agent=False)
+    assert shared.get("http://a", "x") is shared.get("http://a", "y")
+
+
+def test_client_fails_fast_once_open(stub_server, make_client):
+    client = make_client(circuit_breakers=CircuitBreakerRegistry(window_size=2, minimum_calls=2, open_timeout=60))
+    stub_server.fail_next(2, status=503)
+    for _ in range(2):
+        with pytest.raises(APIError):
+            client.send("user", "agent", "agent", "hello")
+    with pytest.raises(CircuitOpenError):
+        client.send("user", "agent", "agent", "hello")
+    assert stub_server.requests == 2
@@ -0,0 +1,91 @@
+"""Tests for deadline propagation."""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from lyzrboost.core.circuit_breaker import CLOSED, CircuitBreakerRegistry
+from lyzrboost.core.deadline import (
+    Deadline,
+    clamp_timeout,
+    context_with_deadline,
+    current_deadline,
+    deadline_scope,
+    remaining_time,
+)
+from lyzrboost.core.errors import DeadlineExceeded
+from lyzrboost.core.workflow import Workflow, WorkflowStep
+
+
+def test_nested_scopes_only_shorten():
+    assert current_deadline() is None
+    with deadline_scope(1.0) as outer:
+        with deadline_scope(60.0) as inner:
+            assert inner is outer
+        with deadline_scope(0.5) as inner:
+            assert inner is not outer
+            assert remaining_time() <= 0.5
+        assert current_deadline() is outer
+    assert current_deadline() is None
+
+
+def test_clamp_timeout():
+    assert clamp_timeout(30) == 30
+    with deadline_scope(1.0):
+        assert clamp_timeout(30) <= 1.0
+        assert clamp_timeout(0.1) == 0.1
+    with deadline_scope(Deadline(0)):
+        with pytest.raises(DeadlineExceeded):
+            clamp_timeout(30)
+
+
+def test_deadline_reaches_threads_with_a_copied_context():
+    seen = []
+    with deadline_scope(5.0) as deadline:
+        context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(lambda: seen.append(current_deadline()),))
+    thread.start()
+    thread.join()
+    assert seen == [deadline]
+
+
+def test_context_with_deadline_leaves_the_caller_untouched():
+    deadline = Deadline(5.0)
+    context = context_with_deadline(deadline)
+    assert context.run(current_deadline) is deadline
+    assert current_deadline() is None
+
+
+def test_workflow_cancels_a_step_that_cannot_fit():
+    ran = []
+    workflow = Workflow([
+        WorkflowStep(lambda x: ran.append("first") or x, name="first"),
+        WorkflowStep(lambda x: ran.append("second") or x, name="second", min_time=10),
+    ])
+    with pytest.raises(DeadlineExceeded):
+        workflow.run("input", deadline=1.0)
+    assert ran == ["first"]
+    assert [timing.status for timing in workflow.last_report.steps] == ["completed", "cancelled"]
+
+
+def test_async_step_is_stopped_at_its_timeout():
+    async def slow(x):
+        await asyncio.sleep(5)
+        return x
+
+    workflow = Workflow([WorkflowStep(slow, name="slow", timeout=0.05)])
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(workflow.arun("input"))
+
+
+def test_client_call_is_bounded_by_the_deadline(stub_server, make_client):
+    stub_server._server.delay = 0.5
+    registry = CircuitBreakerRegistry(window_size=1, minimum_calls=1)
+    client = make_client(circuit_breakers=registry, timeout=30)
+    with deadline_scope(0.1):
+        with pytest.raises(DeadlineExceeded):
+            client.send("user", "agent", "agent", "hello")
+    # The caller's deadline says nothing about the endpoint
+    assert set(registry.states().values()) == {CLOSED}
@@ -0,0 +1,81 @@
+"""Tests for step fingerprints and the step memo."""
+
+import os
+import subprocess
+import sys
+
+from lyzrboost.core.cache import SQLiteCacheBackend
+from lyzrboost.core.memo import StepMemo, callable_fingerprint, hash_input
+from lyzrboost.core.workflow import Workflow, WorkflowStep
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FINGERPRINTS = """
+import functools
+from lyzrboost.core.memo import callable_fingerprint, hash_input
+
+def classify(label):
+    if label in {"alpha", "beta", "gamma", "delta", "epsilon"}:
+        return ("greek", frozenset({"x", "y", "z"}))
+    return None
+
+print(callable_fingerprint(classify))
+print(callable_fingerprint(functools.partial(classify, "alpha")))
+print(hash_input({"tags": {"red", "green", "blue", "cyan"}, "pair": ("a", frozenset({"b", "c"}))}))
+"""
+
+
+def fingerprints_with_hash_seed(seed):
+    env = dict(os.environ, PYTHONHASHSEED=str(seed), PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", FINGERPRINTS], env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def test_fingerprints_do_not_depend_on_the_hash_seed():
+    outputs = {fingerprints_with_hash_seed(seed) for seed in range(6)}
+    assert len(outputs) == 1
+
+
+def test_fingerprint_follows_code_and_constants():
+    def first(x):
+        return x in {"a", "b"}
+
+    def same(x):
+        return x in {"b", "a"}
+
+    def other(x):
+        return x in {"a", "c"}
+
+    same.__qualname__ = other.__qualname__ = first.__qualname__
+    assert callable_fingerprint(first) == callable_fingerprint(same)
+    assert callable_fingerprint(first) != callable_fingerprint(other)
+
+
+def test_set_inputs_hash_by_their_members():
+    assert hash_input({"b", "a"}) == hash_input({"a", "b"})
+    assert hash_input({"a", "b"}) != hash_input(["a", "b"])
+    assert hash_input({"a"}) != hash_input({"b"})
+
+
+TAG_CALLS = []
+
+
+def tag(words):
+    TAG_CALLS.append(words)
+    return sorted(word for word in words if word in {"red", "green", "blue"})
+
+
+def test_persistent_memo_reuses_outputs_across_runs(tmp_path):
+    path = str(tmp_path / "memo.db")
+    hits = []
+    for _ in range(2):
+        backend = SQLiteCacheBackend(path)
+        memo = StepMemo(backend=backend)
+        assert Workflow([WorkflowStep(tag, name="tag")], memo=memo).run(["red", "cyan", "blue"]) == ["blue", "red"]
+        hits.append(memo.stats()["hits"])
+        backend.close()
+
+    assert hits == [0, 1]
+    assert len(TAG_CALLS) == 1
@@ -0,0 +1,66 @@
+"""Tests for streaming workflows."""
+
+import asyncio
+import time
+
+import pytest
+
+from lyzrboost.core.pipeline import PipelineReport, StreamingWorkflow, StreamStep
+
+
+async def shout(chunks):
+    async for chunk in chunks:
+        yield chunk.upper()
+
+
+def exclaim(text):
+    return text + "!"
+
+
+def test_stages_stream_into_each_other():
+    workflow = StreamingWorkflow([StreamStep(shout), exclaim])
+    assert workflow.run(["hello ", "world"]) == "HELLO WORLD!"
+    assert workflow.last_report.succeeded
+    assert [stage.chunks for stage in workflow.last_report.stages] == [2, 1]
+
+
+def test_run_many_runs_each_input_on_its_own_loop():
+    workflow = StreamingWorkflow([StreamStep(shout), exclaim])
+    batch = workflow.run_many(["a", "b", "c"], max_workers=2)
+    outcomes = list(batch)
+    assert [outcome.result for outcome in outcomes] == ["A!", "B!", "C!"]
+    assert all(isinstance(outcome.report, PipelineReport) and outcome.report.succeeded for outcome in outcomes)
+    assert workflow.last_report is None
+
+
+def test_sequential_step_runners_are_refused():
+    workflow = StreamingWorkflow([StreamStep(shout)])
+    with pytest.raises(NotImplementedError):
+        workflow._run_steps("a", 0, None, None, None)
+    with pytest.raises(NotImplementedError):
+        asyncio.run(workflow._arun_steps("a", 0, None, None, None, None))
+
+
+def test_sync_iterable_input_does_not_block_the_loop():
+    ticks = []
+
+    def slow_source():
+        for word in ("slow ", "source"):
+            time.sleep(0.1)
+            yield word
+
+    async def main():
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(ticker())
+        try:
+            return await StreamingWorkflow([StreamStep(shout)]).arun(slow_source())
+        finally:
+            task.cancel()
+
+    assert asyncio.run(main()) == "SLOW SOURCE"
+    # The loop kept ticking while the source slept
+    assert len(ticks) > 10
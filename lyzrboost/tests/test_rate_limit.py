@@ -0,0 +1,61 @@
+"""Tests for the token-bucket rate limiters."""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from lyzrboost.core.rate_limit import SQLiteRateLimiter, TokenBucketRateLimiter
+
+
+def test_reservations_wait_for_refills():
+    limiter = TokenBucketRateLimiter(rate=10, capacity=2)
+    assert limiter.reserve("k") == 0
+    assert limiter.reserve("k") == 0
+    assert limiter.reserve("k") == pytest.approx(0.1, abs=0.02)
+    assert limiter.reserve("k", max_wait=0.05) is None
+    assert limiter.reserve("other") == 0
+
+
+def test_sqlite_buckets_are_shared_between_limiters(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first = SQLiteRateLimiter(path, rate=1, capacity=1)
+    second = SQLiteRateLimiter(path, rate=1, capacity=1)
+    assert first.acquire("k", timeout=0)
+    assert not second.acquire("k", timeout=0)
+
+
+def run_with_ticker(coroutine_function):
+    ticks = []
+
+    async def main():
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(ticker())
+        try:
+            return await coroutine_function()
+        finally:
+            task.cancel()
+
+    return asyncio.run(main()), ticks
+
+
+def test_sqlite_reservation_does_not_block_the_event_loop(tmp_path):
+    path = str(tmp_path / "limits.db")
+    limiter = SQLiteRateLimiter(path, rate=100)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    async def acquire():
+        asyncio.get_running_loop().call_later(0.3, other.execute, "COMMIT")
+        return await limiter.acquire_async("k")
+
+    acquired, ticks = run_with_ticker(acquire)
+    assert acquired
+    # The loop kept running while reserve() waited for the database lock
+    assert len(ticks) > 10
+
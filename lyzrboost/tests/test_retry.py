@@ -0,0 +1,90 @@
+"""Tests for RetryPolicy and its use by AgentClient."""
+
+import pytest
+
+from lyzrboost.core.deadline import deadline_scope
+from lyzrboost.core.errors import APIConnectionError, APIError, APITimeoutError, DeadlineExceeded
+from lyzrboost.core.retry import RetryPolicy, parse_retry_after
+
+
+def fast_policy(**options):
+    options.setdefault("backoff_base", 0.001)
+    options.setdefault("backoff_max", 0.001)
+    return RetryPolicy(**options)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_only_safe_errors_are_retryable():
+    policy = RetryPolicy()
+    assert policy.is_retryable(APIConnectionError("refused"))
+    assert policy.is_retryable(APIError("unavailable", status_code=503))
+    assert not policy.is_retryable(APIError("bad request", status_code=400))
+    assert not policy.is_retryable(APITimeoutError("read timeout"))
+    assert RetryPolicy(retry_on_timeout=True).is_retryable(APITimeoutError("read timeout"))
+    assert not RetryPolicy(retry_on_timeout=True).is_retryable(DeadlineExceeded("late"))
+
+
+def test_retry_after_is_a_lower_bound_and_a_limit():
+    policy = RetryPolicy(backoff_base=0.001, max_retry_after=5)
+    assert policy.compute_delay(1, APIError("busy", status_code=429, retry_after=2)) == 2
+    assert policy.compute_delay(1, APIError("busy", status_code=429, retry_after=10)) is None
+
+
+def test_call_retries_until_success():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise APIError("unavailable", status_code=503)
+        return "ok"
+
+    policy = fast_policy(max_attempts=3)
+    assert policy.call(flaky) == "ok"
+    assert policy.stats.snapshot()["retries"] == 2
+
+
+def test_call_gives_up_after_max_attempts():
+    policy = fast_policy(max_attempts=2)
+    with pytest.raises(APIError):
+        policy.call(lambda: (_ for _ in ()).throw(APIError("unavailable", status_code=503)))
+    assert policy.stats.snapshot()["exhausted"] == 1
+
+
+def test_no_retry_that_cannot_start_before_the_deadline():
+    policy = RetryPolicy(backoff_base=10, backoff_max=10, max_attempts=5)
+    policy.compute_delay = lambda attempt, error=None: 10
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise APIError("unavailable", status_code=503)
+
+    with deadline_scope(1.0):
+        with pytest.raises(APIError):
+            policy.call(failing)
+    assert len(calls) == 1
+
+
+def test_client_retries_server_errors(stub_server, make_client):
+    client = make_client(retry_policy=fast_policy(max_attempts=3))
+    stub_server.fail_next(2, status=503)
+    response = client.send("user", "agent", "agent", "hello")
+    assert response["data"]["response"] == "echo: hello"
+    assert stub_server.requests == 3
+
+
+def test_client_does_not_retry_client_errors(stub_server, make_client):
+    client = make_client(retry_policy=fast_policy(max_attempts=3))
+    stub_server.fail_next(1, status=400)
+    with pytest.raises(APIError) as info:
+        client.send("user", "agent", "agent", "hello")
+    assert info.value.status_code == 400
+    assert stub_server.requests == 1
@@ -0,0 +1,104 @@
+"""Tests for persistent session backends: restart, replay and compaction."""
+
+import os
+
+import pytest
+
+from lyzrboost.core.agent_manager import AgentManager
+from lyzrboost.core.session_backends import LogFileSessionBackend, MemorySessionBackend, SQLiteSessionBackend
+
+
+def summarize(previous, dropped):
+    return f"{(previous or '')}+{len(dropped)}"
+
+
+@pytest.fixture(params=["sqlite", "log"])
+def make_backend(request, tmp_path):
+    if request.param == "sqlite":
+        path = str(tmp_path / "sessions.db")
+        return lambda: SQLiteSessionBackend(path)
+    path = str(tmp_path / "sessions.log")
+    return lambda: LogFileSessionBackend(path)
+
+
+def fill(manager, session_id, turns):
+    for index in range(turns):
+        manager.store_interaction(session_id, f"q{index}", f"a{index}")
+
+
+def test_sessions_survive_a_restart(make_backend):
+    options = dict(history_max_turns=5, history_summarizer=summarize)
+    with AgentManager(session_backend=make_backend(), **options) as manager:
+        kept = manager.generate_session_id(agent_id="agent")
+        cleared = manager.generate_session_id(agent_id="agent")
+        deleted = manager.generate_session_id(agent_id="agent")
+        fill(manager, kept, 12)
+        fill(manager, cleared, 3)
+        manager.clear_session(cleared)
+        manager.delete_session(deleted)
+        expected = manager.get_history(kept)
+        expected = (expected.to_list(), expected.summary, expected.total_turns)
+
+    with AgentManager(session_backend=make_backend(), **options) as manager:
+        history = manager.get_history(kept)
+        assert (history.to_list(), history.summary, history.total_turns) == expected
+        assert manager.get_session_history(cleared) == []
+        assert manager.get_session(deleted) is None
+        assert sorted(manager.find_sessions("agent")) == sorted([kept, cleared])
+
+
+def test_capacity_eviction_reloads_from_the_backend(make_backend):
+    with AgentManager(max_sessions=1, session_backend=make_backend()) as manager:
+        first = manager.generate_session_id()
+        fill(manager, first, 3)
+        second = manager.generate_session_id()
+        fill(manager, second, 2)
+        fill(manager, first, 1)
+        assert [turn["user_message"] for turn in manager.get_session_history(first)] == ["q0", "q1", "q2", "q0"]
+        assert manager.get_history(first).total_turns == 4
+
+
+def test_memory_backend_round_trip():
+    backend = MemorySessionBackend()
+    backend.save_session("s", "agent", 1.0, 2.0)
+    backend.append_turn("s", 1, {"user_message": "q"}, 1, None)
+    backend.append_turn("s", 2, {"user_message": "r"}, 1, "summary")
+    stored = backend.load("s")
+    assert stored["turns"] == [{"user_message": "r"}]
+    assert stored["summary"] == "summary" and stored["total_turns"] == 2
+    assert backend.delete("s") and backend.load("s") is None
+
+
+def test_log_replay_discards_a_torn_record(tmp_path):
+    path = str(tmp_path / "sessions.log")
+    backend = LogFileSessionBackend(path)
+    backend.save_session("s", "agent", 1.0, 1.0)
+    backend.append_turn("s", 1, {"user_message": "q"}, 10, None)
+    backend.close()
+    with open(path, "ab") as f:
+        f.write(b'{"op": "turn", "session_id": "s", "se')
+
+    backend = LogFileSessionBackend(path)
+    assert backend.load("s")["turns"] == [{"user_message": "q"}]
+    backend.append_turn("s", 2, {"user_message": "r"}, 10, None)
+    backend.close()
+    backend = LogFileSessionBackend(path)
+    assert len(backend.load("s")["turns"]) == 2
+    backend.close()
+
+
+def test_log_compaction_keeps_only_live_records(tmp_path):
+    path = str(tmp_path / "sessions.log")
+    backend = LogFileSessionBackend(path)
+    backend.save_session("s", "agent", 1.0, 1.0)
+    for seq in range(1, 101):
+        backend.append_turn("s", seq, {"user_message": f"q{seq}"}, 3, f"summary {seq // 10}")
+    before = backend.load("s")
+    backend.compact()
+    assert backend.stats()["log_bytes"] == backend.stats()["live_bytes"] == os.path.getsize(path)
+    assert backend.load("s") == before
+    backend.close()
+
+    backend = LogFileSessionBackend(path)
+    assert backend.load("s") == before
+    backend.close()
@@ -0,0 +1,87 @@
+"""Tests for the session stores and AgentManager session handling."""
+
+import pytest
+
+from lyzrboost.core.agent_manager import AgentManager
+from lyzrboost.core.history import SessionHistory
+from lyzrboost.core.sessions import (
+    EVICT_CAPACITY,
+    EVICT_EXPIRED,
+    EVICT_IDLE,
+    SessionStore,
+    ShardedSessionStore,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_session_is_evicted():
+    evicted = []
+    store = SessionStore(max_sessions=2, on_evict=lambda sid, record, reason: evicted.append((sid, reason)))
+    store.create("a", {})
+    store.create("b", {})
+    store.get("a")
+    store.create("c", {})
+    assert evicted == [("b", EVICT_CAPACITY)]
+    assert "a" in store and "c" in store and "b" not in store
+
+
+def test_idle_and_absolute_ttls():
+    clock = FakeClock()
+    evicted = []
+    store = SessionStore(
+        max_sessions=None, idle_ttl=10, ttl=25, clock=clock,
+        on_evict=lambda sid, record, reason: evicted.append((sid, reason))
+    )
+    store.create("idle", {})
+    store.create("busy", {})
+    for _ in range(2):
+        clock.now += 8
+        assert store.get("busy") is not None
+    assert store.get("idle") is None
+    clock.now += 9
+    assert store.get("busy") is None
+    assert evicted == [("idle", EVICT_IDLE), ("busy", EVICT_EXPIRED)]
+
+
+def test_sharded_store_enforces_a_global_cap():
+    clock = FakeClock()
+    store = ShardedSessionStore(shards=4, max_sessions=3, clock=clock)
+    for index in range(10):
+        clock.now += 1
+        store.create(f"s{index}", {})
+    assert len(store) == 3
+    assert all(f"s{index}" in store for index in (7, 8, 9))
+
+
+def test_history_is_bounded_and_summarized():
+    history = SessionHistory(max_turns=4, summarizer=lambda previous, dropped: f"{len(dropped)} dropped")
+    for index in range(10):
+        history.append({"user_message": f"q{index}", "agent_response": "a"})
+    assert len(history) <= 4
+    assert history.total_turns == 10
+    assert history.summary
+    assert history[-1]["user_message"] == "q9"
+
+
+def test_manager_returns_a_list_history():
+    manager = AgentManager(history_max_turns=3)
+    session_id = manager.generate_session_id(agent_id="agent")
+    assert manager.get_session_history(session_id) == []
+    for index in range(5):
+        manager.store_interaction(session_id, f"q{index}", "a")
+    history = manager.get_session_history(session_id)
+    assert [turn["user_message"] for turn in history] == ["q2", "q3", "q4"]
+    assert manager.get_history(session_id).total_turns == 5
+
+    manager.clear_session(session_id)
+    assert manager.get_session_history(session_id) == []
+    manager.delete_session(session_id)
+    with pytest.raises(KeyError):
+        manager.get_session_history(session_id)
@@ -0,0 +1,134 @@
+"""Tests for single-flight coalescing of identical requests."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lyzrboost.core.deadline import deadline_scope
+from lyzrboost.core.errors import DeadlineExceeded
+from lyzrboost.core.singleflight import AsyncSingleFlight, SingleFlight, make_flight_key
+
+
+def test_key_covers_endpoint_api_key_and_payload():
+    payload = {"user_id": "u", "agent_id": "a", "session_id": "a", "message": "hi"}
+    key = make_flight_key("e", "k", payload)
+    assert key == make_flight_key("e", "k", dict(payload))
+    assert key != make_flight_key("e2", "k", payload)
+    assert key != make_flight_key("e", "k2", payload)
+    assert key != make_flight_key("e", "k", dict(payload, message="bye"))
+    assert key != make_flight_key("e", "k", payload, timeout=5)
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        release.wait(5)
+        return {"response": "shared"}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "k", call) for _ in range(5)]
+        while flight.stats()["calls"] < 5:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result == {"response": "shared"} for result in results)
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 5
+    assert flight.stats() == {"calls": 5, "coalesced": 4, "upstream": 1}
+
+
+def test_followers_receive_the_leaders_error():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def call():
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "k", call) for _ in range(3)]
+        while flight.stats()["calls"] < 3:
+            pass
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+
+def test_nothing_is_cached_after_the_call():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+
+
+def test_async_callers_share_one_call():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"response": "shared"}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", call) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [{"response": "shared"}] * 4
+
+
+def test_client_coalesces_identical_requests(stub_server, make_client):
+    stub_server._server.delay = 0.2
+    client = make_client(single_flight=SingleFlight())
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda _: client.send("user", "agent", "agent", "hello"), range(4)))
+    assert stub_server.requests == 1
+    assert all(response["data"]["response"] == "echo: hello" for response in responses)
+
+
+def test_deadline_bound_calls_are_not_coalesced(stub_server, make_client):
+    stub_server._server.delay = 0.3
+    client = make_client(single_flight=SingleFlight())
+
+    def send(deadline):
+        with deadline_scope(deadline):
+            return client.send("user", "agent", "agent", "hello")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        hurried = pool.submit(send, 0.05)
+        patient = pool.submit(send, 5.0)
+        with pytest.raises(DeadlineExceeded):
+            hurried.result()
+        # The patient caller is not handed the hurried caller's DeadlineExceeded
+        assert patient.result()["data"]["response"] == "echo: hello"
+    assert stub_server.requests == 2
+
+
+def test_async_deadline_bound_calls_are_not_coalesced(stub_server):
+    pytest.importorskip("aiohttp")
+    from lyzrboost.core.async_client import AsyncAgentClient
+
+    stub_server._server.delay = 0.3
+
+    async def main():
+        async with AsyncAgentClient(
+            api_key="test-key", endpoint=stub_server.url, single_flight=AsyncSingleFlight()
+        ) as client:
+            async def send(deadline):
+                with deadline_scope(deadline):
+                    return await client.send("user", "agent", "agent", "hello")
+
+            return await asyncio.gather(send(0.05), send(5.0), return_exceptions=True)
+
+    hurried, patient = asyncio.run(main())
+    assert isinstance(hurried, DeadlineExceeded)
+    assert patient["data"]["response"] == "echo: hello"
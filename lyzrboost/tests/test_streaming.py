@@ -0,0 +1,49 @@
+"""Tests for streamed agent responses."""
+
+import asyncio
+
+import pytest
+from stub_server import StubAgentServer
+
+from lyzrboost.core.streaming import iter_sse_data
+
+MESSAGE = "héllo wörld ✓"
+
+
+def test_sse_events_are_joined_and_stop_at_done():
+    lines = ["data: one", "data: two", "", ": comment", "data: three", "", "data: [DONE]", "", "data: late", ""]
+    assert list(iter_sse_data(lines)) == ["one\ntwo", "three"]
+
+
+def test_stream_yields_chunks_and_accumulates_text(stub_server, make_client):
+    client = make_client()
+    with client.stream("user", "agent", "agent", "hello there") as stream:
+        chunks = list(stream)
+    assert chunks == ["echo: ", "hello ", "there "]
+    assert stream.text == "echo: hello there "
+
+
+@pytest.mark.parametrize("sse", [True, False])
+def test_stream_decodes_non_ascii_without_a_charset(make_client, sse):
+    # Content-Type carries no charset, which requests would read as ISO-8859-1
+    with StubAgentServer(sse=sse) as server:
+        client = make_client(endpoint=server.url, stream_endpoint=server.stream_url)
+        with client.stream("user", "agent", "agent", MESSAGE) as stream:
+            assert stream.is_sse == sse
+            text = "".join(stream)
+    assert text == f"echo: {MESSAGE} "
+
+
+@pytest.mark.parametrize("sse", [True, False])
+def test_async_stream_decodes_non_ascii_without_a_charset(sse):
+    pytest.importorskip("aiohttp")
+    from lyzrboost.core.async_client import AsyncAgentClient
+
+    async def main(server):
+        async with AsyncAgentClient(api_key="test-key", endpoint=server.url, stream_endpoint=server.stream_url) as client:
+            stream = await client.stream("user", "agent", "agent", MESSAGE)
+            async with stream:
+                return "".join([chunk async for chunk in stream])
+
+    with StubAgentServer(sse=sse) as server:
+        assert asyncio.run(main(server)) == f"echo: {MESSAGE} "
@@ -0,0 +1,86 @@
+"""Tests for sequential workflows and map steps."""
+
+import asyncio
+import threading
+
+import pytest
+
+from lyzrboost.core.pipeline import StreamingWorkflow, StreamStep
+from lyzrboost.core.workflow import MapItemError, MapStep, Workflow, WorkflowStep
+
+
+def make_sub_workflow(barrier):
+    def double(x):
+        # Every item is in flight at once
+        barrier.wait(5)
+        return x * 2
+
+    return Workflow([WorkflowStep(double, name="double"), WorkflowStep(lambda x: x + 1, name="increment")])
+
+
+def test_map_over_a_sub_workflow_leaves_its_last_report_alone():
+    sub_workflow = make_sub_workflow(threading.Barrier(3))
+    workflow = Workflow([MapStep(sub_workflow, max_concurrency=3)])
+    assert workflow.run([1, 2, 3]) == [3, 5, 7]
+    assert sub_workflow.last_report is None and sub_workflow.last_run_id is None
+    assert [timing.status for timing in workflow.last_report.steps] == ["completed"]
+
+
+def test_async_map_over_a_sub_workflow_leaves_its_last_report_alone():
+    sub_workflow = make_sub_workflow(threading.Barrier(3))
+    workflow = Workflow([MapStep(sub_workflow, max_concurrency=3)])
+    assert asyncio.run(workflow.arun([1, 2, 3])) == [3, 5, 7]
+    assert sub_workflow.last_report is None
+
+
+def test_map_collects_item_errors():
+    def invert(x):
+        return 1 / x
+
+    workflow = Workflow([MapStep(invert, on_error="collect")])
+    results = workflow.run([1, 0, 2])
+    assert results[0] == 1 and results[2] == 0.5
+    assert isinstance(results[1], MapItemError) and results[1].index == 1
+
+
+def test_map_over_a_streaming_sub_workflow():
+    async def shout(chunks):
+        async for chunk in chunks:
+            yield chunk.upper()
+
+    sub_workflow = StreamingWorkflow([StreamStep(shout)])
+    workflow = Workflow([MapStep(sub_workflow)])
+    assert workflow.run(["a", "b"]) == ["A", "B"]
+    assert asyncio.run(workflow.arun(["c"])) == ["C"]
+    assert sub_workflow.last_report is None
+
+
+def test_map_fails_fast_by_default():
+    def fail(x):
+        raise ValueError(x)
+
+    workflow = Workflow([MapStep(fail)])
+    with pytest.raises(ValueError):
+        workflow.run([1, 2])
+    assert [timing.status for timing in workflow.last_report.steps] == ["failed"]
+
+
+def broken_condition(x):
+    raise KeyError("missing")
+
+
+def test_condition_errors_are_recorded_as_failed_steps():
+    workflow = Workflow([
+        WorkflowStep(lambda x: x, name="first"),
+        WorkflowStep(lambda x: x, name="second", condition=broken_condition),
+    ])
+    with pytest.raises(KeyError):
+        workflow.run("input")
+    report = workflow.last_report
+    assert [(timing.name, timing.status) for timing in report.steps] == [("first", "completed"), ("second", "failed")]
+    assert not report.succeeded
+
+    with pytest.raises(KeyError):
+        asyncio.run(workflow.arun("input"))
+    assert [timing.status for timing in workflow.last_report.steps] == ["completed", "failed"]
+    assert not workflow.last_report.succeeded
@@ -13,6 +13,7 @@ import sys
 import argparse
 import time
 import os
+from collections import deque
 from typing import Dict, Any, List
 
 # Import Google Gemini API modules
@@ -70,9 +71,10 @@ except ImportError:
             return current_data
 
     class AgentManager:
-        def __init__(self, api_key=None, default_endpoint=None):
+        def __init__(self, api_key=None, default_endpoint=None, history_max_turns=None, **kwargs):
             self.api_key = api_key
             self.default_endpoint = default_endpoint
+            self.history_max_turns = history_max_turns
             self._sessions = {}
             
         def generate_session_id(self, agent_id=None, prefix=""):
@@ -82,7 +84,7 @@ except ImportError:
                 "created_at": None,
                 "last_access": None,
                 "agent_id": agent_id,
-                "history": []
+                "history": deque(maxlen=self.history_max_turns)
             }
             return session_id
             
@@ -99,6 +101,14 @@ except ImportError:
             
             self._sessions[session_id]["history"].append(interaction)
 
+        def build_history_prompt(self, session_id, max_turns=None, max_chars=None):
+            turns = list(self._sessions[session_id]["history"])
+            if max_turns:
+                turns = turns[-max_turns:]
+            return "\n".join(
+                f"User: {turn['user_message']}\nAssistant: {turn['agent_response']}" for turn in turns
+            )
+
 # Set up the Gemini API client
 def setup_gemini_client():
     """
@@ -328,7 +338,8 @@ def interactive_mode():
     print("Type 'exit' to quit\n")
     
     setup_gemini_client()
-    agent_manager = AgentManager()
+    # Keep the conversation bounded so long chats don't grow memory or prompts
+    agent_manager = AgentManager(history_max_turns=20, history_max_chars=20000)
     session_id = agent_manager.generate_session_id(prefix="gemini_")
     
     # Create a model for generating responses
@@ -350,7 +361,10 @@ def interactive_mode():
             print("\nResponse:")
             print("-" * 40)
             
-            response = model.generate_content(user_query)
+            # Include the recent conversation so follow-up questions have context
+            context = agent_manager.build_history_prompt(session_id, max_chars=8000)
+            prompt = f"{context}\nUser: {user_query}" if context else user_query
+            response = model.generate_content(prompt)
             print(response.text)
             
             print("-" * 40)